@@ -0,0 +1,191 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+
+    Benchmark of the IPDD approaches using synthetic logs with injected drifts
+    Run from the root folder of IPDD:
+        python -m benchmarks.run_benchmarks --sizes 1000 10000 --baseline benchmarks/baseline.json
+    Use --save_baseline for saving the results as the new baseline
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchmarks.synthetic_log import get_drift_log_file
+from components.adaptive.detectors import SelectDetector, ConceptDriftDetector
+from components.dfg_definitions import Metric
+from components.ippd_fw import InteractiveProcessDriftDetectionFW, IPDDParametersFixed, IPDDParametersAdaptive, \
+    IPDDParametersAdaptiveControlflow
+from components.monitoring.memory import get_rss, reset_peak_rss
+from components.monitoring.performance_metrics import performance_metrics
+from components.parameters import Approach, ReadLogAs, WindowUnityFixed, AdaptivePerspective, AttributeAdaptive, \
+    ControlflowAdaptiveApproach, Paths
+
+BENCHMARKS_PATH = os.path.join(Paths.DATA_PATH, 'benchmarks')
+# logs up to 1M traces are supported, but the generation and the run take hours
+DEFAULT_SIZES = [1000, 10000, 100000]
+# relative difference accepted when comparing with the baseline
+DEFAULT_TOLERANCE = 0.2
+
+
+class BenchmarkApproach:
+    FIXED = 'fixed'
+    ADAPTIVE_TIME_DATA = 'adaptive_time_data'
+    ADAPTIVE_TRACE = 'adaptive_trace'
+    ADAPTIVE_WINDOWING = 'adaptive_windowing'
+
+    ALL = [FIXED, ADAPTIVE_TIME_DATA, ADAPTIVE_TRACE, ADAPTIVE_WINDOWING]
+
+
+# parameters used by the benchmark for each approach (standard settings)
+# the window size is proportional to the segment size of the synthetic log (10 segments)
+def get_parameters(approach, log_filename, total_of_traces):
+    window = max(total_of_traces // 20, 10)
+    metrics = [Metric.NODES, Metric.EDGES]
+    detector_class = SelectDetector.get_detector_instance(ConceptDriftDetector.ADWIN.name)
+    if approach == BenchmarkApproach.FIXED:
+        return IPDDParametersFixed(log_filename, Approach.FIXED.name, ReadLogAs.TRACE.name, metrics,
+                                   WindowUnityFixed.UNITY.name, window)
+    elif approach == BenchmarkApproach.ADAPTIVE_TIME_DATA:
+        return IPDDParametersAdaptive(logname=log_filename, approach=Approach.ADAPTIVE.name,
+                                      perspective=AdaptivePerspective.TIME_DATA.name,
+                                      read_log_as=ReadLogAs.TRACE.name, metrics=metrics,
+                                      detector_class=detector_class,
+                                      attribute=AttributeAdaptive.SOJOURN_TIME.name)
+    elif approach == BenchmarkApproach.ADAPTIVE_TRACE:
+        return IPDDParametersAdaptiveControlflow(logname=log_filename, approach=Approach.ADAPTIVE.name,
+                                                 perspective=AdaptivePerspective.CONTROL_FLOW.name,
+                                                 read_log_as=ReadLogAs.TRACE.name, win_size=window,
+                                                 metrics=metrics,
+                                                 adaptive_controlflow_approach=ControlflowAdaptiveApproach.TRACE.name,
+                                                 detector_class=detector_class)
+    elif approach == BenchmarkApproach.ADAPTIVE_WINDOWING:
+        return IPDDParametersAdaptiveControlflow(logname=log_filename, approach=Approach.ADAPTIVE.name,
+                                                 perspective=AdaptivePerspective.CONTROL_FLOW.name,
+                                                 read_log_as=ReadLogAs.TRACE.name, win_size=window,
+                                                 metrics=metrics,
+                                                 adaptive_controlflow_approach=ControlflowAdaptiveApproach.WINDOW.name,
+                                                 detector_class=detector_class)
+    print(f'Approach not identified in benchmark: {approach}')
+    return None
+
+
+# the time/data approach uses a log with drifts in the sojourn time, the others use control-flow drifts
+def get_log(approach, total_of_traces):
+    logs_path = os.path.join(BENCHMARKS_PATH, 'logs')
+    if approach == BenchmarkApproach.ADAPTIVE_TIME_DATA:
+        return get_drift_log_file(logs_path, total_of_traces, models=('base',), time_factors=(1, 3))
+    return get_drift_log_file(logs_path, total_of_traces, models=('base', 'cb'))
+
+
+def run_benchmark(framework, approach, total_of_traces):
+    log_filename, drifts = get_log(approach, total_of_traces)
+    parameters = get_parameters(approach, log_filename, total_of_traces)
+    print('----------------------------------------------')
+    print(f'Benchmark {approach} - {total_of_traces} traces - real drifts {drifts}')
+    print('----------------------------------------------')
+    reset_peak_rss()
+    start = time.perf_counter()
+    framework.run_script(parameters)
+    while framework.get_status_running():
+        time.sleep(0.5)  # in seconds
+    elapsed = time.perf_counter() - start
+    rss, peak_rss = get_rss()
+
+    performance = performance_metrics.to_dict()
+    stages = {}
+    for stage, histogram in performance['stages'].items():
+        stages[stage] = {k: histogram[k] for k in ['count', 'sum', 'p50', 'p95', 'p99']}
+    return {
+        'approach': approach,
+        'traces': total_of_traces,
+        'elapsed_time': elapsed,
+        'throughput': total_of_traces / elapsed,  # traces per second
+        'windows': performance['counters'].get('windows', 0),
+        'peak_rss': peak_rss,
+        'stages': stages,
+    }
+
+
+def get_key(result):
+    return f'{result["approach"]}_{result["traces"]}'
+
+
+# compare the results with the baseline and return the list of regressions
+# a regression is a throughput reduction, or an increase of the p95 latency of a stage or
+# of the peak RSS, higher than the tolerance
+def compare_with_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        if result['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(f'{key}: throughput {result["throughput"]:.2f} traces/s '
+                               f'(baseline {base["throughput"]:.2f})')
+        if result['peak_rss'] and base.get('peak_rss') and result['peak_rss'] > base['peak_rss'] * (1 + tolerance):
+            regressions.append(f'{key}: peak RSS {result["peak_rss"]} bytes (baseline {base["peak_rss"]})')
+        for stage, values in result['stages'].items():
+            base_stage = base['stages'].get(stage)
+            if base_stage and base_stage['p95'] and values['p95'] > base_stage['p95'] * (1 + tolerance):
+                regressions.append(f'{key}: p95 latency of {stage} {values["p95"]:.4f}s '
+                                   f'(baseline {base_stage["p95"]:.4f}s)')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='IPDD benchmarks using synthetic logs')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Number of traces of the synthetic logs')
+    parser.add_argument('--approaches', nargs='+', default=BenchmarkApproach.ALL, choices=BenchmarkApproach.ALL)
+    parser.add_argument('--baseline', help='Baseline JSON file for comparing the results')
+    parser.add_argument('--save_baseline', action='store_true', help='Save the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Relative difference accepted when comparing with the baseline')
+    args = parser.parse_args()
+
+    framework = InteractiveProcessDriftDetectionFW(script=True)
+    results = {}
+    for total_of_traces in args.sizes:
+        for approach in args.approaches:
+            result = run_benchmark(framework, approach, total_of_traces)
+            results[get_key(result)] = result
+            print(f'Benchmark {get_key(result)}: {result["elapsed_time"]:.2f}s - '
+                  f'{result["throughput"]:.2f} traces/s - peak RSS {result["peak_rss"]}')
+
+    if not os.path.exists(BENCHMARKS_PATH):
+        os.makedirs(BENCHMARKS_PATH)
+    output_filename = os.path.join(BENCHMARKS_PATH, f'results_{time.strftime("%Y%m%d_%H%M%S")}.json')
+    with open(output_filename, 'w+') as file:
+        json.dump(results, file, indent=2)
+    print(f'Saving benchmark results to {output_filename}')
+
+    regressions = []
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for r in regressions:
+            print(f'REGRESSION {r}')
+        if not regressions:
+            print(f'No regressions compared with baseline {args.baseline}')
+    if args.save_baseline and args.baseline:
+        with open(args.baseline, 'w+') as file:
+            json.dump(results, file, indent=2)
+        print(f'Saving new baseline {args.baseline}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pm4py
+from pm4py.algo.simulation.playout.petri_net import algorithm as simulator
+from pm4py.objects.log.obj import EventLog, Trace, Event
+
+MODELS_PATH = os.path.join('datasets', 'dataset2', 'models')
+# number of traces simulated for each model, the log is generated by sampling these traces
+# so the generation of large logs (1M traces) does not depend on the Petri net playout
+DEFAULT_POOL_SIZE = 2000
+
+
+# simulate the model and return the sequences of activities
+def play_out_model(model_filename, pool_size=DEFAULT_POOL_SIZE):
+    net, im, fm = pm4py.read_pnml(model_filename)
+    parameters = {simulator.Variants.BASIC_PLAYOUT.value.Parameters.NO_TRACES: pool_size}
+    simulated_log = simulator.apply(net, im, fm, variant=simulator.Variants.BASIC_PLAYOUT, parameters=parameters)
+    return [tuple(e['concept:name'] for e in trace) for trace in simulated_log]
+
+
+# Generate a log with sudden drifts by concatenating segments of traces
+# models: name of the models (pnml files in models_path) used by the segments, the models are
+#         alternated, e.g., ['base', 'cb'] generates base, cb, base, cb, ... (control-flow drifts)
+# time_factors: factors applied to the duration of the events of each segment, also alternated,
+#         e.g., [1, 3] triples the duration in the odd segments (time drifts on the sojourn time)
+# The events contain start_timestamp and time:timestamp (interval log) for the SOJOURN_TIME attribute
+# Return the event log and the index of the traces where each drift starts
+def generate_drift_log(total_of_traces, total_of_segments=10, models=('base', 'cb'), time_factors=(1,),
+                       models_path=MODELS_PATH, pool_size=DEFAULT_POOL_SIZE, mean_duration=60,
+                       case_interarrival=300, seed=42):
+    rng = np.random.default_rng(seed)
+    pools = {m: play_out_model(os.path.join(models_path, f'{m}.pnml'), pool_size) for m in set(models)}
+    segment_size = total_of_traces // total_of_segments
+    drifts = [segment_size * s for s in range(1, total_of_segments)]
+    initial_timestamp = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    log = EventLog()
+    for i in range(total_of_traces):
+        segment = min(i // segment_size, total_of_segments - 1)
+        pool = pools[models[segment % len(models)]]
+        time_factor = time_factors[segment % len(time_factors)]
+        activities = pool[rng.integers(len(pool))]
+        durations = rng.exponential(mean_duration * time_factor, len(activities))
+        trace = Trace(attributes={'concept:name': str(i)})
+        timestamp = initial_timestamp + timedelta(seconds=i * case_interarrival)
+        for activity, duration in zip(activities, durations):
+            start_timestamp = timestamp
+            timestamp = timestamp + timedelta(seconds=float(duration))
+            trace.append(Event({'concept:name': activity,
+                                'start_timestamp': start_timestamp,
+                                'time:timestamp': timestamp}))
+        log.append(trace)
+    return log, drifts
+
+
+# generate the log and save it as XES, the file is reused if it already exists
+def get_drift_log_file(output_path, total_of_traces, total_of_segments=10, models=('base', 'cb'),
+                       time_factors=(1,), seed=42):
+    name = f'{"_".join(models)}_t{"_".join(str(f) for f in time_factors)}_{total_of_traces}_s{seed}.xes'
+    filename = os.path.join(output_path, name)
+    segment_size = total_of_traces // total_of_segments
+    drifts = [segment_size * s for s in range(1, total_of_segments)]
+    if not os.path.exists(filename):
+        if not os.path.exists(output_path):
+            os.makedirs(output_path)
+        print(f'Generating synthetic log {filename}')
+        log, drifts = generate_drift_log(total_of_traces, total_of_segments, models, time_factors, seed=seed)
+        pm4py.write_xes(log, filename)
+    return filename, drifts
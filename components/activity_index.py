@@ -0,0 +1,81 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import numpy as np
+import pandas as pd
+
+
+# Inverted index of the activities of the event log
+# For each activity it keeps the positions of its events (trace and event inside the trace), in the order
+# of the log, so the queries about some activities do not need to scan the complete log
+# For logs read as an event stream (dataframe) the trace position is the row and the event position is 0
+class ActivityIndex:
+    def __init__(self, activities, trace_positions, event_positions, occurrence_order=None):
+        # the codes follow the order of the first occurrence of each activity
+        # occurrence_order: order of the events used for defining the first occurrence (default the log order)
+        activities = np.asarray(activities, dtype=object)
+        if occurrence_order is None:
+            codes, uniques = pd.factorize(activities)
+        else:
+            uniques = pd.unique(activities[occurrence_order])
+            codes = pd.Categorical(activities, categories=uniques).codes
+        self.activities = list(uniques)
+        self.codes = {a: i for i, a in enumerate(self.activities)}
+        order = np.argsort(codes, kind='stable')
+        self.trace_positions = np.asarray(trace_positions, dtype=np.int64)[order]
+        self.event_positions = np.asarray(event_positions, dtype=np.int64)[order]
+        self.counts = np.bincount(codes, minlength=len(self.activities))
+        self.offsets = np.concatenate([[0], np.cumsum(self.counts)])
+
+    @staticmethod
+    def from_event_log(log):
+        activities = []
+        trace_positions = []
+        event_positions = []
+        for i, trace in enumerate(log):
+            for j, event in enumerate(trace):
+                activities.append(event['concept:name'])
+                trace_positions.append(i)
+                event_positions.append(j)
+        return ActivityIndex(activities, trace_positions, event_positions)
+
+    # the order of the activities is the same of the log converted to traces (cases in the order of the
+    # first event), as returned by attributes_filter
+    @staticmethod
+    def from_dataframe(df):
+        rows = np.arange(len(df))
+        cases, _ = pd.factorize(df['case:concept:name'].to_numpy())
+        return ActivityIndex(df['concept:name'].to_numpy(), rows, np.zeros(len(df), dtype=np.int64),
+                             occurrence_order=np.lexsort((rows, cases)))
+
+    # number of events of each activity, same result of attributes_filter.get_attribute_values for concept:name
+    def get_activities(self):
+        return {a: int(c) for a, c in zip(self.activities, self.counts)}
+
+    # positions (traces and events) of the activity
+    def get_postings(self, activity):
+        code = self.codes.get(activity)
+        if code is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        begin, end = self.offsets[code], self.offsets[code + 1]
+        return self.trace_positions[begin:end], self.event_positions[begin:end]
+
+    # positions of the events of all the informed activities, in the order of the log
+    def get_positions(self, activities):
+        postings = [self.get_postings(a) for a in activities]
+        if not postings:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        traces = np.concatenate([p[0] for p in postings])
+        events = np.concatenate([p[1] for p in postings])
+        order = np.lexsort((events, traces))
+        return traces[order], events[order]
@@ -0,0 +1,36 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+from components.adaptive.attribute_series import AttributeSeries
+from components.adaptive.change_points_info import ChangePointInfo
+from components.adaptive.detectors import SelectDetector
+
+
+# State of the adaptive time/data approach for one activity
+# Created when the first event of the activity is read, so activities that never
+# occur (or are filtered out) do not allocate a detector
+class ActivityState:
+    __slots__ = ('detector', 'values', 'change_points', 'change_points_time_based', 'change_points_info',
+                 'initial_index')
+
+    def __init__(self, activity, detector_class, retention, max_values):
+        self.detector = SelectDetector.get_detector_instance(detector_class.get_definition(),
+                                                             detector_class.parameters)
+        self.detector.instantiate_detector()
+        self.values = AttributeSeries(retention, max_values)
+        self.change_points = []
+        self.change_points_time_based = []
+        self.change_points_info = ChangePointInfo(detector_class.get_name(), activity)
+        for key in detector_class.parameters:
+            self.change_points_info.add_detector_attribute(key, detector_class.parameters[key])
+        self.initial_index = 0  # beginning of the current window
@@ -0,0 +1,159 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import shutil
+import tempfile
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+
+INITIAL_CAPACITY = 1024
+
+
+class AttributeRetention(str, Enum):
+    KEEP_ALL = 'Keep all values'
+    RING_BUFFER = 'Keep the last values'
+    SPILL = 'Spill to disk'
+
+
+# Values of the attribute collected for one activity in the adaptive time/data approach
+# Each value has the index (trace or event), the value, the timestamp and the case id, stored in
+# growable typed arrays instead of one dictionary per value
+# retention: KEEP_ALL keeps every value in memory, RING_BUFFER keeps only the last max_values
+# and SPILL writes blocks of max_values to disk (spill_path) and reads them back in to_dataframe()
+class AttributeSeries:
+    def __init__(self, retention=AttributeRetention.KEEP_ALL.name, max_values=None, spill_path=None):
+        self.retention = retention
+        self.max_values = max_values
+        if self.retention != AttributeRetention.KEEP_ALL.name and not self.max_values:
+            raise ValueError(f'Retention {retention} requires max_values')
+        capacity = INITIAL_CAPACITY
+        if self.retention == AttributeRetention.RING_BUFFER.name:
+            capacity = self.max_values
+        self.indexes = np.empty(capacity, dtype=np.int64)
+        self.values = np.empty(capacity, dtype=np.float64)
+        # POSIX timestamps (float, reading traces) or nanoseconds since epoch in UTC (reading events)
+        self.timestamps = None
+        self.timezone = None
+        self.case_ids = np.empty(capacity, dtype=object)
+        self.size = 0
+        self.start = 0  # first position of the ring buffer
+        self.total = 0  # all values appended, including the discarded or spilled ones
+        self.spill_path = spill_path
+        self.spilled_files = []
+
+    def __len__(self):
+        return self.total
+
+    def init_timestamps(self, timestamp):
+        if isinstance(timestamp, (int, float, np.number)):
+            self.timestamps = np.empty(len(self.indexes), dtype=np.float64)
+        else:
+            self.timestamps = np.empty(len(self.indexes), dtype=np.int64)
+            self.timezone = pd.Timestamp(timestamp).tz
+
+    def convert_timestamp(self, timestamp):
+        if self.timestamps.dtype == np.float64:
+            return timestamp
+        return pd.Timestamp(timestamp).value  # nanoseconds in UTC
+
+    def grow(self):
+        capacity = len(self.indexes) * 2
+        self.indexes = np.resize(self.indexes, capacity)
+        self.values = np.resize(self.values, capacity)
+        self.timestamps = np.resize(self.timestamps, capacity)
+        case_ids = np.empty(capacity, dtype=object)
+        case_ids[:self.size] = self.case_ids[:self.size]
+        self.case_ids = case_ids
+
+    def get_last_position(self):
+        return (self.start + self.size - 1) % len(self.indexes)
+
+    # add the value observed at the index
+    # when reading traces the index is the trace, so a second value of the activity in the same trace
+    # replaces the previous one (one value per index)
+    def append(self, index, value, timestamp, case_id):
+        if self.timestamps is None:
+            self.init_timestamps(timestamp)
+        if self.size > 0 and self.indexes[self.get_last_position()] == index:
+            position = self.get_last_position()
+        else:
+            if self.retention == AttributeRetention.RING_BUFFER.name:
+                if self.size == self.max_values:
+                    self.start = (self.start + 1) % self.max_values
+                    self.size -= 1
+            else:
+                if self.retention == AttributeRetention.SPILL.name and self.size == self.max_values:
+                    self.spill()
+                if self.size == len(self.indexes):
+                    self.grow()
+            position = (self.start + self.size) % len(self.indexes)
+            self.size += 1
+            self.total += 1
+        self.indexes[position] = index
+        self.values[position] = value
+        self.timestamps[position] = self.convert_timestamp(timestamp)
+        self.case_ids[position] = case_id
+
+    def spill(self):
+        if self.spill_path is None:
+            self.spill_path = tempfile.mkdtemp(prefix='ipdd_attribute_series_')
+        elif not os.path.exists(self.spill_path):
+            os.makedirs(self.spill_path)
+        filename = os.path.join(self.spill_path, f'{id(self)}_{len(self.spilled_files)}.npz')
+        np.savez(filename, indexes=self.indexes[:self.size], values=self.values[:self.size],
+                 timestamps=self.timestamps[:self.size], case_ids=self.case_ids[:self.size])
+        self.spilled_files.append(filename)
+        self.size = 0
+
+    # arrays with the values in memory in the order they were appended (views when possible)
+    def get_arrays(self):
+        if self.timestamps is None:
+            return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64),
+                    np.empty(0, dtype=object))
+        if self.start == 0:
+            positions = slice(0, self.size)
+        else:  # ring buffer after discarding values
+            positions = (np.arange(self.size) + self.start) % len(self.indexes)
+        return self.indexes[positions], self.values[positions], self.timestamps[positions], \
+            self.case_ids[positions]
+
+    # dataframe with the columns index, value, timestamp and case_id, used by the plots and the exported files
+    def to_dataframe(self):
+        indexes, values, timestamps, case_ids = self.get_arrays()
+        if self.spilled_files:
+            blocks = [np.load(f, allow_pickle=True) for f in self.spilled_files]
+            indexes = np.concatenate([b['indexes'] for b in blocks] + [indexes])
+            values = np.concatenate([b['values'] for b in blocks] + [values])
+            timestamps = np.concatenate([b['timestamps'] for b in blocks] + [timestamps])
+            case_ids = np.concatenate([b['case_ids'] for b in blocks] + [case_ids])
+        if timestamps.dtype == np.int64:
+            timestamps = pd.DatetimeIndex(timestamps.view('datetime64[ns]')).tz_localize('UTC')
+            if self.timezone is not None:
+                timestamps = timestamps.tz_convert(self.timezone)
+            else:
+                timestamps = timestamps.tz_localize(None)
+        # the row labels are the position of the value in the series, including the discarded ones
+        return pd.DataFrame({'index': indexes, 'value': values, 'timestamp': timestamps, 'case_id': case_ids},
+                            index=pd.RangeIndex(self.total - len(indexes), self.total), copy=False)
+
+    # remove the spilled files
+    def clear(self):
+        for f in self.spilled_files:
+            if os.path.exists(f):
+                os.remove(f)
+        self.spilled_files = []
+        if self.spill_path and os.path.basename(self.spill_path).startswith('ipdd_attribute_series_'):
+            shutil.rmtree(self.spill_path, ignore_errors=True)
@@ -0,0 +1,221 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import numpy as np
+
+
+# Bank of K change detectors (streams) with the state kept in NumPy arrays
+# Each step receives the values of some streams and updates all of them at once,
+# instead of calling one Python detector object per stream
+# As the river detectors, a stream that reports a drift is reset in its next update
+class DetectorBank:
+    def __init__(self, streams):
+        self.streams = streams
+        self.steps = 0  # number of steps (rows) processed, used as the index of the drifts
+        self.drift_detected = np.zeros(streams, dtype=bool)
+        self.warning_detected = np.zeros(streams, dtype=bool)
+
+    # update the streams with one value each
+    # values: array with the values, aligned with streams (all the streams if streams is None)
+    # return the streams where a drift is detected in this step
+    def update(self, values, streams=None):
+        if streams is None:
+            streams = np.arange(self.streams)
+        streams = np.asarray(streams, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        # reset the streams with a drift detected in the previous update
+        reset = streams[self.drift_detected[streams]]
+        if len(reset) > 0:
+            self.reset(reset)
+        self.drift_detected[streams] = False
+        self.warning_detected[streams] = False
+        self.update_streams(streams, values)
+        self.steps += 1
+        return streams[self.drift_detected[streams]]
+
+    # update the streams with a batch of observations
+    # values: matrix (steps x streams), NaN when the stream does not receive a value in the step
+    # return the list of drifts as (stream, index) pairs, where index is the step in the complete sequence
+    def update_batch(self, values):
+        values = np.asarray(values, dtype=float)
+        drifts = []
+        for row in values:
+            streams = np.flatnonzero(~np.isnan(row))
+            index = self.steps
+            for s in self.update(row[streams], streams):
+                drifts.append((int(s), index))
+        return drifts
+
+    def update_streams(self, streams, values):
+        pass
+
+    def reset(self, streams):
+        pass
+
+
+# ADWIN-style detector bank (Bifet and Gavaldà, 2007)
+# Each stream keeps its window in a row of a matrix (up to max_window values) and, every clock updates,
+# all the cuts are evaluated at once with cumulative sums, using the same bound of river.drift.ADWIN
+# It does not compress the window in exponential buckets as river does, so every cut is evaluated and
+# the detections may happen a few values earlier than river
+class AdwinBank(DetectorBank):
+    def __init__(self, streams, delta=0.002, clock=32, min_window_length=5, grace_period=10, max_window=2048):
+        super().__init__(streams)
+        self.delta = delta
+        self.clock = clock
+        self.min_window_length = min_window_length
+        self.grace_period = grace_period
+        self.max_window = max_window
+        # the windows are stored from start to end, when end reaches the capacity the last values
+        # are moved to the beginning of the row
+        self.buffer = np.zeros((streams, 2 * max_window), dtype=float)
+        self.start = np.zeros(streams, dtype=np.int64)
+        self.end = np.zeros(streams, dtype=np.int64)
+        self.tick = np.zeros(streams, dtype=np.int64)
+
+    def reset(self, streams):
+        self.start[streams] = 0
+        self.end[streams] = 0
+        self.tick[streams] = 0
+
+    def update_streams(self, streams, values):
+        full = streams[self.end[streams] == self.buffer.shape[1]]
+        for s in full:
+            self.buffer[s, :self.max_window] = self.buffer[s, self.end[s] - self.max_window:self.end[s]]
+            self.start[s] = 0
+            self.end[s] = self.max_window
+        self.buffer[streams, self.end[streams]] = values
+        self.end[streams] += 1
+        # drop the oldest value when the window is complete
+        self.start[streams] = np.maximum(self.start[streams], self.end[streams] - self.max_window)
+        self.tick[streams] += 1
+
+        width = self.end[streams] - self.start[streams]
+        check = streams[(self.tick[streams] % self.clock == 0) & (width > self.grace_period)]
+        if len(check) > 0:
+            self.drift_detected[check] = self.detect_change(check)
+
+    # evaluate all the cuts (W0 the oldest values, W1 the newest ones) of the informed streams
+    def detect_change(self, streams):
+        width = self.end[streams] - self.start[streams]
+        length = int(width.max())
+        # windows aligned to the left, padded with zeros
+        positions = np.minimum(self.start[streams, None] + np.arange(length), self.buffer.shape[1] - 1)
+        valid = np.arange(length) < width[:, None]
+        windows = np.where(valid, self.buffer[streams[:, None], positions], 0.0)
+
+        n = width[:, None].astype(float)
+        total = windows.sum(axis=1, keepdims=True)
+        mean = total / n
+        variance_in_window = (np.where(valid, windows - mean, 0.0) ** 2).sum(axis=1, keepdims=True) / n
+
+        n0 = np.arange(1, length + 1, dtype=float)[None, :]
+        n1 = n - n0
+        u0 = np.cumsum(windows, axis=1)
+        u1 = total - u0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta_mean = u0 / n0 - u1 / n1
+            delta_prime = np.log(2 * np.log(n) / self.delta)
+            m_recip = 1.0 / (n0 - self.min_window_length + 1) + 1.0 / (n1 - self.min_window_length + 1)
+            epsilon = np.sqrt(2 * m_recip * variance_in_window * delta_prime) + 2 / 3 * delta_prime * m_recip
+            cut = (np.abs(delta_mean) > epsilon) & (n0 >= self.min_window_length) & \
+                (n1 >= self.min_window_length)
+        return cut.any(axis=1)
+
+
+# HDDM_W detector bank (Frías-Blanco et al., 2014), same algorithm of river.drift.binary.HDDM_W
+# The statistics of each sample (EWMA, independent bound condition and initialization) are kept in arrays
+class HddmWBank(DetectorBank):
+    # columns of the samples matrix
+    EWMA = 0
+    IBC = 1
+    INIT = 2
+    # samples
+    TOTAL = 0
+    S1_INCR = 1
+    S2_INCR = 2
+    S1_DECR = 3
+    S2_DECR = 4
+
+    def __init__(self, streams, drift_confidence=0.001, warning_confidence=0.005, lambda_val=0.05,
+                 two_sided_test=False):
+        super().__init__(streams)
+        self.drift_confidence = drift_confidence
+        self.warning_confidence = warning_confidence
+        self.lambda_val = lambda_val
+        self.two_sided_test = two_sided_test
+        self.samples = np.zeros((streams, 5, 3), dtype=float)
+        self.incr_cutpoint = np.zeros(streams, dtype=float)
+        self.decr_cutpoint = np.zeros(streams, dtype=float)
+        self.reset(np.arange(streams))
+
+    def reset(self, streams):
+        self.samples[streams] = 0.0
+        self.samples[streams, :, self.IBC] = 1.0
+        self.incr_cutpoint[streams] = np.inf
+        self.decr_cutpoint[streams] = -np.inf
+
+    def update_sample(self, streams, sample, values):
+        s = self.samples[streams, sample]
+        # as river.stats.EWMean, the mean starts with the value while it is zero
+        ewma = np.where(s[:, self.EWMA] != 0,
+                        self.lambda_val * values + (1 - self.lambda_val) * s[:, self.EWMA], values)
+        ibc = self.lambda_val ** 2 + (1 - self.lambda_val) ** 2 * s[:, self.IBC]
+        self.samples[streams, sample, self.EWMA] = ewma
+        self.samples[streams, sample, self.IBC] = ibc
+        self.samples[streams, sample, self.INIT] = 1.0
+
+    @staticmethod
+    def mcdiarmid_bound(ibc, confidence):
+        return np.sqrt(ibc * np.log(1 / confidence) / 2)
+
+    # the mean of sample2 is higher than the mean of sample1
+    def has_mean_changed(self, streams, sample1, sample2, confidence):
+        s1 = self.samples[streams, sample1]
+        s2 = self.samples[streams, sample2]
+        bound = self.mcdiarmid_bound(s1[:, self.IBC] + s2[:, self.IBC], confidence)
+        return (s1[:, self.INIT] > 0) & (s2[:, self.INIT] > 0) & (s2[:, self.EWMA] - s1[:, self.EWMA] > bound)
+
+    def update_cut_statistics(self, streams, values, increase):
+        total = self.samples[streams, self.TOTAL]
+        eps = self.mcdiarmid_bound(total[:, self.IBC], self.drift_confidence)
+        if increase:
+            new_cut = total[:, self.EWMA] + eps < self.incr_cutpoint[streams]
+            cutpoint, s1, s2 = self.incr_cutpoint, self.S1_INCR, self.S2_INCR
+            value = total[:, self.EWMA] + eps
+        else:
+            new_cut = total[:, self.EWMA] - eps > self.decr_cutpoint[streams]
+            cutpoint, s1, s2 = self.decr_cutpoint, self.S1_DECR, self.S2_DECR
+            value = total[:, self.EWMA] - eps
+        cut_streams = streams[new_cut]
+        cutpoint[cut_streams] = value[new_cut]
+        self.samples[cut_streams, s1] = total[new_cut]
+        self.samples[cut_streams, s2] = (0.0, 1.0, 0.0)
+        other = ~new_cut
+        self.update_sample(streams[other], s2, values[other])
+
+    def update_streams(self, streams, values):
+        self.update_sample(streams, self.TOTAL, values)
+
+        self.update_cut_statistics(streams, values, increase=True)
+        drift = self.has_mean_changed(streams, self.S1_INCR, self.S2_INCR, self.drift_confidence)
+        warning = ~drift & self.has_mean_changed(streams, self.S1_INCR, self.S2_INCR, self.warning_confidence)
+
+        self.update_cut_statistics(streams, values, increase=False)
+        if self.two_sided_test:
+            drift_decr = self.has_mean_changed(streams, self.S2_DECR, self.S1_DECR, self.drift_confidence)
+            warning |= ~drift_decr & self.has_mean_changed(streams, self.S2_DECR, self.S1_DECR,
+                                                           self.warning_confidence)
+            drift |= drift_decr
+        self.drift_detected[streams] = drift
+        self.warning_detected[streams] = warning
@@ -3,6 +3,8 @@ from enum import Enum
 import river.drift
 from river import drift
 
+from components.adaptive.detector_bank import AdwinBank, HddmWBank
+
 
 class ConceptDriftDetector(str, Enum):
     ADWIN = 'adwin'
@@ -28,12 +30,20 @@ class SelectDetector:
             detector_class.set_factor(factor)
         return detector_class
 
+    # bank with one detector for each stream, updated in vectorized steps
+    @staticmethod
+    def get_detector_bank(detector_name, streams, parameters=None):
+        detector_class = SelectDetector.get_detector_instance(detector_name, parameters)
+        return detector_class.instantiate_bank(streams)
+
 
 class DetectorWrapper:
     def __init__(self):
         self.parameters = {}
         self.detector = None
         self.factor = 1
+        # the bank (get_detector_bank) reports the same drifts of the detector, so it can replace it
+        self.exact_bank = False
 
     def get_name(self):
         return self.name
@@ -66,6 +76,10 @@ class DetectorWrapper:
     def set_factor(self, factor):
         self.factor = factor
 
+    # detectors without a warning level never report a warning
+    def warning_detected(self):
+        return False
+
 
 class AdwinDetector(DetectorWrapper):
     def __init__(self, parameters=None, factor=100):
@@ -82,6 +96,9 @@ class AdwinDetector(DetectorWrapper):
     def instantiate_detector(self):
         self.detector = river.drift.ADWIN(delta=self.parameters['delta'])
 
+    def instantiate_bank(self, streams):
+        return AdwinBank(streams, delta=self.parameters['delta'])
+
     def update_val(self, value):
         self.detector.update(value)
 
@@ -98,6 +115,7 @@ class HddmWDetector(DetectorWrapper):
         super().set_factor(factor)
         self.name = ConceptDriftDetector.HDDM_W.value
         self.definition = ConceptDriftDetector.HDDM_W.name
+        self.exact_bank = True
         self.default_parameters = {'drift_confidence': 0.001,
                                    'warning_confidence': 0.005,
                                    'lambda_val': 0.05,
@@ -113,11 +131,20 @@ class HddmWDetector(DetectorWrapper):
                                             lambda_val=self.parameters['lambda_val'],
                                             two_sided_test=self.parameters['two_sided_test'])
 
+    def instantiate_bank(self, streams):
+        return HddmWBank(streams, drift_confidence=self.parameters['drift_confidence'],
+                         warning_confidence=self.parameters['warning_confidence'],
+                         lambda_val=self.parameters['lambda_val'],
+                         two_sided_test=self.parameters['two_sided_test'])
+
     def update_val(self, value):
         self.detector.update(value)
 
     def detected_change(self):
         return self.detector.drift_detected
 
+    def warning_detected(self):
+        return self.detector.warning_detected
+
     def reset(self):
         self.instantiate_detector()
@@ -0,0 +1,75 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from components.file_hash import get_file_sha256
+from components.parameters import Paths
+
+# change it when the calculation of the signals changes, invalidating the cached ones
+SIGNAL_CACHE_VERSION = 1
+SIGNAL_CACHE_PATH = os.path.join(Paths.DATA_PATH, Paths.CACHE_PATH, 'signals')
+
+
+# Cache of the quality metrics series (signals) calculated trace by trace
+# When the model is not updated after a drift, the series depends only on the log, the initial model
+# (discovered from the first win_size traces) and the metrics, but not on the detector
+# The values are saved without the detector factor, so any detector can replay them
+class SignalCache:
+    def __init__(self, path=SIGNAL_CACHE_PATH):
+        self.path = path
+
+    @staticmethod
+    def get_key(log_filename, metrics, win_size, total_of_traces, discovery='inductive'):
+        definition = {
+            'version': SIGNAL_CACHE_VERSION,
+            'log': get_file_sha256(log_filename),
+            'metrics': sorted(metrics.items()),
+            'win_size': win_size,
+            'traces': total_of_traces,
+            'discovery': discovery,
+        }
+        return hashlib.sha256(json.dumps(definition, sort_keys=True).encode()).hexdigest()
+
+    def get_filename(self, key):
+        return os.path.join(self.path, f'{key}.npz')
+
+    # return a dictionary with the series of each dimension or None if the signal is not cached
+    def load(self, key):
+        filename = self.get_filename(key)
+        if not os.path.exists(filename):
+            return None
+        try:
+            with np.load(filename) as data:
+                return {dimension: data[dimension] for dimension in data.files}
+        except (OSError, ValueError) as e:
+            print(f'Error reading signal cache {filename}: {e}')
+            return None
+
+    def save(self, key, signals):
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+        filename = self.get_filename(key)
+        # write to a temporary file first, so a concurrent run never reads a partial file
+        tmp_filename = f'{filename}.{os.getpid()}.tmp.npz'
+        np.savez(tmp_filename, **{dimension: np.asarray(values, dtype=float)
+                                  for dimension, values in signals.items()})
+        os.replace(tmp_filename, filename)
+        print(f'Saving signal cache {filename}')
+
+
+signal_cache = SignalCache()
@@ -12,11 +12,11 @@
     along with IPDD. If not, see <https://www.gnu.org/licenses/>.
 """
 import os
+from collections import deque
 from threading import Thread
 import pm4py
 from pm4py.objects.conversion.log import converter as log_converter
-from pm4py.objects.log.obj import EventStream, EventLog
-from pm4py.algo.filtering.log.attributes import attributes_filter
+from pm4py.objects.log.obj import EventLog
 from pm4py.algo.evaluation.precision import algorithm as precision_evaluator
 from pm4py.algo.evaluation.replay_fitness import algorithm as replay_fitness_evaluator
 from pm4py.algo.discovery.footprints import algorithm as fp_discovery
@@ -26,15 +26,29 @@ from pm4py.objects.log.exporter.xes import exporter as xes_exporter
 from datetime import datetime, date
 from components.adaptive.attributes import SelectAttribute, Activity
 from components.adaptive.change_points_info import ChangePointInfo
+from components.adaptive.activity_state import ActivityState
 from components.adaptive.detectors import SelectDetector
+from components.adaptive.signal_cache import signal_cache
 from components.parameters import Approach, AttributeAdaptive, AdaptivePerspective, ControlflowAdaptiveApproach, \
-    get_value_of_parameter
+    OutputFormat, get_value_of_parameter
+from components.artifact_writer import artifact_writer
+from components.plot_render import PlotSpec, plot_render_service
 from components.compare_models.manage_similarity_metrics import ManageSimilarityMetrics
-
-from components.parameters import ReadLogAs, WindowUnityFixed
+from components.discovery.discovery_pool import discovery_pool
+from components.discovery.speculative_discovery import SpeculativeDiscovery
+from components.discovery.discovery_cache import discovery_cache
+from components.discovery.discovery_backends import discover_petri_net_with_backend, \
+    discover_process_tree_with_backend, has_process_tree
+from components.discovery.variant_window import VariantWindow, get_variant
+from components.discovery.window_summary import WindowSummary
+from components.monitoring.performance_metrics import performance_metrics, measured, Stage
+from components.monitoring.tracer import tracer
+from components.monitoring.memory import memory_accounting
+
+from components.parameters import ReadLogAs, WindowUnityFixed, FixedWindowType, DiscoveryBackend, QualityMetric
+from components.window_plan import get_tumbling_windows
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 from enum import Enum
 
 
@@ -52,6 +66,69 @@ class QualityDimension(str, Enum):
     PRECISION = 'precision'
 
 
+# metrics calculated for each trace using the DFG of the window used for discovering the model (reference),
+# without replay
+DFG_QUALITY_METRICS = [QualityMetric.FITNESS_DFG.value]
+
+
+# quality metrics supported by each approach of the adaptive control-flow perspective
+# trace by trace: the metrics are calculated for each trace (replay, alignments or the reference DFG)
+# windowing: the fitness is calculated for each trace and the precision with the footprints of the window
+# precisionDFG (share of the edges of the reference DFG covered by the window) is only supported by the windowing
+# approach: for one trace it is bounded by the number of distinct pairs of the trace divided by the number of
+# edges of the reference, so it would follow the length of the traces and not the precision of the model
+QUALITY_METRICS_BY_APPROACH = {
+    ControlflowAdaptiveApproach.TRACE.name: [QualityMetric.FITNESS_TBR.value, QualityMetric.FITNESS_AL.value,
+                                             QualityMetric.FITNESS_DFG.value, QualityMetric.PRECISION_ETC.value,
+                                             QualityMetric.PRECISION_AL.value],
+    ControlflowAdaptiveApproach.WINDOW.name: [QualityMetric.FITNESS_TBR.value, QualityMetric.FITNESS_AL.value,
+                                              QualityMetric.FITNESS_DFG.value, QualityMetric.PRECISION_FP.value,
+                                              QualityMetric.PRECISION_DFG.value],
+}
+
+
+# raise ValueError if some quality metric is not supported by the approach (ControlflowAdaptiveApproach name)
+def check_quality_metrics(approach, quality_metrics):
+    if not quality_metrics:
+        return
+    supported = QUALITY_METRICS_BY_APPROACH[approach]
+    unsupported = [m for m in quality_metrics if m not in supported]
+    if unsupported:
+        raise ValueError(f'Quality metrics {unsupported} are not supported by the approach '
+                         f'{ControlflowAdaptiveApproach[approach].value}, use {supported}')
+
+
+# quality metric (e.g., fitnessTBR) for each quality dimension, the metrics defined by the parameter
+# quality_metrics replace the default metrics of the approach
+def get_quality_metrics(approach, default_metrics, quality_metrics=None):
+    check_quality_metrics(approach, quality_metrics)
+    metrics = dict(default_metrics)
+    for metric_name in quality_metrics or []:
+        for dimension in QualityDimension:
+            if metric_name.startswith(dimension.value):
+                metrics[dimension.name] = metric_name
+    return metrics
+
+
+# DFG-based metrics of one trace (variant), calculated with hash lookups in O(trace length)
+# reference: VariantWindow used for discovering the model
+# fitnessDFG: share of the directly-follows pairs of the trace, including the start and end activities, present
+# in the reference DFG
+@measured(Stage.CONFORMANCE_METRICS)
+def calculate_quality_metric_dfg(metric_name, variant, reference):
+    pairs = list(zip(variant, variant[1:]))
+    if metric_name == QualityMetric.FITNESS_DFG.value:
+        if len(variant) == 0:
+            return 1.0
+        matched = int(variant[0] in reference.start_activities) + int(variant[-1] in reference.end_activities)
+        matched += sum(1 for pair in pairs if pair in reference.edges)
+        return matched / (len(pairs) + 2)
+    else:
+        print(f'metric name not identified {metric_name} in calculate_quality_metric_dfg')
+        return 0
+
+
+@measured(Stage.CONFORMANCE_METRICS)
 def calculate_quality_metric(metric_name, log, net, im, fm):
     if metric_name == 'precisionETC':
         return precision_evaluator.apply(log, net, im, fm,
@@ -73,12 +150,80 @@ def calculate_quality_metric(metric_name, log, net, im, fm):
         return 0
 
 
-def calculate_quality_metric_footprints(metric_name, log, tree):
-    if metric_name == 'precisionFP':
-        fp_log = fp_discovery.apply(log, variant=fp_discovery.Variants.TRACE_BY_TRACE)
-        fp_tree = fp_discovery.apply(tree, variant=fp_discovery.Variants.PROCESS_TREE)
-        precision = evaluation.fp_precision(fp_log, fp_tree)
-        return precision
+# Values of the quality metrics calculated for one trace (trace by trace), which depend only on the variant
+# of the trace, so each metric is calculated once for each variant until the model changes
+class VariantMetrics:
+    def __init__(self):
+        self.values = {}
+        self.net = None
+
+    def clear(self):
+        self.values = {}
+
+    # the values are kept while the model is the same (the discovery cache returns the same net for windows with
+    # the same variants)
+    # reference: VariantWindow used for discovering the model, required by the DFG-based metrics
+    def get_value(self, metric_name, variant, trace, net, im, fm, reference=None):
+        if net is not self.net:
+            self.clear()
+            self.net = net
+        key = (metric_name, variant)
+        if key not in self.values:
+            if metric_name in DFG_QUALITY_METRICS:
+                self.values[key] = calculate_quality_metric_dfg(metric_name, variant, reference)
+            else:
+                self.values[key] = calculate_quality_metric(metric_name, EventLog([trace]), net, im, fm)
+        return self.values[key]
+
+
+# configurations (sequence and parallel relations) of the footprints of the process tree
+def get_model_configurations(tree):
+    fp_tree = fp_discovery.apply(tree, variant=fp_discovery.Variants.PROCESS_TREE)
+    return fp_tree[evaluation.Outputs.SEQUENCE.value].union(fp_tree[evaluation.Outputs.PARALLEL.value])
+
+
+# configurations of the footprints of the reachability graph of the Petri net, used for the discovery backends
+# that do not discover a process tree
+def get_net_configurations(net, im):
+    fp_net = fp_discovery.apply(net, im, variant=fp_discovery.Variants.PETRI_REACH_GRAPH)
+    return fp_net[evaluation.Outputs.SEQUENCE.value].union(fp_net[evaluation.Outputs.PARALLEL.value])
+
+
+# window: VariantWindow with the traces evaluated
+# model_configurations: footprints of the process tree (get_model_configurations)
+@measured(Stage.CONFORMANCE_METRICS)
+def calculate_quality_metric_footprints(metric_name, window, model_configurations):
+    if metric_name in [QualityMetric.PRECISION_FP.value, QualityMetric.PRECISION_DFG.value]:
+        # same value of evaluation.fp_precision using the footprints of each trace: the sequence and parallel
+        # relations of the traces are the directly-follows relations of the window
+        # for precisionDFG the configurations are the edges of the reference DFG (edge-coverage precision)
+        if model_configurations:
+            return len(window.get_relations_set().intersection(model_configurations)) / len(model_configurations)
+        # precision 1.0 if model configurations are empty
+        return 1.0
+    raise ValueError(f'Metric {metric_name} is not calculated using footprints')
+
+
+# the models are discovered using the variants of the window (VariantWindow)
+# windows with the same variants (same fingerprint) reuse the model discovered for the first one
+# backend: algorithm used for the discovery (DiscoveryBackend)
+@measured(Stage.DISCOVERY)
+def discover_petri_net(window, backend=DiscoveryBackend.INDUCTIVE.name):
+    return discovery_cache.get_model(f'petri_net_{backend}', window.get_fingerprint(),
+                                     lambda: discover_petri_net_with_backend(window, backend))
+
+
+@measured(Stage.DISCOVERY)
+def discover_process_tree(window, backend=DiscoveryBackend.INDUCTIVE.name):
+    return discovery_cache.get_model(f'process_tree_{backend}', window.get_fingerprint(),
+                                     lambda: discover_process_tree_with_backend(window, backend))
+
+
+# window: VariantWindow used for discovering the model, the file of a model already saved is linked
+@measured(Stage.FILE_WRITE)
+def export_petri_net(net, im, fm, pnml_filename, window, backend=DiscoveryBackend.INDUCTIVE.name):
+    discovery_cache.save_file(f'petri_net_{backend}', window.get_fingerprint(), pnml_filename,
+                              lambda filename: pnml_exporter.apply(net, im, filename, final_marking=fm))
 
 
 class AnalyzeDrift:
@@ -119,12 +264,17 @@ class AnalyzeDrift:
             self.current_log.log.rename(columns={'index': 'event_id'}, inplace=True)
 
         self.event_data = self.current_log.log
+        # values of the attribute per activity (adaptive time/data), kept for the memory accounting
+        self.attribute_values = None
+        # number of events of each activity, calculated when the analysis starts
+        self.activities_support = None
 
         # class that implements the discovery method for the current model
         self.discovery = discovery
 
     # save the change points in a txt file
     # used in the adaptive approaches
+    @measured(Stage.FILE_WRITE)
     def save_change_points(self, filename, change_points, change_points_info, activities=None):
         with open(filename, 'w+') as file:
             if activities:
@@ -148,10 +298,9 @@ class AnalyzeDrift:
             real_drifts_for_plot = parameters.real_drifts_for_plot[activity_name][self.current_parameters.logname]
 
 
-        df = pd.DataFrame(values_for_activity).T.reset_index()
+        df = values_for_activity.to_dataframe()
 
         # save temporal series to a csv file
-        df.columns = ['index', 'value', 'timestamp', 'case_id']
         filename_attributes = f'{activity_name}'
         if self.current_parameters.attribute_name_for_plot:
             attribute = self.current_parameters.attribute_name_for_plot
@@ -162,10 +311,16 @@ class AnalyzeDrift:
         else:
             attribute = self.current_parameters.attribute_name
         # save temporal serie into csv and excel for analysis
-        output_filename = os.path.join(self.output_path_adaptive_detector, f'{filename_attributes}.csv')
-        df.to_csv(output_filename, index=False)
-        output_filename = os.path.join(self.output_path_adaptive_detector, f'{filename_attributes}.xlsx')
-        df.to_excel(output_filename, index=False)
+        # the files are written in background by the artifact writer
+        output_formats = self.current_parameters.output_formats
+        if OutputFormat.CSV.name in output_formats:
+            output_filename = os.path.join(self.output_path_adaptive_detector, f'{filename_attributes}.csv')
+            artifact_writer.submit(Stage.FILE_WRITE, df.to_csv, output_filename, index=False)
+        if OutputFormat.XLSX.name in output_formats:
+            output_filename = os.path.join(self.output_path_adaptive_detector, f'{filename_attributes}.xlsx')
+            artifact_writer.submit(Stage.FILE_WRITE, df.to_excel, output_filename, index=False)
+        if OutputFormat.PNG.name not in output_formats:
+            return
 
         # generate plot
         if self.current_parameters.read_log_as == ReadLogAs.EVENT.name:
@@ -176,84 +331,77 @@ class AnalyzeDrift:
                              change_points_time_based)
 
             # for plotting based on event index
-            df.drop(['index'], axis=1, inplace=True)
+            # a new dataframe is used because the previous one is still used by the writer
+            df_event_based = df.drop(['index'], axis=1).reset_index()
             x_column_name_event_based = 'index'
             x_name_event_based = 'event index'
-            df.reset_index(inplace=True)
-            self.plot_signal(df, x_column_name_event_based, x_name_event_based, activity_name, attribute,
-                             change_points, real_drifts_for_plot=real_drifts_for_plot)
+            self.plot_signal(df_event_based, x_column_name_event_based, x_name_event_based, activity_name,
+                             attribute, change_points, real_drifts_for_plot=real_drifts_for_plot)
         else:
             x_colum_name = 'index'
             x_name = 'trace'
             self.plot_signal(df, x_colum_name, x_name, activity_name, attribute, change_points,
                              real_drifts_for_plot=real_drifts_for_plot)
 
+    # the plot is rendered by the plot render service (process pool)
     def plot_signal(self, df_plot, x_column_name, x_axis_name, activity_name, attribute, change_points,
                     real_drifts_for_plot=None):
-        sns.set_style("whitegrid")
-        plot = sns.lineplot(data=df_plot, x=x_column_name, y='value')
-        plot.set_xlabel(x_axis_name)
-        plot.set_ylabel(f'{attribute}')
-
-        if change_points:
-            for cp in change_points:
-                plt.axvline(x=cp, color='r', linestyle=':')
-
-        if real_drifts_for_plot:
-            for rd in real_drifts_for_plot:
-                plt.axvline(x=rd, color='g', linestyle=':')
-
-        # save the plot
         filename = os.path.join(self.output_path_adaptive_detector, f'{activity_name}_{x_axis_name}.png')
-        plt.title(f'Adaptive Time/Data - {activity_name}')
-        plt.savefig(filename)
+        spec = PlotSpec(filename, title=f'Adaptive Time/Data - {activity_name}', x_label=x_axis_name,
+                        y_label=f'{attribute}',
+                        series=[(None, df_plot[x_column_name].to_numpy(), df_plot['value'].to_numpy())],
+                        change_points=change_points, real_drifts=real_drifts_for_plot)
+        plot_render_service.submit(spec)
         print(f'Saving plot for activity  - {activity_name}')
-        plt.close()
-        plt.cla()
-        plt.clf()
 
     # generate the plot with the fitness and precision metrics and the drifts
     # used for adaptive change detection in the control-flow perspective
     def plot_signal_adaptive_controlflow(self, values, metrics, drifts=None):
-        # plt.style.use('seaborn-whitegrid')
+        # copy the values because the files are generated in background by the artifact writer
+        values = {m: list(values[m]) for m in metrics.keys()}
+        output_formats = self.current_parameters.output_formats
+        if OutputFormat.PNG.name in output_formats:
+            self.plot_metrics_adaptive_controlflow(values, metrics, drifts)
+        # save the time series (fitness and precision)
+        for m in metrics.keys():
+            if OutputFormat.XLSX.name in output_formats:
+                df = pd.DataFrame(values[m])
+                artifact_writer.submit(Stage.FILE_WRITE, df.to_excel,
+                                       os.path.join(self.output_path_adaptive_detector, f'{metrics[m]}.xlsx'))
+            if OutputFormat.CSV.name in output_formats:
+                df = pd.DataFrame(values[m])
+                df.index.name = 'Index'
+                artifact_writer.submit(Stage.FILE_WRITE, df.to_csv,
+                                       os.path.join(self.output_path_adaptive_detector, f'{metrics[m]}.csv'),
+                                       header=['Value'])
+
+    def plot_metrics_adaptive_controlflow(self, values, metrics, drifts):
+        series = []
         for metric in metrics.keys():
-            plt.plot(values[metric], label=metrics[metric])
+            series.append((metrics[metric], list(range(len(values[metric]))), values[metric]))
             no_values = len(values[metric])
         gap = int(no_values * 0.1)
         if gap == 0:  # less than 10 values
             gap = 1
-        xpos = range(0, no_values + 1, gap)
+        xpos = list(range(0, no_values + 1, gap))
 
         # draw a line for each reported drift
         indexes = [int(x) for x in drifts]
-        for d in indexes:
-            plt.axvline(x=d, label=d, color='k', linestyle=':')
 
         if len(drifts) > 0:
-            plt.xlabel('Trace')
+            x_label = 'Trace'
         else:
-            plt.xlabel('Trace - no drifts detected')
+            x_label = 'Trace - no drifts detected'
 
-        plt.xticks(xpos, xpos, rotation=90)
-        plt.legend(bbox_to_anchor=(1.02, 1), loc='upper left')
-        plt.ylabel(f'Metric value')
         approach = get_value_of_parameter(self.current_parameters.adaptive_controlflow_approach)
         output_name = os.path.join(self.output_path_adaptive_detector,
                                    f'adaptive_controlflow_metrics.png')
-
-        plt.title(f'Adaptive Control-flow {approach}')
+        spec = PlotSpec(output_name, title=f'Adaptive Control-flow {approach}', x_label=x_label,
+                        y_label=f'Metric value', series=series, change_points=indexes, label_change_points=True,
+                        x_ticks=xpos, x_ticks_rotation=90, legend=True, bbox_tight=True)
         # save the plot
         print(f'Saving plot for adaptive control-flow {approach} - {self.current_parameters.logname}')
-        plt.savefig(output_name, bbox_inches='tight')
-        # save the time series (fitness and precision)
-        for m in metrics.keys():
-            df = pd.DataFrame(values[m])
-            df.to_excel(os.path.join(self.output_path_adaptive_detector, f'{metrics[m]}.xlsx'))
-            df.index.name = 'Index'
-            df.to_csv(os.path.join(self.output_path_adaptive_detector, f'{metrics[m]}.csv'), header=['Value'])
-        plt.close()
-        plt.cla()
-        plt.clf()
+        plot_render_service.submit(spec)
 
     # generate all the process models based on the windowing strategy
     # selected by the user and start the metrics calculation between
@@ -266,23 +414,28 @@ class AnalyzeDrift:
                 (self.current_parameters.approach == Approach.ADAPTIVE.name and \
                  self.current_parameters.perspective == AdaptivePerspective.CONTROL_FLOW.name):
             self.window_count = 0
-            self.previous_sub_log = None
+            self.previous_summary = None
             self.previous_model = None
         elif self.current_parameters.approach == Approach.ADAPTIVE.name and \
                 self.current_parameters.perspective == AdaptivePerspective.TIME_DATA.name:
             self.window_count = {}
-            self.previous_sub_log = {}
+            self.previous_summary = {}
             self.previous_model = {}
 
         metrics_manager = None
         # get all activities from the event log
         activities = self.get_all_activities()
+        self.activities_support = activities
+        memory_accounting.checkpoint('get_all_activities')
 
         if self.event_data is not None:
             # call for the implementation of the different windowing strategies
             if self.current_parameters.approach == Approach.FIXED.name:
-                window_count, metrics_manager, initial_indexes = self.apply_tumbling_window(self.event_data)
-                # window_count, metrics_manager, initial_indexes = self.apply_sliding_window(event_data)
+                if getattr(self.current_parameters, 'window_type',
+                           FixedWindowType.TUMBLING.name) == FixedWindowType.SLIDING.name:
+                    window_count, metrics_manager, initial_indexes = self.apply_sliding_window(self.event_data)
+                else:
+                    window_count, metrics_manager, initial_indexes = self.apply_tumbling_window(self.event_data)
             elif self.current_parameters.approach == Approach.ADAPTIVE.name and \
                     self.current_parameters.perspective == AdaptivePerspective.TIME_DATA.name:  # IPDD adaptive on time or data attributes
                 # the user may select the activities that contain the attribute
@@ -333,6 +486,12 @@ class AnalyzeDrift:
             else:
                 print(f'Incorrect approach (start_drift_analysis): {self.current_parameters.approach}')
 
+            # retained objects after processing all the windows
+            memory_accounting.checkpoint('windowing', {'event_data': self.event_data,
+                                                       'attribute_values': self.attribute_values,
+                                                       'previous_summary': self.previous_summary,
+                                                       'previous_model': self.previous_model})
+
             # stores the instance of the metrics manager, responsible to manage the asynchronous
             # calculation of the metrics
             # no metrics manager instantiated when IPDD calculates one window
@@ -351,113 +510,136 @@ class AnalyzeDrift:
             print(f'Incorrect window type (start_drift_analysis): {self.window_type}.')
         return case_id
 
-    # Sliding window approach implemented for fixed window - NOT USED
+    # sliding windows for the fixed approach
+    # two adjacent windows of win_size traces move stride traces at each step and their DFGs are compared with the
+    # similarity metrics; each window is a VariantWindow maintained incrementally (the incoming traces are added and
+    # the outgoing ones removed), so a step costs O(stride) instead of mining two sub-logs
+    # the models of the windows are not saved, the drifts are reported at the first trace of the second window
     def apply_sliding_window(self, event_data):
         initial_indexes = {}
         # initialize similarity metrics manager
         self.metrics = ManageSimilarityMetrics(self.model_type, self.current_parameters, self.control,
                                                self.models_path, self.metrics_path)
-        # check if there is at least two windows
-        no_traces = len(event_data)
-        if no_traces > self.current_parameters.win_size / 2:
-            last_index = no_traces - self.current_parameters.win_size * 2 + 1
-            print(f'for até {last_index}')
-            for i in range(0, last_index):
-                start_index_w1 = i
-                start_index_w2 = i + self.current_parameters.win_size
-
-                item = event_data[start_index_w1]
-                case_id1 = self.get_case_id(item)
-                item2 = event_data[start_index_w1]
-                case_id2 = self.get_case_id(item2)
-                initial_indexes[self.window_count + 1] = case_id1
-                initial_indexes[self.window_count + 2] = case_id2
-
-                if i == last_index - 1:
-                    print(f'Analyzing final window... window_count {self.window_count}')
-                    # set the final window used by metrics manager to identify all the metrics have been calculated
-                    self.metrics.set_final_window(self.window_count + 2)
-
-                # process and compare the two windows
-                self.process_two_fixed_sliding_windows(event_data, start_index_w1, start_index_w2,
-                                                       self.current_parameters.win_size)
+        win_size = self.current_parameters.win_size
+        stride = self.current_parameters.stride
+        offsets = range(0, len(event_data) - 2 * win_size + 1, stride)
+        if len(offsets) == 0:
+            print(f'The event log has less than two windows of size {win_size}.')
+            return self.window_count, self.metrics, initial_indexes
+
+        with performance_metrics.measure(Stage.DISCOVERY):
+            variants = self.current_log.get_variants()
+            variant_relations = {}
+            window1 = VariantWindow(variants[:win_size], variant_relations)
+            window2 = VariantWindow(variants[win_size:2 * win_size], variant_relations)
+        # set the final window used by metrics manager to identify all the metrics have been calculated
+        self.metrics.set_final_window(len(offsets))
+        self.window_count = 1
+        initial_indexes[0] = self.get_case_id(event_data[0])
+        self.metrics.start_metrics_timeout()
+        self.control.start_metrics_calculation()
+        previous_begin = 0
+        for begin in offsets:
+            with performance_metrics.measure(Stage.DISCOVERY):
+                # move the windows to the current step
+                for i in range(previous_begin, begin):
+                    window1.remove_trace(variants[i])
+                    window1.add_trace(variants[i + win_size])
+                    window2.remove_trace(variants[i + win_size])
+                    window2.add_trace(variants[i + 2 * win_size])
+            previous_begin = begin
+            self.window_count += 1
+            self.current_trace = begin + 2 * win_size
+            performance_metrics.increment('windows')
+            begin2 = begin + win_size
+            with tracer.span('new_window', window=self.window_count, activity='', begin=begin2, sub_log_size=win_size):
+                with performance_metrics.measure(Stage.WINDOWING):
+                    summary1 = self.get_window_summary(window1, begin, begin2)
+                    summary2 = self.get_window_summary(window2, begin2, begin2 + win_size)
+                self.metrics.calculate_metrics(self.window_count, summary1.dfg, summary2.dfg, summary1, summary2,
+                                               self.current_parameters, begin2, summary2.initial_timestamp,
+                                               run_in_thread=False)
+                self.metrics.set_window_dissimilarity(self.window_count, summary1.get_dfg_distance(summary2))
+            initial_indexes[begin2] = self.get_case_id(event_data[begin2])
         return self.window_count, self.metrics, initial_indexes
 
     # windowing method for fixed window approach
+    # the windows are defined before mining any model (window plan), so when discovery_workers > 0 the models of
+    # all windows are mined in a pool of processes and each pair of adjacent windows is compared as soon as both
+    # models are ready
     def apply_tumbling_window(self, event_data):
         self.current_trace = 0
-        initial_index = 0
         initial_indexes = {}
-        initial_trace_index = None
 
         # initialize similarity metrics manager
         self.metrics = ManageSimilarityMetrics(self.model_type, self.current_parameters, self.control,
                                                self.models_path, self.metrics_path)
 
-        for i, item in enumerate(event_data):
-            self.current_trace = i + 1
-            # get the current case id
-            case_id = self.get_case_id(item)
-
-            # calculate the time_difference (options hours, days)
-            time_difference = 0
-            if self.current_parameters.win_unity == WindowUnityFixed.UNITY.name:
-                # nothing should be done, i is enough
-                pass
-            elif self.current_parameters.win_unity == WindowUnityFixed.HOUR.name:
-                current_timestamp = self.get_current_timestamp(item)
-
-                # initialize the initial timestamp of the first window
-                if i == 0:
-                    initial_timestamp = current_timestamp
-
-                time_difference = current_timestamp - initial_timestamp
-                # conversion to hours
-                time_difference = time_difference / 60 / 60
-            elif self.current_parameters.win_unity == WindowUnityFixed.DAY.name:
-                current_date = self.get_current_date(item)
-
-                # initialize the initial day of the first window
-                if i == 0:
-                    initial_day = date(current_date.year, current_date.month, current_date.day)
-
-                # window checkpoint
-                current_day = date(current_date.year, current_date.month, current_date.day)
-                time_difference = current_day - initial_day
-            else:
-                print(f'Windowing strategy not implemented [{self.window_type}-{self.window_unity}].')
-
-            # # initialize the initial case id of the first window
-            if i == 0:
-                initial_trace_index = case_id
-
-            # window checkpoint
-            if self.verify_window_ckeckpoint(i, event_data, time_difference):
+        with performance_metrics.measure(Stage.WINDOWING):
+            windows = self.get_tumbling_windows(event_data)
+        workers = getattr(self.current_parameters, 'discovery_workers', 0)
+        if workers > 0 and len(windows) > 1:
+            self.process_windows_in_pool(windows, workers, initial_indexes)
+        else:
+            for begin, end in windows:
+                self.current_trace = end
+                if end == len(event_data):
+                    print(f'Analyzing final window... size {end - begin} window_count {self.window_count}')
+                    # set the final window used by metrics manager to identify all the metrics have been calculated
+                    self.metrics.set_final_window(self.window_count)
                 # process new window
-                self.new_window(initial_index, i)
+                self.new_window(begin, end)
                 # save information about the initial of the processed window
-                initial_indexes[initial_index] = initial_trace_index
+                initial_indexes[begin] = self.get_case_id(event_data[begin])
+        return self.window_count, self.metrics, initial_indexes
 
-                # update the beginning of the next window
-                initial_index = i
-                initial_trace_index = case_id
-                # store the initial timestamp or day of the next window
-                if self.current_parameters.win_unity == WindowUnityFixed.HOUR.name:
-                    initial_timestamp = current_timestamp
-                elif self.current_parameters.win_unity == WindowUnityFixed.DAY.name:
-                    initial_day = current_day
-        # process remaining items as last window
-        if initial_index < len(event_data):
-            size = len(event_data) - initial_index
-            print(f'Analyzing final window... size {size} window_count {self.window_count}')
-            # set the final window used by metrics manager to identify all the metrics have been calculated
-            self.metrics.set_final_window(self.window_count)
-            # process final window
-            self.new_window(initial_index, len(event_data))
+    # boundaries (begin, end) of the windows, based on the unity and size of the window
+    def get_tumbling_windows(self, event_data):
+        timestamps = None
+        days = None
+        if self.current_parameters.win_unity == WindowUnityFixed.HOUR.name:
+            timestamps = [self.get_current_timestamp(item) for item in event_data]
+        elif self.current_parameters.win_unity == WindowUnityFixed.DAY.name:
+            days = []
+            for item in event_data:
+                current_date = self.get_current_date(item)
+                days.append(date(current_date.year, current_date.month, current_date.day).toordinal())
+        return get_tumbling_windows(len(event_data), self.current_parameters.win_unity,
+                                    self.current_parameters.win_size, timestamps, days)
+
+    # mine the models of the windows in the discovery pool and calculate the similarity metrics between adjacent
+    # windows following the order of the windows
+    def process_windows_in_pool(self, windows, workers, initial_indexes):
+        discovery_pool.set_workers(workers)
+        submitted = []
+        for begin, end in windows:
+            performance_metrics.increment('windows')
+            print(f'Generating model for sub-log [{begin} - {end - 1}] - window [{self.window_count}]')
+            self.window_count += 1
+            sub_log, initial_timestamp = self.get_window_sub_log(begin, end)
+            if sub_log is None:
+                return
+            self.save_window_sub_log(sub_log, begin, end)
+            variants = self.get_window_variants(sub_log, begin)
+            summary = self.get_window_summary(variants, begin, end, sub_log)
+            future = discovery_pool.submit(self.discovery, self.get_log_for_discovery(sub_log, variants),
+                                           self.models_path, self.current_parameters.logname, self.window_count,
+                                           self.current_parameters.save_model_svg)
+            # only the summary is kept until the metrics are calculated
+            submitted.append((begin, end, summary, initial_timestamp, future))
+
+        for window, (begin, end, summary, initial_timestamp, future) in enumerate(submitted, start=1):
+            self.current_trace = end
+            self.window_count = window
+            if window == len(submitted):
+                print(f'Analyzing final window... size {end - begin} window_count {window - 1}')
+                # set the final window used by metrics manager to identify all the metrics have been calculated
+                self.metrics.set_final_window(window - 1)
+            with tracer.span('new_window', window=window, activity='', begin=begin, sub_log_size=end - begin):
+                model, seconds = discovery_pool.get_result(future)
+                self.calculate_metrics_between_adjacent_time_slots(model, summary, begin, initial_timestamp, '')
             # save information about the initial of the processed window
-            initial_indexes[initial_index] = initial_trace_index
-
-        return self.window_count, self.metrics, initial_indexes
+            initial_indexes[begin] = self.get_case_id(self.event_data[begin])
 
     def verify_window_ckeckpoint(self, i, event_data, time_difference=0):
         if self.current_parameters.win_unity == WindowUnityFixed.UNITY.name:
@@ -477,270 +659,258 @@ class AnalyzeDrift:
         return False
 
     def get_all_activities(self):
-        # get the activities
-        activities = attributes_filter.get_attribute_values(self.current_log.log, "concept:name")
-        return activities
+        # get the activities and the number of events of each one
+        return self.current_log.get_activity_index().get_activities()
+
+    # update the detector of each activity with its values (in the order they were read)
+    # return the drifts as (position in the values, index of the value for the activity), ordered by position
+    @staticmethod
+    def detect_changes(detector_class, states, update_positions, update_activities, update_values):
+        streams = {a: s for s, a in enumerate(states)}
+        stream_ids = np.fromiter((streams[a] for a in update_activities), dtype=np.int64,
+                                 count=len(update_activities))
+        # index of each value inside its activity
+        order = np.argsort(stream_ids, kind='stable')
+        counts = np.bincount(stream_ids, minlength=len(streams))
+        steps = np.empty(len(stream_ids), dtype=np.int64)
+        steps[order] = np.arange(len(stream_ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        drifts = []
+        if detector_class.exact_bank:
+            # row k of the bank has the k-th value of each activity
+            bank = SelectDetector.get_detector_bank(detector_class.get_definition(), len(streams),
+                                                    detector_class.parameters)
+            positions = np.empty((int(counts.max(initial=0)), len(streams)), dtype=np.int64)
+            positions[steps, stream_ids] = np.arange(len(stream_ids))
+            values = np.full(positions.shape, np.nan)
+            values[steps, stream_ids] = np.asarray(update_values, dtype=float)
+            drifts = [(int(positions[k, s]), k) for s, k in bank.update_batch(values)]
+            drifts.sort()
+        else:
+            for u, activity in enumerate(update_activities):
+                state = states[activity]
+                with tracer.span('detector_update', activity=activity, index=update_positions[u]):
+                    state.detector.update_val(update_values[u])
+                if state.detector.detected_change():
+                    drifts.append((u, int(steps[u])))
+        return drifts
 
     # IPDD adaptive approach for time or numeric data attributes
+    # The state of each activity (detector, attribute values, change points) is created on the first event of the
+    # activity. Activities with less events than the parameter min_activity_support are only counted (activities
+    # dict), they do not receive a detector and no plot or file is generated for them
     def apply_detector_on_attribute(self, event_data, attribute_class, detector_class, activities, user):
         self.current_trace = 0
         print(f'Applying {detector_class.get_name()} to log {self.current_log.filename} attribute {attribute_class.name}')
         for key in detector_class.parameters.keys():
             print(f'{key}: {detector_class.parameters[key]}')
-        detector_dict = {}
-        attribute_values = {}
-        change_points = {}
-        change_points_time_based = {}
-        change_points_info = {}
-        initial_index = {}
+        states = {}
+        self.attribute_values = {}
         initial_case_ids = {}
         initial_event_indexes = {}
-        event_indexes = {}
         self.metrics = {}
-        # initialize one detector for each activity
-        for a in activities:
-            detector_dict[a] = SelectDetector.get_detector_instance(detector_class.get_definition(),
-                                                                    detector_class.parameters)
-            detector_dict[a].instantiate_detector()
-            attribute_values[a] = {}
-            change_points[a] = []
-            change_points_time_based[a] = []
-            event_indexes[a] = 0
-            detector_info = ChangePointInfo(detector_class.get_name(), a)
-            for key in detector_class.parameters:
-                detector_info.add_detector_attribute(key, detector_class.parameters[key])
-            change_points_info[a] = detector_info
-            initial_case_ids[a] = {}
-            initial_index[a] = 0
-            self.window_count[a] = 0
-            self.previous_model[a] = None
-            self.previous_sub_log[a] = None
+        retention = self.current_parameters.attribute_retention
+        max_values = self.current_parameters.attribute_max_values
+        # activities with support below the minimum are tracked, but not analyzed
+        min_support = self.current_parameters.min_activity_support
+        ignored_activities = set()
+        if min_support > 1:
+            ignored_activities = set(a for a in activities if self.activities_support.get(a, 0) < min_support)
+            if ignored_activities:
+                print(f'{len(ignored_activities)} activities with less than {min_support} events are not analyzed')
+
+        def get_state(activity):
+            state = states.get(activity)
+            if state is None:
+                state = ActivityState(activity, detector_class, retention, max_values)
+                states[activity] = state
+                self.attribute_values[activity] = state.values
+                self.window_count[activity] = 0
+                self.previous_model[activity] = None
+                self.previous_summary[activity] = None
+            return state
 
         self.current_parameters.total_of_activities = len(activities)
 
+        # only the events of the analyzed activities are read, using the activity index of the log
+        index = self.current_log.get_activity_index()
+        traces, events = index.get_positions([a for a in activities if a not in ignored_activities])
+        # the values are read first and the detectors updated after, so the detectors with an exact bank
+        # update all the activities in vectorized steps; then the drifts are processed in the order of the events
+        update_positions = []  # index of the trace (or event) of each value
+        update_activities = []
+        update_values = []
+        update_case_ids = []
         # when reading the log trace by trace we need to iterate over the events
         if self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
-            for i, item in enumerate(event_data):
-                self.current_trace = i + 1
-                # get the current case id
-                case_id = self.get_case_id(item)
-                timestamp = self.get_current_timestamp(item)
-                # save the first case id as the beginning of the first window
-                if i == 0:
-                    for a in activities:
-                        initial_case_ids[a][i] = case_id
-                        initial_index[a] = 0
-
-                for event in item:
-                    activity = event['concept:name']
-                    if activity in activities:
-                        try:
-                            value = attribute_class.get_value(event)
-                        except AttributeError as err:
-                            print(f'Error getting the value of attribute: {err}')
-                            return
-                        except KeyError as kerr:
-                            print(f'Error getting the value of attribute: {kerr}')
-                            return
-                        attribute_values[activity][i] = {
-                            'value': value,
-                            'timestamp': timestamp,
-                            'case_id': case_id,
-                        }
-                        detector_dict[activity].update_val(value)
-                        if detector_dict[activity].detected_change():
-                            # create the manager for similarity metrics if a change is detected
-                            if activity not in self.metrics.keys():
-                                self.metrics[activity] = ManageSimilarityMetrics(self.model_type,
-                                                                                 self.current_parameters,
-                                                                                 self.control,
-                                                                                 self.models_path, self.metrics_path,
-                                                                                 activity)
-
-                            change_points[activity].append(i)
-                            change_points_info[activity].add_change_point(i)
-                            change_points_info[activity].add_case_id(case_id)
-                            change_points_info[activity].add_timestamp(self.get_current_date(event_data[i]))
-                            print(
-                                f'Change detected in data: {value} - at index: {i} - case: {case_id} - activity: {activity}')
-
-                            # process new window
-                            self.new_window(initial_index[activity], i, activity)
-                            # save the initial of the processed window
-                            initial_case_ids[activity][i] = case_id
-                            # update the beginning of the next window
-                            initial_index[activity] = i
-            # process remaining items as the last window
-            find_any_drift = False
-            for j, a in enumerate(activities):
-                if len(change_points[a]) > 0:
-                    find_any_drift = True
-                    if initial_index[a] < len(event_data):
-                        size = len(event_data) - initial_index[a]
-                        print(
-                            f'Analyzing final window... size {size} window_count {self.window_count[a]} activity {a}')
-                        # set the final window used by metrics manager to identify all the metrics have been calculated
-                        self.metrics[a].set_final_window(self.window_count[a])
-                        # process final window for all activities where a drift has been detected
-                        self.new_window(initial_index[a], len(event_data), a)
-                    if self.current_parameters.activities_for_plot:
-                        self.plot_signal_adaptive_time_data(attribute_values[a],
-                                                            self.current_parameters.activities_for_plot[j],
-                                                            change_points[a],
-                                                            parameters=self.current_parameters)
-                    else:
-                        self.plot_signal_adaptive_time_data(attribute_values[a], a, change_points[a],
-                                                            parameters=self.current_parameters)
-                else:
-                    if self.current_parameters.activities_for_plot:
-                        self.plot_signal_adaptive_time_data(attribute_values[a],
-                                                            self.current_parameters.activities_for_plot[j],
-                                                            parameters=self.current_parameters)
-                    else:
-                        self.plot_signal_adaptive_time_data(attribute_values[a], a,
-                                                            parameters=self.current_parameters)
-            if find_any_drift:
-                # save the change points for the activity
-                filename = os.path.join(self.output_path_adaptive_detector,
-                                        f'drifts_{self.current_parameters.attribute}.txt')
-                self.save_change_points(filename, change_points, change_points_info, activities)
-            else:
-                # if no drift is detected, generate the complete model and the plot with attribute values for each activity
-                print(f'Analyzing unique window because no drift is detected...')
-                # save the plot with attribute values for each activity
-                for j, a in enumerate(activities):
-                    if self.current_parameters.activities_for_plot:
-                        self.plot_signal_adaptive_time_data(attribute_values[a],
-                                                            self.current_parameters.activities_for_plot[j],
-                                                            parameters=self.current_parameters)
-                    else:
-                        self.plot_signal_adaptive_time_data(attribute_values[a], a,
-                                                            parameters=self.current_parameters)
-                # process the unique window
-                initial_index[Activity.ALL.value] = 0
-                initial_case_ids[Activity.ALL.value] = {}
-                initial_case_ids[Activity.ALL.value][0] = case_id
-                self.window_count[Activity.ALL.value] = 0
-                self.new_window(initial_index[Activity.ALL.value], len(event_data), Activity.ALL.value)
-            return self.window_count, self.metrics, initial_case_ids, None
+            # save the first case id as the beginning of the first window
+            case_id = self.get_case_id(event_data[0])
+            for a in activities:
+                initial_case_ids[a] = {0: case_id}
+            current_item = None
+            timestamp = None
+            for i, e in zip(traces.tolist(), events.tolist()):
+                item = event_data[i]
+                if item is not current_item:
+                    current_item = item
+                    self.current_trace = i + 1
+                    # get the current case id
+                    case_id = self.get_case_id(item)
+                    timestamp = self.get_current_timestamp(item)
+
+                event = item[e]
+                activity = event['concept:name']
+                try:
+                    value = attribute_class.get_value(event)
+                except AttributeError as err:
+                    print(f'Error getting the value of attribute: {err}')
+                    return
+                except KeyError as kerr:
+                    print(f'Error getting the value of attribute: {kerr}')
+                    return
+                state = get_state(activity)
+                state.values.append(i, value, timestamp, case_id)
+                update_positions.append(i)
+                update_activities.append(activity)
+                update_values.append(value)
+                update_case_ids.append(case_id)
+            self.current_trace = len(event_data)
         else:
+            # save the first case id as the beginning of the first window
+            case_id = event_data['case:concept:name'][0]
+            for a in activities:
+                initial_case_ids[a] = {0: case_id}
+                initial_event_indexes[a] = [0]
             # read the events from the dataframe
-            for i in event_data.index:
+            for i in traces.tolist():
                 # get the current case id and event id
                 case_id = event_data['case:concept:name'][i]
 
-                # save the first case id as the beginning of the first window
-                if i == 0:
-                    for a in activities:
-                        initial_case_ids[a][i] = case_id
-                        initial_index[a] = 0
-                        initial_event_indexes[a] = [0]
-
                 # for each new event, collect the duration per activity
                 activity = event_data['concept:name'][i]
-                if activity in activities:
-                    timestamp = event_data['time:timestamp'][i]
-                    value = attribute_class.get_value_df(event_data, i)
-                    attribute_values[activity][i] = {
-                        'value': value,
-                        'timestamp': timestamp,
-                        'case_id': case_id,
-                    }
-
-                    detector_dict[activity].update_val(value)
-                    if detector_dict[activity].detected_change():
-                        # create the manager for similarity metrics if a change is detected
-                        if activity not in self.metrics.keys():
-                            self.metrics[activity] = ManageSimilarityMetrics(self.model_type, self.current_parameters,
-                                                                             self.control,
-                                                                             self.models_path, self.metrics_path,
-                                                                             activity)
-
-                        # save the index of the event where the change is detected
-                        event_id_for_activity = event_indexes[activity]  # count the events for the specified activity
-                        change_points[activity].append(event_id_for_activity)
-                        # save the timestamp of the event where the change is detected
-                        change_points_time_based[activity].append(self.get_current_date_df(event_data, i))
-
-                        change_points_info[activity].add_change_point(event_id_for_activity)
-                        change_points_info[activity].add_case_id(case_id)
-                        change_points_info[activity].add_timestamp(self.get_current_date_df(event_data, i))
-                        print(
-                            f'Change detected in data: {value} - at index: {i} - '
-                            f'case: {case_id} - activity: {activity} - event if for activity {event_id_for_activity}')
-
-                        # process new window
-                        self.new_window(initial_index[activity], i, activity)
-                        # save the initial of the processed window
-                        initial_case_ids[activity][i] = case_id
-                        # update the beginning of the next window
-                        initial_index[activity] = i
-                        # save the initial index id
-                        initial_event_indexes[activity].append(event_id_for_activity)
-                    # index of the event
-                    event_indexes[activity] += 1
-            # process remaining items as the last window
-            find_any_drift = False
-            for j, a in enumerate(activities):
-                if len(change_points[a]) > 0:
-                    find_any_drift = True
-                    if initial_index[a] < len(event_data):
-                        size = len(event_data) - initial_index[a]
-                        print(
-                            f'Analyzing final window... size {size} window_count {self.window_count[a]} activity {a}')
-                        # set the final window used by metrics manager to identify all the metrics have been calculated
-                        self.metrics[a].set_final_window(self.window_count[a])
-                        # process final window for all activities where a drift has been detected
-                        self.new_window(initial_index[a], len(event_data), a)
-                    if self.current_parameters.activities_for_plot:
-                        self.plot_signal_adaptive_time_data(attribute_values[a],
-                                                            self.current_parameters.activities_for_plot[j],
-                                                            change_points[a],
-                                                            change_points_time_based[a],
-                                                            parameters=self.current_parameters)
-                    else:
-                        self.plot_signal_adaptive_time_data(attribute_values[a], a, change_points[a],
-                                                            change_points_time_based[a],
-                                                            parameters=self.current_parameters)
-                else:
-                    if self.current_parameters.activities_for_plot:
-                        self.plot_signal_adaptive_time_data(attribute_values[a],
-                                                            self.current_parameters.activities_for_plot[j],
-                                                            parameters=self.current_parameters)
-                    else:
-                        self.plot_signal_adaptive_time_data(attribute_values[a], a,
-                                                            parameters=self.current_parameters)
-            if find_any_drift:
-                # save the change points for the activity
-                filename = os.path.join(self.output_path_adaptive_detector, f'drifts_{attribute_class.name}.txt')
-                self.save_change_points(filename, change_points, change_points_info, activities)
+                timestamp = event_data['time:timestamp'][i]
+                value = attribute_class.get_value_df(event_data, i)
+                state = get_state(activity)
+                state.values.append(i, value, timestamp, case_id)
+                update_positions.append(i)
+                update_activities.append(activity)
+                update_values.append(value)
+                update_case_ids.append(case_id)
+
+        for u, event_id_for_activity in self.detect_changes(detector_class, states, update_positions,
+                                                            update_activities, update_values):
+            i = update_positions[u]
+            activity = update_activities[u]
+            value = update_values[u]
+            case_id = update_case_ids[u]
+            state = states[activity]
+            # create the manager for similarity metrics if a change is detected
+            if activity not in self.metrics.keys():
+                self.metrics[activity] = ManageSimilarityMetrics(self.model_type,
+                                                                 self.current_parameters,
+                                                                 self.control,
+                                                                 self.models_path, self.metrics_path,
+                                                                 activity)
+            if self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
+                state.change_points.append(i)
+                state.change_points_info.add_change_point(i)
+                state.change_points_info.add_case_id(case_id)
+                state.change_points_info.add_timestamp(self.get_current_date(event_data[i]))
+                print(
+                    f'Change detected in data: {value} - at index: {i} - case: {case_id} - activity: {activity}')
             else:
-                # if no drift is detected, generate the complete model and the plot with attribute values for each activity
-                print(f'Analyzing unique window because no drift is detected...')
-                # save the plot with attribute values for each activity
-                for j, a in enumerate(activities):
-                    if self.current_parameters.activities_for_plot:
-                        self.plot_signal_adaptive_time_data(attribute_values[a],
-                                                            self.current_parameters.activitie_for_plot[j],
-                                                            parameters=self.current_parameters)
-                    else:
-                        self.plot_signal_adaptive_time_data(attribute_values[a], a,
-                                                            parameters=self.current_parameters)
-                # process the unique window
-                initial_index[Activity.ALL.value] = 0
-                initial_case_ids[Activity.ALL.value] = {}
-                initial_case_ids[Activity.ALL.value][0] = case_id
+                # save the index of the event where the change is detected
+                # (event_id_for_activity counts the events for the specified activity)
+                state.change_points.append(event_id_for_activity)
+                # save the timestamp of the event where the change is detected
+                state.change_points_time_based.append(self.get_current_date_df(event_data, i))
+
+                state.change_points_info.add_change_point(event_id_for_activity)
+                state.change_points_info.add_case_id(case_id)
+                state.change_points_info.add_timestamp(self.get_current_date_df(event_data, i))
+                print(
+                    f'Change detected in data: {value} - at index: {i} - '
+                    f'case: {case_id} - activity: {activity} - event if for activity {event_id_for_activity}')
+                # save the initial index id
+                initial_event_indexes[activity].append(event_id_for_activity)
+
+            # process new window
+            self.new_window(state.initial_index, i, activity)
+            # save the initial of the processed window
+            initial_case_ids[activity][i] = case_id
+            # update the beginning of the next window
+            state.initial_index = i
+
+        # case id of the last trace (or event), used by the unique window
+        if self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
+            case_id = self.get_case_id(event_data[len(event_data) - 1])
+        else:
+            case_id = event_data['case:concept:name'][len(event_data) - 1]
+
+        # process remaining items as the last window
+        find_any_drift = False
+        for j, a in enumerate(activities):
+            state = states.get(a)
+            if state is None:  # activity ignored or without events
+                continue
+            if len(state.change_points) > 0:
+                find_any_drift = True
+                if state.initial_index < len(event_data):
+                    size = len(event_data) - state.initial_index
+                    print(
+                        f'Analyzing final window... size {size} window_count {self.window_count[a]} activity {a}')
+                    # set the final window used by metrics manager to identify all the metrics have been calculated
+                    self.metrics[a].set_final_window(self.window_count[a])
+                    # process final window for all activities where a drift has been detected
+                    self.new_window(state.initial_index, len(event_data), a)
+            # save the plot with attribute values for each activity
+            activity_name = a
+            if self.current_parameters.activities_for_plot:
+                activity_name = self.current_parameters.activities_for_plot[j]
+            if self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
+                self.plot_signal_adaptive_time_data(state.values, activity_name, state.change_points,
+                                                    parameters=self.current_parameters)
+            else:
+                self.plot_signal_adaptive_time_data(state.values, activity_name, state.change_points,
+                                                    state.change_points_time_based,
+                                                    parameters=self.current_parameters)
+        if find_any_drift:
+            # save the change points for the activity
+            if self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
+                filename = os.path.join(self.output_path_adaptive_detector,
+                                        f'drifts_{self.current_parameters.attribute}.txt')
+            else:
+                filename = os.path.join(self.output_path_adaptive_detector, f'drifts_{attribute_class.name}.txt')
+            self.save_change_points(filename,
+                                    {a: s.change_points for a, s in states.items()},
+                                    {a: s.change_points_info for a, s in states.items()},
+                                    [a for a in activities if a in states])
+        else:
+            # if no drift is detected, generate the complete model
+            print(f'Analyzing unique window because no drift is detected...')
+            # process the unique window
+            initial_case_ids[Activity.ALL.value] = {}
+            initial_case_ids[Activity.ALL.value][0] = case_id
+            if self.current_parameters.read_log_as == ReadLogAs.EVENT.name:
                 initial_event_indexes[Activity.ALL.value] = [0]
-                self.window_count[Activity.ALL.value] = 0
-                self.new_window(initial_index[Activity.ALL.value], len(event_data), Activity.ALL.value)
-            return self.window_count, self.metrics, initial_case_ids, initial_event_indexes
+            self.window_count[Activity.ALL.value] = 0
+            self.new_window(0, len(event_data), Activity.ALL.value)
+        self.clear_attribute_values()
+        if self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
+            return self.window_count, self.metrics, initial_case_ids, None
+        return self.window_count, self.metrics, initial_case_ids, initial_event_indexes
+
+    # remove the values spilled to disk, after generating the plots and files
+    def clear_attribute_values(self):
+        for series in self.attribute_values.values():
+            series.clear()
 
     # IPDD adaptive trace by trace approach
     # Apply the ADWIN detector (scikit-multiflow) in two quality dimensions: fitness and precision
     # The metrics for each dimension are defined by parameter metrics (dictionary)
     # The metrics are calculated using the last trace read and the model generated using the first traces (stable_period)
     # When a drift is detected a new model may be discovered using the next traces (stable_period)
-    # The process model is discovered using the inductive miner
+    # The process model is discovered using the discovery backend (default inductive miner)
     def apply_detector_on_quality_metrics_trace_by_trace(self, event_data, detector_class, window_size, user):
         self.current_trace = 0
         print(f'Trace by trace approach - {detector_class.get_name()} to log {self.current_log.filename}')
@@ -748,23 +918,21 @@ class AnalyzeDrift:
             print(f'{key}: {detector_class.parameters[key]}')
         # different metrics can be used for each dimension evaluated
         # by now we expected one metric for fitness quality dimension and other for precision quality dimension
-        metrics = {
-            QualityDimension.FITNESS.name: 'fitnessTBR',
-            QualityDimension.PRECISION.name: 'precisionETC',
-        }
+        metrics = get_quality_metrics(ControlflowAdaptiveApproach.TRACE.name, {
+            QualityDimension.FITNESS.name: QualityMetric.FITNESS_TBR.value,
+            QualityDimension.PRECISION.name: QualityMetric.PRECISION_ETC.value,
+        }, getattr(self.current_parameters, 'quality_metrics', None))
         # derive the initial model using the parameter stable_period
         print(f'Initial model discovered using traces from 0 to {window_size - 1}')
-        log_for_model = EventLog(event_data[0:window_size])
-        net, im, fm = pm4py.discover_petri_net_inductive(log_for_model, activity_key='concept:name',
-                                                         case_id_key='case:concept:name',
-                                                         timestamp_key='time:timestamp')
+        discovery_backend = self.get_discovery_backend()
+        variants = self.current_log.get_variants()
+        window_for_model = VariantWindow(variants[0:window_size])
+        net, im, fm = discover_petri_net(window_for_model, discovery_backend)
         pnml_filename = os.path.join(self.output_path_adaptive_models_detector,
                                      f'model1_0-{window_size - 1}.pnml')
-        pnml_exporter.apply(net, im, pnml_filename, final_marking=fm)
-        # other discovery algorithms can be applied
-        # net, im, fm = heuristics_miner.apply(log_for_model)
-        # net, im, fm = inductive_miner.apply(log_for_model, variant=inductive_miner.Variants.IMf)
-        # net, im, fm = inductive_miner.apply(log_for_model, variant=inductive_miner.Variants.IMd)
+        export_petri_net(net, im, fm, pnml_filename, window_for_model, discovery_backend)
+        # metrics of each variant for the current model
+        variant_metrics = VariantMetrics()
         detector_dict = {}
         drifts = {}
         values = {}
@@ -793,75 +961,123 @@ class AnalyzeDrift:
         initial_trace_id = 0
         final_trace_id = initial_trace_id + window_size
         total_of_traces = len(event_data)
-        for i in range(0, total_of_traces):
-            self.current_trace = i + 1
-            print(f'Reading trace [{i}]...')
-            last_trace = EventLog(event_data[i:(i + 1)])
-            # check if one of the metrics report a drift
-            drift_detected = False
-            for dimension in metrics.keys():
-                # calculate the metric for each dimension
-                # for each dimension decide if the metric should be calculated using only the last trace read or all
-                # the traces read since the last drift
-                new_value = calculate_quality_metric(metrics[dimension], last_trace, net, im, fm) * detector_class.factor
-                values[dimension].append(new_value)
-                # update the new value in the detector
-                detector_dict[dimension].update_val(new_value)
-                if detector_dict[dimension].detected_change():
-                    # drift detected, save it
-                    drifts[dimension].append(i)
-                    print(f'Metric [{dimension}] - Drift detected at trace {i}')
-                    drift_detected = True
-
-            # if at least one metric report a drift a new model is discovered
-            if drift_detected:
-                # save the sublog
-                if self.current_parameters.save_sublogs:
-                    if self.current_parameters.read_log_as == ReadLogAs.EVENT.name:
-                        # generate the sub-log
-                        window = event_data[initial_trace_id:i]
-                        sub_log = log_converter.apply(window, variant=log_converter.Variants.TO_EVENT_LOG)
-                    elif self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
-                        sub_log = EventLog(self.event_data[initial_trace_id:i])
-                    else:
-                        print(f'Incorrect window type: {self.current_parameters.read_log_as}.')
-                        return
-                    self.save_sublog(sub_log, initial_trace_id, i)
-                # save information about change point for saving the file
-                change_points.append(i)
-                change_points_info.add_change_point(i)
-                change_points_info.add_timestamp(self.get_current_date(event_data[i]))
-                # process new window
-                self.new_window(initial_trace_id, final_trace_id)
-                # get the  case id
-                case_id = self.get_case_id(event_data[initial_trace_id])
-                # save the initial of the processed window
-                self.initial_case_ids[initial_trace_id] = case_id
-                # update the beginning of the next window
-                initial_trace_id = i
-
-                for dimension in metrics.keys():
-                    # reset the detectors to avoid a new drift during the stable period
-                    detector_dict[dimension].reset()
-
-                # discover a new model using the next traces (window_size)
-                final_trace_id = i + window_size
-                if final_trace_id > total_of_traces:
-                    final_trace_id = total_of_traces
 
-                if self.current_parameters.update_model:
-                    print(f'Discover a new model using traces from {i} to {final_trace_id - 1}')
-                    log_for_model = EventLog(event_data[i:final_trace_id])
-                    net, im, fm = pm4py.discover_petri_net_inductive(log_for_model, activity_key='concept:name',
-                                                                     case_id_key='case:concept:name',
-                                                                     timestamp_key='time:timestamp')
-                    pnml_filename = os.path.join(self.output_path_adaptive_models_detector,
-                                                 f'model{self.window_count + 1}_{i}-{final_trace_id - 1}.pnml')
-                    pnml_exporter.apply(net, im, pnml_filename, final_marking=fm)
-                    # other discovery algorithms can be applied
-                    # net, im, fm = heuristics_miner.apply(log_for_model)
-                    # net, im, fm = inductive_miner.apply(log_for_model, variant=inductive_miner.Variants.IMf)
-                    # net, im, fm = inductive_miner.apply(log_for_model, variant=inductive_miner.Variants.IMd)
+        # without updating the model the metrics do not depend on the detector, so the series calculated
+        # by a previous run (signal cache) are replayed through the detector
+        signal_key = None
+        cached_signals = None
+        calculated_signals = {dimension: [] for dimension in metrics.keys()}
+        if not self.current_parameters.update_model:
+            signal_key = signal_cache.get_key(self.current_log.complete_filename, metrics, window_size,
+                                              total_of_traces, discovery_backend.lower())
+            cached_signals = signal_cache.load(signal_key)
+            if cached_signals:
+                print(f'Replaying the quality metrics from the signal cache')
+        # speculative discovery: a candidate model is discovered by the discovery pool when a detector reports a
+        # warning, it is adopted only if it uses the same traces as the model discovered after the drift
+        # the traces read while the new model is not ready are evaluated when the model arrives (pending traces)
+        speculative_discovery = None
+        if self.current_parameters.update_model and getattr(self.current_parameters, 'speculative_discovery', False):
+            speculative_discovery = SpeculativeDiscovery(variants, discovery_backend)
+        pending_model = None
+        pending_traces = deque()
+        for trace_read in range(0, total_of_traces):
+            self.current_trace = trace_read + 1
+            if cached_signals is None:
+                print(f'Reading trace [{trace_read}]...')
+            pending_traces.append(trace_read)
+            while pending_traces:
+                if pending_model:
+                    if not pending_model.done() and trace_read < total_of_traces - 1:
+                        break
+                    # the model is ready (or it is the last trace), evaluate the pending traces
+                    window_for_model, net, im, fm = self.get_candidate_model(pending_model, discovery_backend)
+                    pending_model = None
+                i = pending_traces.popleft()
+                # check if one of the metrics report a drift
+                drift_detected = False
+                with tracer.span('detector_update', index=i, window=self.window_count, sub_log_size=1):
+                    for dimension in metrics.keys():
+                        # calculate the metric for each dimension
+                        # for each dimension decide if the metric should be calculated using only the last trace read
+                        # or all the traces read since the last drift
+                        if cached_signals is None:
+                            metric_value = variant_metrics.get_value(metrics[dimension], variants[i], event_data[i],
+                                                                     net, im, fm, window_for_model)
+                            calculated_signals[dimension].append(metric_value)
+                        else:
+                            metric_value = cached_signals[dimension][i]
+                        new_value = metric_value * detector_class.factor
+                        values[dimension].append(new_value)
+                        # update the new value in the detector
+                        detector_dict[dimension].update_val(new_value)
+                        if detector_dict[dimension].detected_change():
+                            # drift detected, save it
+                            drifts[dimension].append(i)
+                            print(f'Metric [{dimension}] - Drift detected at trace {i}')
+                            drift_detected = True
+
+                # if at least one metric report a drift a new model is discovered
+                if drift_detected:
+                    # save the sublog
+                    if self.current_parameters.save_sublogs:
+                        if self.current_parameters.read_log_as == ReadLogAs.EVENT.name:
+                            # generate the sub-log
+                            window = event_data[initial_trace_id:i]
+                            sub_log = log_converter.apply(window, variant=log_converter.Variants.TO_EVENT_LOG)
+                        elif self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
+                            sub_log = EventLog(self.event_data[initial_trace_id:i])
+                        else:
+                            print(f'Incorrect window type: {self.current_parameters.read_log_as}.')
+                            return
+                        self.save_sublog(sub_log, initial_trace_id, i)
+                    # save information about change point for saving the file
+                    change_points.append(i)
+                    change_points_info.add_change_point(i)
+                    change_points_info.add_timestamp(self.get_current_date(event_data[i]))
+                    # process new window
+                    self.new_window(initial_trace_id, final_trace_id)
+                    # get the  case id
+                    case_id = self.get_case_id(event_data[initial_trace_id])
+                    # save the initial of the processed window
+                    self.initial_case_ids[initial_trace_id] = case_id
+                    # update the beginning of the next window
+                    initial_trace_id = i
+
+                    for dimension in metrics.keys():
+                        # reset the detectors to avoid a new drift during the stable period
+                        detector_dict[dimension].reset()
+
+                    # discover a new model using the next traces (window_size)
+                    final_trace_id = i + window_size
+                    if final_trace_id > total_of_traces:
+                        final_trace_id = total_of_traces
+
+                    if self.current_parameters.update_model and speculative_discovery:
+                        # adopt the candidate discovered since the warning or wait for it reading the next traces
+                        pending_model = speculative_discovery.take(i, final_trace_id)
+                        print(f'Discover a new model using traces from {pending_model.begin} to '
+                              f'{pending_model.end - 1} (speculative discovery)')
+                        if pending_model.done():
+                            window_for_model, net, im, fm = self.get_candidate_model(pending_model, discovery_backend)
+                            pending_model = None
+                    elif self.current_parameters.update_model:
+                        print(f'Discover a new model using traces from {i} to {final_trace_id - 1}')
+                        window_for_model = VariantWindow(variants[i:final_trace_id])
+                        net, im, fm = discover_petri_net(window_for_model, discovery_backend)
+                        pnml_filename = os.path.join(self.output_path_adaptive_models_detector,
+                                                     f'model{self.window_count + 1}_{i}-{final_trace_id - 1}.pnml')
+                        export_petri_net(net, im, fm, pnml_filename, window_for_model, discovery_backend)
+                elif speculative_discovery:
+                    # start discovering the candidate model when a detector enters the warning zone
+                    if any(detector_dict[dimension].warning_detected() for dimension in metrics.keys()):
+                        speculative_discovery.start(i, min(i + window_size, total_of_traces))
+                    else:
+                        speculative_discovery.discard()
+        if speculative_discovery:
+            speculative_discovery.shutdown()
+        if signal_key and cached_signals is None:
+            signal_cache.save(signal_key, calculated_signals)
         # process remaining items as the last window
         if 0 < initial_trace_id < total_of_traces:
             final_trace_id = initial_trace_id + window_size
@@ -920,24 +1136,28 @@ class AnalyzeDrift:
         for key in detector_class.parameters:
             print(f'{key}: {detector_class.parameters[key]}')
 
-        metrics = {
-            QualityDimension.FITNESS.name: 'fitnessTBR',
-            QualityDimension.PRECISION.name: 'precisionFP'
-        }
+        metrics = get_quality_metrics(ControlflowAdaptiveApproach.WINDOW.name, {
+            QualityDimension.FITNESS.name: QualityMetric.FITNESS_TBR.value,
+            QualityDimension.PRECISION.name: QualityMetric.PRECISION_FP.value
+        }, getattr(self.current_parameters, 'quality_metrics', None))
         total_of_traces = len(event_data)
         # derive the model for evaluating the quality metrics
         initial_trace_id_for_stable_period = 0
         final_trace_id = initial_trace_id_for_stable_period + window_size
-        log_for_model = EventLog(event_data[initial_trace_id_for_stable_period:final_trace_id])
-        net, im, fm = pm4py.discover_petri_net_inductive(log_for_model, activity_key='concept:name',
-                                                         case_id_key='case:concept:name',
-                                                         timestamp_key='time:timestamp')
+        discovery_backend = self.get_discovery_backend()
+        variants = self.current_log.get_variants()
+        window_for_model = VariantWindow(variants[initial_trace_id_for_stable_period:final_trace_id])
+        net, im, fm = discover_petri_net(window_for_model, discovery_backend)
         pnml_filename = os.path.join(self.output_path_adaptive_models_detector,
                                      f'model1_{initial_trace_id_for_stable_period}-{final_trace_id - 1}.pnml')
-        pnml_exporter.apply(net, im, pnml_filename, final_marking=fm)
-        tree = pm4py.discover_process_tree_inductive(log_for_model, activity_key='concept:name',
-                                                     case_id_key='case:concept:name',
-                                                     timestamp_key='time:timestamp')
+        export_petri_net(net, im, fm, pnml_filename, window_for_model, discovery_backend)
+        model_configurations = self.get_model_configurations(window_for_model, net, im,
+                                                             metrics[QualityDimension.PRECISION.name])
+        # metrics of each variant for the current model
+        variant_metrics = VariantMetrics()
+        # window with the last window_size traces read, used by the precision
+        variant_relations = {}
+        last_traces = VariantWindow(variant_relations=variant_relations)
         print(f'Initial model discovered using traces [{initial_trace_id_for_stable_period}-{final_trace_id - 1}]')
         # initialize similarity metrics manager
         self.metrics = ManageSimilarityMetrics(self.model_type, self.current_parameters, self.control,
@@ -966,7 +1186,9 @@ class AnalyzeDrift:
         for i in range(0, total_of_traces):
             self.current_trace = i + 1
             # print(f'Reading trace {i}')
-            current_trace = EventLog(event_data[i:i + 1])
+            last_traces.add_trace(variants[i])
+            if i >= window_size:
+                last_traces.remove_trace(variants[i - window_size])
             if i == initial_trace_id_for_stable_period:
                 print(
                     f'Setup phase - traces [{initial_trace_id_for_stable_period}-{initial_trace_id_for_stable_period + window_size - 1}]')
@@ -974,27 +1196,29 @@ class AnalyzeDrift:
                 # during the stable period we apply the same value for the metrics
                 # fitness - calculated using the initial trace of the stable period
                 # precision - calculated using all the traces inside the stable period
-                traces_stable_period = EventLog(
-                    event_data[initial_trace_id_for_stable_period:initial_trace_id_for_stable_period + window_size])
+                traces_stable_period = VariantWindow(
+                    variants[initial_trace_id_for_stable_period:initial_trace_id_for_stable_period + window_size],
+                    variant_relations)
                 precision = calculate_quality_metric_footprints(metrics[QualityDimension.PRECISION.name],
                                                                 traces_stable_period,
-                                                                tree) * factor
-                fitness = calculate_quality_metric(metrics[QualityDimension.FITNESS.name], current_trace, net, im,
-                                                   fm) * factor
+                                                                model_configurations) * factor
+                fitness = variant_metrics.get_value(metrics[QualityDimension.FITNESS.name], variants[i],
+                                                    event_data[i], net, im, fm, window_for_model) * factor
             elif i >= initial_trace_id_for_stable_period + window_size:
                 print(f'Detection phase - reading trace {i}')
-                window = EventLog(event_data[i - window_size + 1:i + 1])
                 # after the stable period calculate the metrics after reading a new trace
-                precision = calculate_quality_metric_footprints(metrics[QualityDimension.PRECISION.name], window,
-                                                                tree) * factor
-                fitness = calculate_quality_metric(metrics[QualityDimension.FITNESS.name], current_trace, net, im,
-                                                   fm) * factor
+                # (window with the traces [i - window_size + 1, i])
+                precision = calculate_quality_metric_footprints(metrics[QualityDimension.PRECISION.name],
+                                                                last_traces, model_configurations) * factor
+                fitness = variant_metrics.get_value(metrics[QualityDimension.FITNESS.name], variants[i],
+                                                    event_data[i], net, im, fm, window_for_model) * factor
 
-            values[QualityDimension.PRECISION.name].append(precision)
-            detector_dict[QualityDimension.PRECISION.name].update_val(precision)
+            with tracer.span('detector_update', index=i, window=self.window_count, sub_log_size=window_size):
+                values[QualityDimension.PRECISION.name].append(precision)
+                detector_dict[QualityDimension.PRECISION.name].update_val(precision)
 
-            values[QualityDimension.FITNESS.name].append(fitness)
-            detector_dict[QualityDimension.FITNESS.name].update_val(fitness)
+                values[QualityDimension.FITNESS.name].append(fitness)
+                detector_dict[QualityDimension.FITNESS.name].update_val(fitness)
 
             drift_detected = False
             change_point = 0
@@ -1047,16 +1271,14 @@ class AnalyzeDrift:
                     detector_dict[m].reset()
                 if self.current_parameters.update_model:
                     # Discover a new model using window
-                    log_for_model = EventLog(event_data[change_point:change_point + window_size])
-                    net, im, fm = pm4py.discover_petri_net_inductive(log_for_model, activity_key='concept:name',
-                                                                     case_id_key='case:concept:name',
-                                                                     timestamp_key='time:timestamp')
+                    window_for_model = VariantWindow(variants[change_point:change_point + window_size],
+                                                     variant_relations)
+                    net, im, fm = discover_petri_net(window_for_model, discovery_backend)
                     pnml_filename = os.path.join(self.output_path_adaptive_models_detector,
                                                  f'model{self.window_count + 1}_{change_point}-{change_point + window_size - 1}.pnml')
-                    pnml_exporter.apply(net, im, pnml_filename, final_marking=fm)
-                    tree = pm4py.discover_process_tree_inductive(log_for_model, activity_key='concept:name',
-                                                                 case_id_key='case:concept:name',
-                                                                 timestamp_key='time:timestamp')
+                    export_petri_net(net, im, fm, pnml_filename, window_for_model, discovery_backend)
+                    model_configurations = self.get_model_configurations(
+                        window_for_model, net, im, metrics[QualityDimension.PRECISION.name])
                     print(f'New model discovered using traces [{change_point}-{change_point + window_size - 1}]')
 
         # process remaining items as the last window
@@ -1125,6 +1347,7 @@ class AnalyzeDrift:
         date_aux = event_data['time:timestamp'][index]
         return date_aux
 
+    @measured(Stage.FILE_WRITE)
     def save_sublog(self, sub_log, begin, end):
         output_path = self.logs_path
         if not os.path.exists(output_path):
@@ -1134,6 +1357,11 @@ class AnalyzeDrift:
         xes_exporter.apply(sub_log, output_filename)
 
     def new_window(self, begin, end, activity=''):
+        window = self.window_count[activity] + 1 if activity else self.window_count + 1
+        with tracer.span('new_window', window=window, activity=activity, begin=begin, sub_log_size=end - begin):
+            self.process_new_window(begin, end, activity)
+
+    def process_new_window(self, begin, end, activity=''):
         # increment the id of the window
         if activity:  # when using a detector for an attribute of the activity
             print(
@@ -1142,20 +1370,32 @@ class AnalyzeDrift:
         else:
             print(f'Generating model for sub-log [{begin} - {end - 1}] - window [{self.window_count}]')
             self.window_count += 1
+        performance_metrics.increment('windows')
 
-        if self.current_parameters.read_log_as == ReadLogAs.EVENT.name:
-            # generate the sub-log for the window
-            window = self.event_data[begin:end]
-            sub_log = log_converter.apply(window, variant=log_converter.Variants.TO_EVENT_LOG)
-            initial_timestamp = self.get_current_date_df(window, begin)
-        elif self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
-            sub_log = EventLog(self.event_data[begin:end])
-            # get initial timestamp
-            initial_timestamp = self.get_current_date(sub_log[0])
-        else:
-            print(f'Incorrect window type: {self.current_parameters.read_log_as}.')
+        sub_log, initial_timestamp = self.get_window_sub_log(begin, end)
+        if sub_log is None:
             return
+        self.save_window_sub_log(sub_log, begin, end)
+        self.execute_processes_for_window(sub_log, begin, initial_timestamp, activity)
+
+    # generate the sub-log of the window and return it with the initial timestamp
+    def get_window_sub_log(self, begin, end):
+        with performance_metrics.measure(Stage.WINDOWING):
+            if self.current_parameters.read_log_as == ReadLogAs.EVENT.name:
+                # generate the sub-log for the window
+                window = self.event_data[begin:end]
+                sub_log = log_converter.apply(window, variant=log_converter.Variants.TO_EVENT_LOG)
+                initial_timestamp = self.get_current_date_df(window, begin)
+            elif self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
+                sub_log = EventLog(self.event_data[begin:end])
+                # get initial timestamp
+                initial_timestamp = self.get_current_date(sub_log[0])
+            else:
+                print(f'Incorrect window type: {self.current_parameters.read_log_as}.')
+                return None, None
+        return sub_log, initial_timestamp
 
+    def save_window_sub_log(self, sub_log, begin, end):
         # save the sublog
         # only save the sublog here for fixed approach or adaptive approach for TIME and DATA drifts
         # when the approach is ADAPTIVE for CONTROL FLOW drifts, the end trace is based on the window size
@@ -1166,9 +1406,8 @@ class AnalyzeDrift:
                  self.current_parameters.perspective == AdaptivePerspective.TIME_DATA)):
             self.save_sublog(sub_log, begin, end)
 
-        self.execute_processes_for_window(sub_log, begin, initial_timestamp, activity)
-
-    def calculate_metrics_between_adjacent_time_slots(self, model, sub_log, initial_trace_index, initial_timestamp,
+    # summary: WindowSummary of the window, the metrics do not use the sub-log
+    def calculate_metrics_between_adjacent_time_slots(self, model, summary, initial_trace_index, initial_timestamp,
                                                       activity):
         if activity:
             if activity == Activity.ALL.value:  # adaptive approach with no drift detected, nothing to be done
@@ -1176,12 +1415,12 @@ class AnalyzeDrift:
             metrics = self.metrics[activity]
             window = self.window_count[activity]
             previous_model = self.previous_model[activity]
-            previous_sub_log = self.previous_sub_log[activity]
+            previous_summary = self.previous_summary[activity]
         else:
             metrics = self.metrics
             window = self.window_count
             previous_model = self.previous_model
-            previous_sub_log = self.previous_sub_log
+            previous_summary = self.previous_summary
 
         # if it is the second window start the metrics calculation and timeout
         if window == 2:
@@ -1190,66 +1429,79 @@ class AnalyzeDrift:
 
         # calculate the similarity metrics between consecutive windows
         if window > 1:
-            metrics.calculate_metrics(window, previous_model, model, previous_sub_log, sub_log, self.current_parameters,
-                                      initial_trace_index, initial_timestamp)
+            metrics.calculate_metrics(window, previous_model, model, previous_summary, summary,
+                                      self.current_parameters, initial_trace_index, initial_timestamp)
 
         if activity:
-            # save the current model and sub_log for the next window
-            self.previous_sub_log[activity] = sub_log
+            # save the current model and summary for the next window
+            self.previous_summary[activity] = summary
             self.previous_model[activity] = model
         else:
-            # save the current model and sub_log for the next window
-            self.previous_sub_log = sub_log
+            # save the current model and summary for the next window
+            self.previous_summary = summary
             self.previous_model = model
 
-    # after defining a window (fixed or adaptive) IPDD must mine the models and calculate the similarity metrics
-    # between adjacent ones
-    def execute_processes_for_window(self, sub_log, initial_trace_index, initial_timestamp, activity):
-        model = self.discovery.generate_process_model(sub_log, self.models_path, self.current_parameters.logname,
-                                                      self.window_count, activity,
-                                                      self.current_parameters.save_model_svg)
-        self.calculate_metrics_between_adjacent_time_slots(model, sub_log, initial_trace_index, initial_timestamp,
-                                                           activity)
-
-    # create for sliding windows
-    def process_two_fixed_sliding_windows(self, event_data, initial_index_w1, initial_index_w2, winsize):
-        print(f'process_two_windows w1: {initial_index_w1} w2: {initial_index_w2} winsize: {winsize}')
-        if self.current_parameters.read_log_as == ReadLogAs.EVENT.name:
-            # generate the sub-log for the window
-            window1 = EventStream(event_data[initial_index_w1:initial_index_w1 + winsize])
-            window2 = EventStream(event_data[initial_index_w2:initial_index_w2 + winsize])
-            sub_log1 = log_converter.apply(window1, variant=log_converter.Variants.TO_EVENT_LOG)
-            sub_log2 = log_converter.apply(window2, variant=log_converter.Variants.TO_EVENT_LOG)
-        elif self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
-            sub_log1 = EventLog(event_data[initial_index_w1:initial_index_w1 + winsize])
-            sub_log2 = EventLog(event_data[initial_index_w2:(initial_index_w2 + winsize)])
-            print(f'Sub-log1: {len(sub_log1)} - Sub-log2: {len(sub_log2)}')
+    # variants of the window, from the variants of the log when it is read as traces
+    def get_window_variants(self, sub_log, begin):
+        if self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
+            return VariantWindow(self.current_log.get_variants()[begin:begin + len(sub_log)])
+        return VariantWindow([get_variant(trace) for trace in sub_log])
+
+    # model of the candidate discovered in background (waits if it is not ready), saved as the model of the
+    # current window
+    def get_candidate_model(self, candidate, discovery_backend):
+        window_for_model = VariantWindow(self.current_log.get_variants()[candidate.begin:candidate.end])
+        # the model discovered by the worker is kept in the discovery cache, as the models discovered in this process
+        net, im, fm = discovery_cache.get_model(f'petri_net_{discovery_backend}', window_for_model.get_fingerprint(),
+                                                candidate.result)
+        pnml_filename = os.path.join(self.output_path_adaptive_models_detector,
+                                     f'model{self.window_count + 1}_{candidate.begin}-{candidate.end - 1}.pnml')
+        export_petri_net(net, im, fm, pnml_filename, window_for_model, discovery_backend)
+        return window_for_model, net, im, fm
+
+    # algorithm for discovering the Petri nets of the adaptive approach (DiscoveryBackend)
+    def get_discovery_backend(self):
+        return getattr(self.current_parameters, 'discovery_backend', DiscoveryBackend.INDUCTIVE.name)
+
+    # configurations of the footprints of the model used by precisionFP: from the process tree or, if the
+    # discovery backend does not discover process trees, from the Petri net
+    # precisionDFG uses the edges of the DFG of the window instead
+    def get_model_configurations(self, window, net, im, metric_name=QualityMetric.PRECISION_FP.value):
+        if metric_name == QualityMetric.PRECISION_DFG.value:
+            return window.get_relations_set()
+        discovery_backend = self.get_discovery_backend()
+        if has_process_tree(discovery_backend):
+            return get_model_configurations(discover_process_tree(window, discovery_backend))
+        return get_net_configurations(net, im)
+
+    # summary of the window (VariantWindow) with the traces [begin, end) of the log
+    # sub_log: traces of the window, informed when the log is not read as traces
+    def get_window_summary(self, window, begin, end, sub_log=None):
+        if self.current_parameters.read_log_as == ReadLogAs.TRACE.name:
+            first_trace, last_trace = self.event_data[begin], self.event_data[end - 1]
         else:
-            print(f'Incorrect window type: {self.current_parameters.read_log_as}.')
-
-        # TODO remove after debugging
-        # for debug purpose
-        # dataframe = log_converter.apply(sub_log1, variant=log_converter.Variants.TO_DATA_FRAME)
-        # dataframe.to_csv(f'data/debug/{self.current_parameters.logname}_{self.window_count}_log1.csv')
-        # dataframe = log_converter.apply(sub_log2, variant=log_converter.Variants.TO_DATA_FRAME)
-        # dataframe.to_csv(f'data/debug/{self.current_parameters.logname}_{self.window_count}_log2.csv')
-        self.compare_sliding_fixed_windows(sub_log1, sub_log2)
-
-    # create for sliding windows
-    def compare_sliding_fixed_windows(self, sl1, sl2):
-        # increment the id of the window
-        self.window_count += 1
-        model1 = self.discovery.generate_process_model(sl1, self.models_path, self.current_parameters.logname,
-                                                       self.window_count)
+            first_trace, last_trace = sub_log[0], sub_log[-1]
+        return WindowSummary.from_variant_window(window, first_trace[0]['time:timestamp'],
+                                                 last_trace[-1]['time:timestamp'])
 
-        # increment the id of the window
-        self.window_count += 1
-        model2 = self.discovery.generate_process_model(sl2, self.models_path, self.current_parameters.logname,
-                                                       self.window_count)
+    # the DFG is discovered from the variants of the window, which is also smaller to send to the discovery pool
+    def get_log_for_discovery(self, sub_log, window):
+        if self.model_type == 'dfg':
+            return window
+        return sub_log
 
-        # if it is the second window start the metrics calculation and timeout
-        if self.window_count == 2:
-            self.metrics.start_metrics_timeout()
-            self.control.start_metrics_calculation()
-
-        self.metrics.calculate_metrics(self.window_count, sl1, sl2, model1, model2, self.current_parameters)
+    # after defining a window (fixed or adaptive) IPDD must mine the models and calculate the similarity metrics
+    # between adjacent ones
+    def execute_processes_for_window(self, sub_log, initial_trace_index, initial_timestamp, activity):
+        window = self.window_count[activity] if activity else self.window_count
+        with tracer.span('execute_processes_for_window', window=window, activity=activity,
+                         sub_log_size=len(sub_log)):
+            variants = self.get_window_variants(sub_log, initial_trace_index)
+            summary = self.get_window_summary(variants, initial_trace_index, initial_trace_index + len(sub_log),
+                                              sub_log)
+            model = self.discovery.generate_process_model(self.get_log_for_discovery(sub_log, variants),
+                                                          self.models_path, self.current_parameters.logname,
+                                                          self.window_count, activity,
+                                                          self.current_parameters.save_model_svg)
+            self.calculate_metrics_between_adjacent_time_slots(model, summary, initial_trace_index,
+                                                               initial_timestamp, activity)
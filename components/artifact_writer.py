@@ -0,0 +1,81 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import queue
+import traceback
+from threading import Thread, Lock
+
+from components.monitoring.performance_metrics import performance_metrics
+
+DEFAULT_WORKERS = 2
+# when the queue is full the analysis waits (backpressure), so the pending artifacts do not use all the memory
+DEFAULT_QUEUE_SIZE = 32
+
+
+# Pool of threads that write the artifacts (CSV, XLSX, PNG) generated during the analysis
+# The analysis only submits the data and continues, the files are written in background
+# The framework calls drain() before marking the run as finished
+class ArtifactWriter:
+    def __init__(self, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE):
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.threads = []
+        self.lock = Lock()
+        self.errors = []
+
+    def start_workers(self):
+        with self.lock:
+            if self.threads:
+                return
+            for i in range(self.workers):
+                thread = Thread(target=self.process_queue, name=f'IPDD-ArtifactWriter-{i}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def process_queue(self):
+        while True:
+            stage, fn, args, kwargs = self.queue.get()
+            try:
+                with performance_metrics.measure(stage):
+                    fn(*args, **kwargs)
+                performance_metrics.increment('artifacts')
+            except Exception as e:
+                print(f'Error writing artifact using {fn.__name__}: {e}')
+                with self.lock:
+                    self.errors.append(traceback.format_exc())
+            finally:
+                self.queue.task_done()
+
+    # submit the function that writes the artifact, the arguments must not be changed by the caller after
+    # submitting (e.g., use a copy of the dataframe)
+    # stage: stage of the performance metrics used for measuring the write
+    def submit(self, stage, fn, *args, **kwargs):
+        self.start_workers()
+        self.queue.put((stage, fn, args, kwargs))
+
+    # wait until all the submitted artifacts are written and return the errors found
+    def drain(self):
+        self.queue.join()
+        with self.lock:
+            errors = self.errors
+            self.errors = []
+        if errors:
+            print(f'{len(errors)} artifacts could not be written')
+        return errors
+
+    def get_pending(self):
+        return self.queue.unfinished_tasks
+
+
+# writer used by all the IPDD components
+artifact_writer = ArtifactWriter()
@@ -12,7 +12,6 @@
     along with IPDD. If not, see <https://www.gnu.org/licenses/>.
 """
 import threading
-from pm4py.algo.filtering.log.attributes import attributes_filter
 from components.compare_models.controlflow_metric import ControlFlowMetric
 
 
@@ -26,28 +25,29 @@ def threaded(fn):
 
 
 class DfgNodesSimilarityMetric(ControlFlowMetric):
-    def __init__(self, window, trace, timestamp, metric_name, model1, model2, sublog1, sublog2):
-        super().__init__(window, trace, timestamp, metric_name, model1, model2, sublog1, sublog2)
+    def __init__(self, window, trace, timestamp, metric_name, model1, model2, summary1, summary2):
+        super().__init__(window, trace, timestamp, metric_name, model1, model2, summary1, summary2)
 
     def is_dissimilar(self):
         return self.value < 1
 
     def calculate(self):
         # get the current nodes from the traces using the name of the activities
-        nodes_model1 = list(attributes_filter.get_attribute_values(self.sublog1, "concept:name").keys())
-        nodes_model2 = list(attributes_filter.get_attribute_values(self.sublog2, "concept:name").keys())
+        # (calculated once for each window, in its summary)
+        nodes_model1 = self.summary1.get_activities()
+        nodes_model2 = self.summary2.get_activities()
 
-        self.diff_removed = set(nodes_model1).difference(set(nodes_model2))
-        self.diff_added = set(nodes_model2).difference(set(nodes_model1))
+        self.diff_removed = nodes_model1.difference(nodes_model2)
+        self.diff_added = nodes_model2.difference(nodes_model1)
 
-        inter = set(nodes_model1).intersection(set(nodes_model2))
+        inter = nodes_model1.intersection(nodes_model2)
         self.value = 2 * len(inter) / (len(nodes_model1) + len(nodes_model2))
         return self.value, self.diff_added, self.diff_removed
 
 
 class DfgEdgesSimilarityMetric(ControlFlowMetric):
-    def __init__(self, window, trace, timestamp, metric_name, model1, model2, sublog1, sublog2):
-        super().__init__(window, trace, timestamp, metric_name, model1, model2, sublog1, sublog2)
+    def __init__(self, window, trace, timestamp, metric_name, model1, model2, summary1, summary2):
+        super().__init__(window, trace, timestamp, metric_name, model1, model2, summary1, summary2)
 
     def is_dissimilar(self):
         return self.value < 1
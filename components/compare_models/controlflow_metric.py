@@ -13,17 +13,20 @@
 """
 from components.compare_models.controlflow_metric_info import ControlFlowMetricInfo
 from components.compare_models.metric import Metric
+from components.monitoring.performance_metrics import performance_metrics, Stage
+from components.monitoring.tracer import tracer
 
 
 class ControlFlowMetric(Metric):
-    def __init__(self, window, trace, timestamp, metric_name, model1, model2, sublog1, sublog2):
+    # summary1, summary2: WindowSummary of the compared windows
+    def __init__(self, window, trace, timestamp, metric_name, model1, model2, summary1, summary2):
         super().__init__(window, metric_name)
         self.diff_added = set()
         self.diff_removed = set()
         self.model1 = model1
         self.model2 = model2
-        self.sublog1 = sublog1
-        self.sublog2 = sublog2
+        self.summary1 = summary1
+        self.summary2 = summary2
 
         self.initial_trace = trace
         self.metric_info = ControlFlowMetricInfo(window, trace, timestamp, metric_name)
@@ -32,9 +35,11 @@ class ControlFlowMetric(Metric):
         pass
 
     def run(self):
-        value, diff_added, diff_removed = self.calculate()
-        self.metric_info.set_value(value)
-        self.metric_info.set_diff_added(diff_added)
-        self.metric_info.set_diff_removed(diff_removed)
-        self.metric_info.set_dissimilar(self.is_dissimilar())
-        self.save_metrics()
+        with tracer.span('Metric.run', window=self.window, metric=self.metric_name):
+            with performance_metrics.measure(Stage.SIMILARITY_METRICS):
+                value, diff_added, diff_removed = self.calculate()
+            self.metric_info.set_value(value)
+            self.metric_info.set_diff_added(diff_added)
+            self.metric_info.set_diff_removed(diff_removed)
+            self.metric_info.set_dissimilar(self.is_dissimilar())
+            self.save_metrics()
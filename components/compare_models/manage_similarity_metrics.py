@@ -17,7 +17,7 @@ from threading import RLock, Thread
 from components.dfg_definitions import DfgDefinitions
 from json_tricks import loads
 
-from components.parameters import Approach, AdaptivePerspective
+from components.parameters import Approach, AdaptivePerspective, FixedWindowType, get_fixed_window_suffix
 from components.pn_definitions import PnDefinitions
 
 
@@ -30,6 +30,25 @@ def threaded(fn):
     return wrapper
 
 
+# The sliding windows move stride traces at each step, so a change is reported by all the consecutive steps that
+# compare windows with traces before and after it. Each run of consecutive dissimilar windows is reported as one
+# drift, at the window with the highest dissimilarity (the first one in case of ties)
+# dissimilar_windows: dictionary window -> (dissimilarity, initial trace)
+def merge_consecutive_drifts(dissimilar_windows):
+    windows = []
+    traces = []
+    previous_window = None
+    for window in sorted(dissimilar_windows):
+        if previous_window is None or window != previous_window + 1:
+            windows.append(window)
+            traces.append(dissimilar_windows[window][1])
+        elif dissimilar_windows[window][0] > dissimilar_windows[windows[-1]][0]:
+            windows[-1] = window
+            traces[-1] = dissimilar_windows[window][1]
+        previous_window = window
+    return windows, traces
+
+
 class ManageSimilarityMetrics:
     def __init__(self, model_type, current_parameters, control, models_path, metrics_path,
                  activity=''):
@@ -40,6 +59,8 @@ class ManageSimilarityMetrics:
         self.current_parameters = current_parameters
         self.final_window = 0
         self.metrics_count = 0
+        # dissimilarity of the windows compared by the sliding windows, used for reporting one drift for each change
+        self.window_dissimilarity = {}
         self.activity = activity
         self.control = control
         self.models_path = models_path
@@ -94,21 +115,26 @@ class ManageSimilarityMetrics:
             with open(self.filenames[metric], 'w+') as fp:
                 pass
 
+    def set_window_dissimilarity(self, window, dissimilarity):
+        self.window_dissimilarity[window] = dissimilarity
+
     def set_final_window(self, w):
         print(f'Setting final window value {w}')
         self.final_window = w
 
-    def calculate_metrics(self, current_window, model1, model2, sublog1, sublog2, parameters,
-                          initial_trace=None, initial_timestamp=None):
+    # run_in_thread: calculate each metric in a new thread, otherwise the metrics are calculated in the caller
+    # thread (used by the sliding window, which compares many small steps)
+    def calculate_metrics(self, current_window, model1, model2, summary1, summary2, parameters,
+                          initial_trace=None, initial_timestamp=None, run_in_thread=True):
         # print(f'Starting to calculate similarity metrics between windows [{current_window-1}]-[{current_window}] ...')
         # calculate the chosen metrics and save the values on the file
         print(f'calculate_metrics - current window {current_window} - initial_trace = {initial_trace}')
         self.calculate_configured_similarity_metrics(current_window, initial_trace, initial_timestamp, model1, model2,
-                                                     sublog1, sublog2,
-                                                     parameters)
+                                                     summary1, summary2,
+                                                     parameters, run_in_thread)
 
     def calculate_configured_similarity_metrics(self, current_window, initial_trace, initial_timestamp,
-                                                m1, m2, l1, l2, parameters):
+                                                m1, m2, l1, l2, parameters, run_in_thread=True):
         self.model_type_definitions.set_current_parameters(self.current_parameters)
         for metric_name in self.metrics_list:
             print(f'Starting [{metric_name}] calculation between windows [{current_window - 1}-{current_window}]')
@@ -118,7 +144,10 @@ class ManageSimilarityMetrics:
 
             metric.set_saving_definitions(self.filenames[metric_name], self.current_parameters, self.locks[metric_name],
                                           self)
-            metric.start()
+            if run_in_thread:
+                metric.start()
+            else:
+                metric.run()
 
     def increment_metrics_count(self):
         self.metrics_count += 1
@@ -165,6 +194,7 @@ class ManageSimilarityMetrics:
         traces = []
         # avoiding errors when the process model does not have any similarity metric implemented yet
         if self.metrics_list:
+            dissimilar_windows = {}
             for m in self.metrics_list:
                 self.locks[m].acquire()
                 with open(self.filenames[m], "r") as file:
@@ -177,12 +207,17 @@ class ManageSimilarityMetrics:
                             # only include the trace once
                             if metrics_info.initial_trace not in traces:
                                 traces.append(metrics_info.initial_trace)
+                            dissimilar_windows[metrics_info.window] = (
+                                self.window_dissimilarity.get(metrics_info.window, 0), metrics_info.initial_trace)
                 self.locks[m].release()
+            if getattr(self.current_parameters, 'window_type', None) == FixedWindowType.SLIDING.name:
+                windows, traces = merge_consecutive_drifts(dissimilar_windows)
 
             if self.current_parameters and self.current_parameters.approach == Approach.FIXED.name:
                 filename = os.path.join(self.metrics_path,
                                         f'{self.current_parameters.approach}'
-                                        f'_win{self.current_parameters.win_size}_drift_windows.txt')
+                                        f'_win{self.current_parameters.win_size}'
+                                        f'{get_fixed_window_suffix(self.current_parameters)}_drift_windows.txt')
             elif self.current_parameters and self.current_parameters.approach == Approach.ADAPTIVE.name:
                 if self.current_parameters.perspective == AdaptivePerspective.TIME_DATA.name:
                     filename = os.path.join(self.metrics_path,
@@ -13,6 +13,8 @@
 """
 import threading
 
+from components.monitoring.performance_metrics import performance_metrics, Stage
+
 
 class Metric(threading.Thread):
     def __init__(self, window, metric_name):
@@ -46,10 +48,11 @@ class Metric(threading.Thread):
         if self.is_dissimilar() or self.get_complete_info():
             self.lock.acquire()
             # update the file containing the metrics' values
-            with open(self.filename, 'a+') as file:
-                #print(f'---------------------- Vai salvar dados sobre métrica \n{str(self.get_info())}')
-                file.write(self.get_info().serialize())
-                file.write('\n')
+            with performance_metrics.measure(Stage.FILE_WRITE):
+                with open(self.filename, 'a+') as file:
+                    #print(f'---------------------- Vai salvar dados sobre métrica \n{str(self.get_info())}')
+                    file.write(self.get_info().serialize())
+                    file.write('\n')
             self.lock.release()
             print(f'Saving [{self.metric_name}] comparing windows [{self.window-1}-{self.window}]')
         self.manager_similarity_metrics.increment_metrics_count()
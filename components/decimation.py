@@ -0,0 +1,108 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+
+# maximum number of points of each plotted series, a PNG does not show more than this
+DEFAULT_MAX_POINTS = 2000
+
+
+class DecimationMethod(str, Enum):
+    LTTB = 'Largest-Triangle-Three-Buckets'
+    MINMAX = 'Min/max per bucket'
+
+
+# numeric representation of the x values (timestamps are converted to nanoseconds)
+def to_numeric(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(float)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype(np.int64).astype(float)
+    # objects (e.g., pandas Timestamps with timezone)
+    return pd.to_datetime(values, utc=True).asi8.astype(float)
+
+
+# Largest-Triangle-Three-Buckets (Steinarsson, 2013)
+# select one point per bucket, the one that forms the largest triangle with the point selected in the
+# previous bucket and the average of the next bucket, which preserves the visual shape of the series
+def lttb_indexes(x, y, threshold):
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = int(np.floor((i + 1) * every)) + 1
+        avg_end = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = np.nanmean(y[avg_start:avg_end]) if not np.all(np.isnan(y[avg_start:avg_end])) else y[a]
+
+        range_start = int(np.floor(i * every)) + 1
+        range_end = int(np.floor((i + 1) * every)) + 1
+        area = np.abs((x[a] - avg_x) * (y[range_start:range_end] - y[a]) -
+                      (x[a] - x[range_start:range_end]) * (avg_y - y[a]))
+        area = np.where(np.isnan(area), -1, area)
+        a = range_start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[threshold - 1] = n - 1
+    return selected
+
+
+# select the minimum and the maximum of each bucket, which preserves the peaks of the series
+def minmax_indexes(y, threshold):
+    n = len(y)
+    if threshold >= n or threshold < 2:
+        return np.arange(n)
+    buckets = np.array_split(np.arange(n), threshold // 2)
+    selected = []
+    for bucket in buckets:
+        values = y[bucket]
+        if np.all(np.isnan(values)):
+            selected.append(bucket[0])
+            continue
+        selected.append(bucket[int(np.nanargmin(values))])
+        selected.append(bucket[int(np.nanargmax(values))])
+    return np.unique(np.array(selected, dtype=np.int64))
+
+
+# Reduce the series to approximately max_points for plotting
+# keep_x: x values that must survive the decimation (e.g., change points), the closest points are kept
+# Return the decimated x and y (same types of the input)
+def decimate(x, y, max_points=DEFAULT_MAX_POINTS, keep_x=None, method=DecimationMethod.LTTB):
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    if max_points is None or len(x) <= max_points:
+        return x, y
+    x_numeric = to_numeric(x)
+    if method == DecimationMethod.MINMAX:
+        indexes = minmax_indexes(y, max_points)
+    else:
+        indexes = lttb_indexes(x_numeric, y, max_points)
+
+    if keep_x is not None and len(keep_x) > 0:
+        keep_numeric = to_numeric(keep_x)
+        if np.all(np.diff(x_numeric) >= 0):
+            # the points immediately before and after each value to keep
+            positions = np.searchsorted(x_numeric, keep_numeric)
+            kept = np.concatenate([positions - 1, positions])
+            kept = kept[(kept >= 0) & (kept < len(x))]
+        else:
+            kept = np.flatnonzero(np.isin(x_numeric, keep_numeric))
+        indexes = np.union1d(indexes, kept)
+    return x[indexes], y[indexes]
@@ -16,7 +16,7 @@ import os
 from components.compare_models.compare_dfg import DfgEdgesSimilarityMetric, DfgNodesSimilarityMetric
 from enum import Enum
 
-from components.parameters import Approach, AttributeAdaptive, AdaptivePerspective
+from components.parameters import Approach, AttributeAdaptive, AdaptivePerspective, get_fixed_window_suffix
 
 
 class Metric(str, Enum):
@@ -51,7 +51,8 @@ class DfgDefinitions:
     def get_metrics_filename(self, current_parameters, metric_name):
         filename = ''
         if current_parameters.approach == Approach.FIXED.name:
-            filename = f'{metric_name}_{current_parameters.approach}_win{current_parameters.win_size}.txt'
+            filename = f'{metric_name}_{current_parameters.approach}_win{current_parameters.win_size}' \
+                       f'{get_fixed_window_suffix(current_parameters)}.txt'
         elif current_parameters.approach == Approach.ADAPTIVE.name:
             if current_parameters.perspective == AdaptivePerspective.TIME_DATA.name:
                 filename = f'{metric_name}_{current_parameters.approach}' \
@@ -0,0 +1,97 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import time
+from collections import Counter
+
+from pm4py.algo.discovery.heuristics.variants import classic as heuristics_miner
+from pm4py.algo.discovery.inductive.dtypes.im_dfg import InductiveDFG
+from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureDFG, IMDataStructureUVCL
+from pm4py.algo.discovery.inductive.variants.imd import IMD
+from pm4py.algo.discovery.inductive.variants.imf import IMFUVCL
+from pm4py.convert import convert_to_petri_net
+from pm4py.objects.conversion.heuristics_net import converter as hn_converter
+from pm4py.objects.dfg.obj import DFG
+from pm4py.util import constants
+
+from components.discovery.variant_window import discover_process_tree_from_variants
+from components.monitoring.performance_metrics import performance_metrics
+from components.parameters import DiscoveryBackend
+
+# noise threshold of the Inductive Miner infrequent (same default of pm4py)
+IMF_NOISE_THRESHOLD = 0.2
+
+
+# process tree discovered with the Inductive Miner infrequent (IMf) using the variants of the window
+def discover_process_tree_imf(window):
+    parameters = {'noise_threshold': IMF_NOISE_THRESHOLD, 'multiprocessing': constants.ENABLE_MULTIPROCESSING_DEFAULT,
+                  'disable_fallthroughs': False}
+    return IMFUVCL(parameters).apply(IMDataStructureUVCL(Counter(window.variants)), parameters)
+
+
+# process tree discovered with the Inductive Miner directly-follows (IMd) using the DFG of the window,
+# already maintained by the VariantWindow, so the traces are not read again
+def discover_process_tree_imd(window):
+    parameters = {'multiprocessing': constants.ENABLE_MULTIPROCESSING_DEFAULT}
+    dfg = DFG(window.get_dfg(), window.get_start_activities(), window.get_end_activities())
+    return IMD(parameters).apply(IMDataStructureDFG(InductiveDFG(dfg=dfg, skip=() in window.variants)), parameters)
+
+
+# Petri net discovered with the Heuristics Miner using the DFG and the activities of the window
+def discover_petri_net_heuristics(window):
+    heu_net = heuristics_miner.apply_heu_dfg(window.get_dfg(), activities=list(window.activities),
+                                             activities_occurrences=dict(window.activities),
+                                             start_activities=window.get_start_activities(),
+                                             end_activities=window.get_end_activities())
+    return hn_converter.apply(heu_net)
+
+
+# Registry of the discovery backends: backend -> function for discovering the process tree of a VariantWindow
+# The Heuristics Miner does not discover a process tree (None), its Petri net is discovered directly
+PROCESS_TREE_BACKENDS = {
+    DiscoveryBackend.INDUCTIVE.name: discover_process_tree_from_variants,
+    DiscoveryBackend.INDUCTIVE_INFREQUENT.name: discover_process_tree_imf,
+    DiscoveryBackend.INDUCTIVE_DFG.name: discover_process_tree_imd,
+    DiscoveryBackend.HEURISTICS.name: None,
+}
+PETRI_NET_BACKENDS = {
+    DiscoveryBackend.HEURISTICS.name: discover_petri_net_heuristics,
+}
+
+
+def get_stage_name(backend):
+    return f'discovery_{backend.lower()}'
+
+
+def measure_backend(backend, discover, window):
+    start = time.perf_counter()
+    model = discover(window)
+    # the time of each backend is reported as a separated stage (e.g., discovery_inductive_dfg)
+    performance_metrics.observe(get_stage_name(backend), time.perf_counter() - start)
+    return model
+
+
+def has_process_tree(backend):
+    return PROCESS_TREE_BACKENDS[backend] is not None
+
+
+def discover_process_tree_with_backend(window, backend=DiscoveryBackend.INDUCTIVE.name):
+    if not has_process_tree(backend):
+        raise ValueError(f'Discovery backend {backend} does not discover process trees')
+    return measure_backend(backend, PROCESS_TREE_BACKENDS[backend], window)
+
+
+def discover_petri_net_with_backend(window, backend=DiscoveryBackend.INDUCTIVE.name):
+    if backend in PETRI_NET_BACKENDS:
+        return measure_backend(backend, PETRI_NET_BACKENDS[backend], window)
+    return convert_to_petri_net(discover_process_tree_with_backend(window, backend))
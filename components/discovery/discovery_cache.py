@@ -0,0 +1,87 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import shutil
+from collections import OrderedDict
+from threading import Lock
+
+from components.monitoring.performance_metrics import performance_metrics
+
+DEFAULT_MAX_MODELS = 128
+
+
+# Cache of the models discovered for the windows, keyed by the fingerprint of the window (VariantWindow)
+# Stable and recurring periods generate windows with the same variants, so their models are discovered once
+# The files of the models are also deduplicated: a model already saved in the same directory is copied from the
+# file of its first occurrence instead of being exported again. The files are remembered only during the run
+# (clear_files is called at the start of each run)
+# Both the models and the files are kept in LRU order, up to max_models entries
+class DiscoveryCache:
+    def __init__(self, max_models=DEFAULT_MAX_MODELS):
+        self.max_models = max_models
+        self.models = OrderedDict()
+        self.files = OrderedDict()
+        self.lock = Lock()
+
+    def add(self, entries, key, value):
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_models:
+            entries.popitem(last=False)
+
+    # return the model of the window, calling discover() only if it is not in the cache
+    # kind: type of the model (e.g., petri_net), models of different kinds have different entries
+    def get_model(self, kind, fingerprint, discover):
+        key = (kind, fingerprint)
+        with self.lock:
+            if key in self.models:
+                self.models.move_to_end(key)
+                performance_metrics.increment('discovery_cache_hits')
+                return self.models[key]
+        model = discover()
+        with self.lock:
+            self.add(self.models, key, model)
+        return model
+
+    # save the model in filename calling export(filename), or copy the file of the first occurrence of the model
+    # the exporters write the files in place, so the existing file is removed first (it may be a hard link created
+    # by a previous version, shared with the files of other windows)
+    def save_file(self, kind, fingerprint, filename, export):
+        key = (kind, fingerprint, os.path.dirname(os.path.abspath(filename)), os.path.splitext(filename)[1])
+        with self.lock:
+            first_filename = self.files.get(key)
+        if first_filename and os.path.abspath(first_filename) == os.path.abspath(filename) and \
+                os.path.exists(filename):
+            return
+        if os.path.exists(filename):
+            os.remove(filename)
+        if first_filename and os.path.exists(first_filename):
+            try:
+                shutil.copyfile(first_filename, filename)
+                performance_metrics.increment('deduplicated_models')
+                return
+            except OSError as e:
+                print(f'Error copying {first_filename} to {filename}: {e}')
+        export(filename)
+        with self.lock:
+            self.add(self.files, key, filename)
+
+    # forget the saved files, called at the start of each run (the files may be removed or changed between runs)
+    def clear_files(self):
+        with self.lock:
+            self.files.clear()
+
+
+# cache used by the discovery of all the approaches
+discovery_cache = DiscoveryCache()
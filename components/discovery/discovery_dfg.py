@@ -17,6 +17,10 @@ from pm4py.visualization.dfg import visualizer as dfg_visualization
 from pm4py.algo.filtering.dfg import dfg_filtering
 from components.dfg_definitions import DfgDefinitions
 from components.discovery.discovery import Discovery
+from components.discovery.discovery_cache import discovery_cache
+from components.discovery.variant_window import VariantWindow
+from components.monitoring.performance_metrics import performance_metrics, Stage
+from components.monitoring.tracer import tracer
 
 
 class DiscoveryDfg(Discovery):
@@ -27,7 +31,7 @@ class DiscoveryDfg(Discovery):
         self.model_type_definitions.set_current_parameters(current_parameters)
 
     # mine the DFG (directly-follows graph) from the sub-log
-    # defined by the windowing strategy
+    # defined by the windowing strategy (the traces or a VariantWindow)
     def generate_process_model(self, sub_log, models_path, event_data_original_name, w_count, activity='',
                                save_model_svg=False):
         # create the folder for saving the process map if does not exist
@@ -35,33 +39,54 @@ class DiscoveryDfg(Discovery):
         if not os.path.exists(models_path):
             os.makedirs(models_path)
 
-        # mine the DFG (using Pm4Py)
-        dfg, sa, ea = pm4py.discover_directly_follows_graph(sub_log)
+        window = w_count[activity] if activity and activity != '' else w_count
+        with tracer.span('generate_process_model', window=window, activity=activity, sub_log_size=len(sub_log)):
+            # mine the DFG (using Pm4Py)
+            with performance_metrics.measure(Stage.DISCOVERY):
+                fingerprint = None
+                if isinstance(sub_log, VariantWindow):
+                    # windows with the same variants reuse the DFG (and the files) of the first occurrence
+                    fingerprint = sub_log.get_fingerprint()
+                    dfg, sa, ea = discovery_cache.get_model('dfg', fingerprint, lambda: (
+                        sub_log.get_dfg(), sub_log.get_start_activities(), sub_log.get_end_activities()))
+                else:
+                    dfg, sa, ea = pm4py.discover_directly_follows_graph(sub_log)
 
-        # filter only 6% of paths - FOR UTFPR analysis
-        # percentual_paths = 0.006
-        # TODO - define a parameter
-        # percentual_paths = 1
-        # get the number of activities
-        # activities_dict = pm4py.get_event_attribute_values(sub_log, 'concept:name', case_id_key='case:concept:name')
-        # dfg, sa, ea, activities_count = dfg_filtering.filter_dfg_on_paths_percentage(dfg, sa, ea,
-        #                                                                              activities_dict, percentual_paths) # DMVS
+            # filter only 6% of paths - FOR UTFPR analysis
+            # percentual_paths = 0.006
+            # TODO - define a parameter
+            # percentual_paths = 1
+            # get the number of activities
+            # activities_dict = pm4py.get_event_attribute_values(sub_log, 'concept:name', case_id_key='case:concept:name')
+            # dfg, sa, ea, activities_count = dfg_filtering.filter_dfg_on_paths_percentage(dfg, sa, ea,
+            #                                                                              activities_dict, percentual_paths) # DMVS
 
-        # save the process model
-        if activity and activity != '':  # adaptive approach generates models per activity
-            output_filename = os.path.join(models_path, self.model_type_definitions.get_model_filename(event_data_original_name,
-                                                                             w_count[activity]))
-            output_filename_svg = os.path.join(models_path, self.model_type_definitions.get_model_filename_svg(w_count[activity]))
-        else:  # fixed approach generate the models based on the window size
-            output_filename = os.path.join(models_path, self.model_type_definitions.get_model_filename(event_data_original_name, w_count))
-            output_filename_svg = os.path.join(models_path, self.model_type_definitions.get_model_filename_svg(w_count))
+            # save the process model
+            if activity and activity != '':  # adaptive approach generates models per activity
+                output_filename = os.path.join(models_path, self.model_type_definitions.get_model_filename(event_data_original_name,
+                                                                                 w_count[activity]))
+                output_filename_svg = os.path.join(models_path, self.model_type_definitions.get_model_filename_svg(w_count[activity]))
+            else:  # fixed approach generate the models based on the window size
+                output_filename = os.path.join(models_path, self.model_type_definitions.get_model_filename(event_data_original_name, w_count))
+                output_filename_svg = os.path.join(models_path, self.model_type_definitions.get_model_filename_svg(w_count))
 
-        print(f'Saving {models_path} - {output_filename}')
-        pm4py.save_vis_dfg(dfg, sa, ea, output_filename, rankdir="TB")
+            print(f'Saving {models_path} - {output_filename}')
+            with performance_metrics.measure(Stage.RENDERING):
+                self.save_dfg(dfg, sa, ea, output_filename, fingerprint)
 
-        if save_model_svg:
-            print(f'Saving {models_path} - {output_filename} - SVG format')
-            # TODO define a parameter for choose betwee performance or frequency DFG
-            # pm4py.save_vis_performance_dfg(dfg, sa, ea, output_filename_svg)
-            pm4py.save_vis_dfg(dfg, sa, ea, output_filename_svg, rankdir="TB")
+                if save_model_svg:
+                    print(f'Saving {models_path} - {output_filename} - SVG format')
+                    # TODO define a parameter for choose betwee performance or frequency DFG
+                    # pm4py.save_vis_performance_dfg(dfg, sa, ea, output_filename_svg)
+                    self.save_dfg(dfg, sa, ea, output_filename_svg, fingerprint)
         return dfg
+
+    @staticmethod
+    def save_dfg(dfg, sa, ea, filename, fingerprint=None):
+        def export(output_filename):
+            pm4py.save_vis_dfg(dfg, sa, ea, output_filename, rankdir="TB")
+
+        if fingerprint:
+            discovery_cache.save_file('dfg', fingerprint, filename, export)
+        else:
+            export(filename)
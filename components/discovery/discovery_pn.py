@@ -16,6 +16,8 @@ import os
 from graphviz import Source
 from pm4py.algo.discovery.inductive import algorithm as inductive_miner
 from components.discovery.discovery import Discovery
+from components.monitoring.performance_metrics import performance_metrics, Stage
+from components.monitoring.tracer import tracer
 from components.pn_definitions import PnDefinitions, PNModel
 from pm4py.visualization.petri_net import visualizer as pn_visualizer
 
@@ -35,13 +37,17 @@ class DiscoveryPn(Discovery):
         if not os.path.exists(models_path):
             os.makedirs(models_path)
 
-        # mine the petri net (using Pm4Py - Inductive Miner)
-        net, initial_marking, final_marking = inductive_miner.apply(sub_log)
-        gviz = pn_visualizer.apply(net, initial_marking, final_marking)
+        with tracer.span('generate_process_model', window=w_count, activity=activity, sub_log_size=len(sub_log)):
+            # mine the petri net (using Pm4Py - Inductive Miner)
+            with performance_metrics.measure(Stage.DISCOVERY):
+                net, initial_marking, final_marking = inductive_miner.apply(sub_log)
 
-        # save the process model
-        output_filename = self.model_type_definitions.get_model_filename(event_data_original_name, w_count)
-        print(f'Saving {models_path} - {output_filename}')
-        Source.save(gviz, filename=output_filename, directory=models_path)
+            with performance_metrics.measure(Stage.RENDERING):
+                gviz = pn_visualizer.apply(net, initial_marking, final_marking)
+
+                # save the process model
+                output_filename = self.model_type_definitions.get_model_filename(event_data_original_name, w_count)
+                print(f'Saving {models_path} - {output_filename}')
+                Source.save(gviz, filename=output_filename, directory=models_path)
         return PNModel(net, initial_marking, final_marking)
 
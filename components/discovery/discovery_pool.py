@@ -0,0 +1,93 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+from components.monitoring.performance_metrics import performance_metrics, Stage
+from components.monitoring.profiler import get_worker_profile, run_profiled
+from components.monitoring.tracer import tracer, run_traced
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+# mine (and save) the model of one window in a worker process
+# return the model and the time spent (in seconds), the performance metrics of the worker are not
+# shared with the main process
+def discover_window_model(discovery, sub_log, models_path, logname, window, save_model_svg):
+    start = time.perf_counter()
+    model = discovery.generate_process_model(sub_log, models_path, logname, window, '', save_model_svg)
+    return model, time.perf_counter() - start
+
+
+# Pool of processes that mines the models of the windows defined by the fixed approach and the candidate models
+# of the speculative discovery
+# As the plot render service, the pool uses spawn and it is created in the first submit, so it is reused
+# by the next runs of IPDD (e.g., ipdd_massive)
+class DiscoveryPool:
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self.workers = workers
+        self.executor = None
+        self.lock = Lock()
+
+    # change the number of processes, the current pool is finished
+    def set_workers(self, workers):
+        if workers != self.workers:
+            self.shutdown()
+            self.workers = workers
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                    mp_context=multiprocessing.get_context('spawn'))
+            return self.executor
+
+    def submit(self, discovery, sub_log, models_path, logname, window, save_model_svg):
+        return self.submit_discovery(discover_window_model, discovery, sub_log, models_path, logname, window,
+                                     save_model_svg)
+
+    # run discover(*args) in a worker process, discover is a module function (pickled by the spawn context) that
+    # returns the model and the time spent (in seconds)
+    def submit_discovery(self, discover, *args):
+        future = self.get_executor().submit(run_traced, tracer.get_worker_trace(), run_profiled, get_worker_profile(),
+                                            discover, *args)
+        future.add_done_callback(self.discovery_done)
+        return future
+
+    @staticmethod
+    def discovery_done(future):
+        # the speculative discovery cancels the candidates not started
+        if not future.cancelled() and future.exception() is None:
+            (model, seconds), events = future.result()
+            performance_metrics.observe(Stage.DISCOVERY, seconds)
+            tracer.add_worker_events(events)
+
+    # model and time spent of a submitted discovery (the spans of the worker are added to the trace when it finishes)
+    @staticmethod
+    def get_result(future):
+        result, events = future.result()
+        return result
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor:
+                self.executor.shutdown()
+                self.executor = None
+
+
+# pool used by the fixed approach and the speculative discovery
+discovery_pool = DiscoveryPool()
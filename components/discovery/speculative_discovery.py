@@ -0,0 +1,107 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import time
+
+from components.discovery.discovery_backends import discover_petri_net_with_backend
+from components.discovery.discovery_pool import discovery_pool
+from components.discovery.variant_window import VariantWindow
+from components.monitoring.performance_metrics import performance_metrics
+from components.parameters import DiscoveryBackend
+
+
+# discover the Petri net of a candidate in a worker process of the discovery pool
+# return the model and the time spent (in seconds)
+def discover_candidate_model(variants, backend=DiscoveryBackend.INDUCTIVE.name):
+    start = time.perf_counter()
+    model = discover_petri_net_with_backend(VariantWindow(variants), backend)
+    return model, time.perf_counter() - start
+
+
+# model discovered in background using the traces [begin, end)
+class SpeculativeCandidate:
+    def __init__(self, begin, end, future):
+        self.begin = begin
+        self.end = end
+        self.future = future
+
+    def done(self):
+        return self.future.done()
+
+    # wait for the discovery if the model is not ready, return the Petri net (net, im, fm)
+    def result(self):
+        model, seconds = discovery_pool.get_result(self.future)
+        return model
+
+
+# Discovery of a candidate model in background, started when a detector reports a warning
+# When the drift is confirmed the candidate is taken by the trace-by-trace approach, so the detection does not
+# wait for the discovery of the new model
+# The candidates are discovered by the processes of the discovery pool (as the windows of the fixed approach). A
+# running discovery cannot be cancelled, so when the warning finishes without a drift it is abandoned (it finishes
+# in background) and it does not delay the next candidates
+# The candidate uses the traces since the warning, while without speculative discovery the new model uses the
+# traces since the drift. A candidate started more than max_offset traces before the drift is discarded and the
+# model is discovered using the traces since the drift, so with max_offset=0 the drifts are the same detected
+# without speculative discovery
+# variants: variants of the traces of the log
+# backend: algorithm used for the discovery (DiscoveryBackend)
+# max_abandoned: abandoned discoveries still running, above it no new candidate is started on warnings
+# max_offset: traces between the beginning of the candidate and the drift, above it the candidate is discarded
+class SpeculativeDiscovery:
+    def __init__(self, variants, backend=DiscoveryBackend.INDUCTIVE.name, max_abandoned=2, max_offset=0):
+        self.variants = variants
+        self.backend = backend
+        self.max_abandoned = max_abandoned
+        self.max_offset = max_offset
+        self.candidate = None
+        self.abandoned = []
+
+    def submit(self, begin, end):
+        future = discovery_pool.submit_discovery(discover_candidate_model, self.variants[begin:end], self.backend)
+        return SpeculativeCandidate(begin, end, future)
+
+    # start discovering a candidate with the traces [begin, end), if there is no candidate yet
+    def start(self, begin, end):
+        if self.candidate is None:
+            self.abandoned = [future for future in self.abandoned if not future.done()]
+            if len(self.abandoned) >= self.max_abandoned:
+                performance_metrics.increment('skipped_speculative_discoveries')
+                return
+            self.candidate = self.submit(begin, end)
+            performance_metrics.increment('speculative_discoveries')
+
+    # the warning finished without a drift
+    def discard(self):
+        if self.candidate:
+            if self.candidate.future.cancel():
+                performance_metrics.increment('discarded_speculative_discoveries')
+            else:
+                # already running, the result is ignored
+                self.abandoned.append(self.candidate.future)
+                performance_metrics.increment('abandoned_speculative_discoveries')
+            self.candidate = None
+
+    # return the current candidate (a drift was detected) or a new one with the traces [begin, end) when there
+    # was no warning before the drift or the candidate started more than max_offset traces before the drift
+    def take(self, begin, end):
+        if self.candidate and begin - self.candidate.begin <= self.max_offset:
+            candidate = self.candidate
+            self.candidate = None
+            performance_metrics.increment('adopted_speculative_discoveries')
+            return candidate
+        self.discard()
+        return self.submit(begin, end)
+
+    def shutdown(self):
+        self.discard()
@@ -0,0 +1,112 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+import json
+from collections import Counter
+
+from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureUVCL
+from pm4py.algo.discovery.inductive.variants.im import IMUVCL
+from pm4py.convert import convert_to_petri_net
+from pm4py.util import constants
+
+
+# activities of the trace (variant) as a tuple
+def get_variant(trace, activity_key='concept:name'):
+    return tuple(event[activity_key] for event in trace)
+
+
+# Window represented by the multiplicity of its variants
+# Besides the variants, the window keeps the frequency of the activities, directly-follows relations, start and
+# end activities, so adding or removing a trace (e.g., when a sliding window moves) only updates the counts
+# of its variant, and the discovery and metrics work over the distinct variants instead of the traces
+# The relations of each variant are calculated once and they can be shared by the windows of the same log
+class VariantWindow:
+    def __init__(self, variants=(), variant_relations=None):
+        self.variants = Counter()
+        self.activities = Counter()
+        self.edges = Counter()
+        self.start_activities = Counter()
+        self.end_activities = Counter()
+        self.variant_relations = variant_relations if variant_relations is not None else {}
+        self.fingerprint = None
+        for variant in variants:
+            self.add_trace(variant)
+
+    def __len__(self):
+        return sum(self.variants.values())
+
+    def get_relations(self, variant):
+        if variant not in self.variant_relations:
+            self.variant_relations[variant] = (Counter(variant), Counter(zip(variant, variant[1:])),
+                                               Counter(variant[:1]), Counter(variant[-1:]))
+        return self.variant_relations[variant]
+
+    def add_trace(self, variant):
+        self.fingerprint = None
+        self.variants[variant] += 1
+        for counter, values in zip(self.get_counters(), self.get_relations(variant)):
+            counter.update(values)
+
+    def remove_trace(self, variant):
+        self.fingerprint = None
+        self.subtract(self.variants, {variant: 1})
+        for counter, values in zip(self.get_counters(), self.get_relations(variant)):
+            self.subtract(counter, values)
+
+    def get_counters(self):
+        return self.activities, self.edges, self.start_activities, self.end_activities
+
+    # remove the counts and the keys without frequency, so the keys are always the ones present in the window
+    @staticmethod
+    def subtract(counter, values):
+        for key, value in values.items():
+            counter[key] -= value
+            if counter[key] <= 0:
+                del counter[key]
+
+    # hash of the multiset of variants, windows with the same variants and frequencies have the same fingerprint
+    def get_fingerprint(self):
+        if self.fingerprint is None:
+            content = json.dumps(sorted(self.variants.items()))
+            self.fingerprint = hashlib.sha256(content.encode()).hexdigest()
+        return self.fingerprint
+
+    # DFG in the format returned by pm4py (relation -> frequency)
+    def get_dfg(self):
+        return dict(self.edges)
+
+    def get_start_activities(self):
+        return dict(self.start_activities)
+
+    def get_end_activities(self):
+        return dict(self.end_activities)
+
+    def get_activities(self):
+        return set(self.activities)
+
+    # directly-follows relations present in the window
+    def get_relations_set(self):
+        return set(self.edges)
+
+
+# process tree discovered with the Inductive Miner (no noise threshold) using the variants of the window,
+# same model discovered by pm4py.discover_process_tree_inductive from the traces of the window
+def discover_process_tree_from_variants(window):
+    parameters = {'noise_threshold': 0.0, 'multiprocessing': constants.ENABLE_MULTIPROCESSING_DEFAULT,
+                  'disable_fallthroughs': False}
+    return IMUVCL(parameters).apply(IMDataStructureUVCL(Counter(window.variants)), parameters)
+
+
+def discover_petri_net_from_variants(window):
+    return convert_to_petri_net(discover_process_tree_from_variants(window))
@@ -0,0 +1,51 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+# Compact information about a window, calculated once when the window is discovered and used by the similarity
+# metrics instead of the sub-log, so the sub-log can be released after the discovery
+# activities: number of events of each activity
+# dfg, start_activities, end_activities: same format returned by pm4py.discover_directly_follows_graph
+# initial_timestamp, final_timestamp: time span of the window (first event of the first trace and last event of
+# the last trace)
+# cases: number of traces
+class WindowSummary:
+    def __init__(self, activities, dfg, start_activities, end_activities, initial_timestamp, final_timestamp,
+                 cases):
+        self.activities = activities
+        self.dfg = dfg
+        self.start_activities = start_activities
+        self.end_activities = end_activities
+        self.initial_timestamp = initial_timestamp
+        self.final_timestamp = final_timestamp
+        self.cases = cases
+
+    # summary of a VariantWindow
+    @staticmethod
+    def from_variant_window(window, initial_timestamp=None, final_timestamp=None):
+        return WindowSummary(dict(window.activities), window.get_dfg(), window.get_start_activities(),
+                             window.get_end_activities(), initial_timestamp, final_timestamp, len(window))
+
+    def get_activities(self):
+        return set(self.activities)
+
+    def get_time_span(self):
+        return self.initial_timestamp, self.final_timestamp
+
+    # distance between the frequencies of the directly-follows relations (per trace) of two windows
+    # the similarity metrics only compare the relations, so this distance is used for ranking the dissimilar windows
+    def get_dfg_distance(self, other):
+        edges = set(self.dfg) | set(other.dfg)
+        return sum(abs(self.dfg.get(e, 0) / max(self.cases, 1) - other.dfg.get(e, 0) / max(other.cases, 1))
+                   for e in edges)
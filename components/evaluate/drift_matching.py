@@ -0,0 +1,83 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import numpy as np
+
+
+# Matching between real and detected drifts for a grid of results (e.g., configurations x logs)
+# Each element of the grid is a pair of lists (real drifts, detected drifts) and the number of items
+# (traces or events). A detected drift is a TRUE POSITIVE when there is a real drift not matched yet before
+# (or at) it, and it is matched with the closest one; the older real drifts between the previous detected drift
+# and the matched one are FALSE NEGATIVES, as the real drifts after the last detected drift
+# All the elements of the grid are matched at once: the drifts are placed in a single sorted sequence
+# (grid index * span + drift) and the real drifts of each detected one are found with np.searchsorted
+class DriftMatching:
+    def __init__(self, real_drifts, detected_drifts, items):
+        self.size = len(real_drifts)
+        self.items = np.asarray(items, dtype=np.int64)
+        real_count = np.array([len(r) for r in real_drifts], dtype=np.int64)
+        detected_count = np.array([len(d) for d in detected_drifts], dtype=np.int64)
+        real = np.concatenate([np.asarray(r, dtype=np.int64) for r in real_drifts] + [np.empty(0, dtype=np.int64)])
+        detected = np.concatenate([np.asarray(d, dtype=np.int64) for d in detected_drifts] +
+                                  [np.empty(0, dtype=np.int64)])
+        real_grid = np.repeat(np.arange(self.size, dtype=np.int64), real_count)
+        detected_grid = np.repeat(np.arange(self.size, dtype=np.int64), detected_count)
+
+        # keys of the single sorted sequence, the drifts are shifted to start from 0
+        values = np.concatenate([real, detected])
+        minimum = values.min() if len(values) > 0 else 0
+        span = values.max() - minimum + 2 if len(values) > 0 else 1
+        real_keys = np.sort(real_grid * span + real - minimum)
+        detected_keys = np.sort(detected_grid * span + detected - minimum)
+
+        # real drifts of each detected drift: after the previous detected drift of the same grid element
+        # (or the beginning of the element), up to the detected drift
+        upper = np.searchsorted(real_keys, detected_keys, side='right')
+        lower = np.searchsorted(real_keys, detected_grid * span, side='left')
+        same_element = np.zeros(len(detected_keys), dtype=bool)
+        same_element[1:] = detected_grid[1:] == detected_grid[:-1]
+        lower[1:] = np.where(same_element[1:], upper[:-1], lower[1:])
+        matched = upper > lower
+        delays = np.zeros(len(detected_keys), dtype=np.int64)
+        delays[matched] = detected_keys[matched] - real_keys[upper[matched] - 1]
+
+        # basic metrics of each grid element
+        self.tp = np.bincount(detected_grid, weights=matched, minlength=self.size).astype(np.int64)
+        self.fp = detected_count - self.tp
+        self.fn = real_count - self.tp
+        self.tn = self.items - self.tp - self.fp - self.fn
+        self.total_distance = np.bincount(detected_grid, weights=delays, minlength=self.size).astype(np.int64)
+
+    @staticmethod
+    def ratio(numerator, denominator):
+        numerator = np.asarray(numerator, dtype=float)
+        denominator = np.asarray(denominator, dtype=float)
+        return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+    def precision(self):
+        return self.ratio(self.tp, self.tp + self.fp)
+
+    def recall(self):
+        return self.ratio(self.tp, self.tp + self.fn)
+
+    def f_score(self):
+        precision = self.precision()
+        recall = self.recall()
+        return self.ratio(2 * precision * recall, precision + recall)
+
+    # false positive rate
+    def fpr(self):
+        return self.ratio(self.fp, self.fp + self.tn)
+
+    def mean_delay(self):
+        return self.ratio(self.total_distance, self.tp)
@@ -14,6 +14,7 @@
 import os
 from enum import Enum
 
+from components.evaluate.drift_matching import DriftMatching
 from components.evaluate.evaluation_metric_info import EvaluationMetricInfo
 from components.parameters import Approach, AdaptivePerspective
 
@@ -43,43 +44,12 @@ class EvaluationMetric:
 
     # count the basic metrics TP, FP, FN, and TN
     def calculate_basic_metrics(self):
-        real_drifts = self.real_drifts.copy()
-        # sort the both lists (real and detected drifts)
-        real_drifts.sort()
-        self.detected_drifts.sort()
-
-        # create lists to store the tp's and fp's
-        tp_list = []
-        fp_list = []
-        fn_list = []
-        self.total_distance = 0
-        for i, detected_cp in enumerate(self.detected_drifts):
-            possible_real_drifts = [cp for cp in real_drifts if detected_cp >= cp]
-            possible_real_drifts.sort(reverse=True)
-            if len(possible_real_drifts) > 0:
-                detected_real_cp = possible_real_drifts[0]
-                # the mean delay considers the distance between the real change point and the reported change point
-                delay = detected_cp - detected_real_cp
-                self.total_distance += delay
-
-                tp_list.append(detected_cp)
-                real_drifts.remove(detected_real_cp)
-                possible_real_drifts.remove(detected_real_cp)
-                # if other possible real drifts are not detected they are FALSE NEGATIVES
-                for rp in possible_real_drifts:
-                    fn_list.append(rp)
-                    real_drifts.remove(rp)
-            else:
-                fp_list.append(detected_cp)
-
-        # the remaining real drifts are also FALSE NEGATIVES
-        for d in real_drifts:
-            fn_list.append(d)
-
-        self.tp = len(tp_list)
-        self.fp = len(fp_list)
-        self.fn = len(fn_list)
-        self.tn = self.number_of_items - self.tp - self.fp - self.fn
+        matching = DriftMatching([self.real_drifts], [self.detected_drifts], [self.number_of_items])
+        self.tp = int(matching.tp[0])
+        self.fp = int(matching.fp[0])
+        self.fn = int(matching.fn[0])
+        self.tn = int(matching.tn[0])
+        self.total_distance = int(matching.total_distance[0])
 
     def calculate(self):
         pass
@@ -214,10 +184,12 @@ class ManageEvaluationMetrics:
         metrics_info = []
         metrics_summary = {}
         print(f'Calculating metric real drifts {real_drifts} - detected drifts {detected_drifts} - total of traces {items}')
+        # the drifts are matched once and all the selected metrics are derived from the basic metrics
+        values = ManageEvaluationMetrics.calculate_evaluation_metrics_grid(self.metrics_list, [real_drifts],
+                                                                           [detected_drifts], [items])
         for metric_name in self.metrics_list:
-            metric = ManageEvaluationMetrics.evaluation_metrics_factory(metric_name, real_drifts,
-                                                                        detected_drifts, items)
-            value = metric.calculate()
+            value = ManageEvaluationMetrics.get_metric_value(metric_name, values[metric_name][0], real_drifts,
+                                                             detected_drifts)
             metric_info = EvaluationMetricInfo(metric_name, real_drifts, detected_drifts, value)
             if activity:  # used when the user selected the ADAPTIVE approach
                 metric_info.add_attribute('activity', activity)
@@ -226,6 +198,39 @@ class ManageEvaluationMetrics:
         self.save_metrics(metrics_info)
         return metrics_summary
 
+    # value of the metric as returned by the metric classes, which return the integer 0 when the metric has no
+    # value (e.g., precision without detected drifts or mean delay without delay)
+    @staticmethod
+    def get_metric_value(metric_name, value, real_drifts, detected_drifts):
+        value = float(value)
+        if metric_name == EvaluationMetricList.PRECISION.value:
+            undefined = len(detected_drifts) == 0
+        elif metric_name == EvaluationMetricList.RECALL.value:
+            undefined = len(real_drifts) == 0
+        elif metric_name == EvaluationMetricList.FPR.value:
+            undefined = False
+        else:
+            undefined = value == 0
+        if undefined:
+            return 0
+        return value
+
+    # calculate the metrics for a grid of results (e.g., configurations x logs) with a single matching
+    # real_drifts, detected_drifts, and items are aligned lists, one element for each result
+    # return a dictionary with the array of values of each metric
+    @staticmethod
+    def calculate_evaluation_metrics_grid(metrics_list, real_drifts, detected_drifts, items):
+        matching = DriftMatching(real_drifts, detected_drifts, items)
+        # define all implemented evaluation metrics
+        calculations = {
+            EvaluationMetricList.F_SCORE.value: matching.f_score,
+            EvaluationMetricList.PRECISION.value: matching.precision,
+            EvaluationMetricList.RECALL.value: matching.recall,
+            EvaluationMetricList.FPR.value: matching.fpr,
+            EvaluationMetricList.MEAN_DELAY.value: matching.mean_delay,
+        }
+        return {metric_name: calculations[metric_name]() for metric_name in metrics_list}
+
     @staticmethod
     def evaluation_metrics_factory(metric_name, real_drifts, detected_drifts, items):
         # define all implemented evaluation metrics
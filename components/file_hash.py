@@ -0,0 +1,36 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+import os
+from threading import Lock
+
+# sha256 of the file content, calculated once for each file (path, size and modification time)
+file_hashes = {}
+file_hashes_lock = Lock()
+
+
+# used by the caches (signals and scenarios) for identifying the event logs by their content
+def get_file_sha256(filename):
+    stat = os.stat(filename)
+    key = (os.path.abspath(filename), stat.st_size, stat.st_mtime_ns)
+    with file_hashes_lock:
+        if key in file_hashes:
+            return file_hashes[key]
+    sha256 = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            sha256.update(block)
+    with file_hashes_lock:
+        file_hashes[key] = sha256.hexdigest()
+    return file_hashes[key]
@@ -18,12 +18,13 @@ from enum import Enum
 from pm4py.objects.log.util import interval_lifecycle
 
 from components.adaptive.detectors import ConceptDriftDetector, SelectDetector
-from components.apply_window import AnalyzeDrift
+from components.apply_window import AnalyzeDrift, check_quality_metrics
 from components.dfg_definitions import DfgDefinitions
+from components.discovery.discovery_cache import discovery_cache
 from components.discovery.discovery_dfg import DiscoveryDfg
 from components.evaluate.manage_evaluation_metrics import ManageEvaluationMetrics, EvaluationMetricList
 from components.parameters import Approach, ReadLogAs, AdaptivePerspective, Paths, \
-    AttributeAdaptive
+    AttributeAdaptive, OutputFormat, FixedWindowType, DiscoveryBackend, WindowUnityFixed
 from components.pn_definitions import PnDefinitions
 from components.discovery.discovery_pn import DiscoveryPn
 from threading import Thread
@@ -32,6 +33,12 @@ from pm4py.objects.conversion.log import converter as log_converter
 from pm4py.objects.log.importer.xes import importer as xes_importer
 from pm4py.objects.log.obj import EventLog
 from components.log_info import LogInfo
+from components.monitoring.performance_metrics import performance_metrics, Stage
+from components.monitoring.tracer import tracer
+from components.monitoring.memory import memory_accounting
+from components.artifact_writer import artifact_writer
+from components.adaptive.attribute_series import AttributeRetention
+from components.plot_render import plot_render_service
 
 
 def threaded(fn):
@@ -117,7 +124,8 @@ class Control:
 
 
 class IPDDParameters:
-    def __init__(self, logname, approach, read_log_as, metrics, save_sublogs, save_model_svg):
+    def __init__(self, logname, approach, read_log_as, metrics, save_sublogs, save_model_svg, trace=False,
+                 memory_accounting=False, output_formats=None):
         self.logname = logname
         self.approach = approach
         self.read_log_as = read_log_as
@@ -125,6 +133,12 @@ class IPDDParameters:
         self.session_id = None
         self.save_sublogs = save_sublogs  # for saving the generated sub-logs used by the windowing strategy
         self.save_model_svg = save_model_svg  # for saving the DFG model as vectorial figure
+        self.trace = trace  # for saving the spans of each window using the Chrome trace format
+        self.memory_accounting = memory_accounting  # for saving the memory used by each stage (slower)
+        # formats of the time series and plots generated by the adaptive approaches (default all)
+        self.output_formats = output_formats
+        if self.output_formats is None:
+            self.output_formats = [f.name for f in OutputFormat]
 
     def print(self):
         print(f'----- IPDD general parameters -----')
@@ -136,23 +150,46 @@ class IPDDParameters:
 
 class IPDDParametersFixed(IPDDParameters):
     def __init__(self, logname, approach, read_log_as, metrics, winunity, winsize, save_sublogs=False,
-                 save_model_svg=False):
-        super().__init__(logname, approach, read_log_as, metrics, save_sublogs, save_model_svg)
+                 save_model_svg=False, trace=False, memory_accounting=False, output_formats=None,
+                 discovery_workers=0, window_type=FixedWindowType.TUMBLING.name, stride=1):
+        super().__init__(logname, approach, read_log_as, metrics, save_sublogs, save_model_svg, trace,
+                         memory_accounting, output_formats)
         self.win_unity = winunity
         self.win_size = winsize
+        # tumbling or sliding windows, the sliding windows move stride traces at each step
+        self.window_type = window_type
+        self.stride = stride
+        if window_type == FixedWindowType.SLIDING.name:
+            # the sliding windows are built from the variants of the traces, with win_size traces each
+            if read_log_as != ReadLogAs.TRACE.name or winunity != WindowUnityFixed.UNITY.name:
+                raise ValueError(f'Sliding windows require reading the log as {ReadLogAs.TRACE.name} with window '
+                                 f'unity {WindowUnityFixed.UNITY.name}, got {read_log_as} and {winunity}')
+            if stride < 1:
+                raise ValueError(f'The stride of the sliding windows must be at least 1, got {stride}')
+        # processes used for mining the models of the windows (0 mines them one by one in the IPDD thread)
+        self.discovery_workers = discovery_workers
 
     def print(self):
         super().print()
         print(f'----- IPDD fixed window for control-flow drifts - parameters -----')
         print(f'Read log as: {self.win_unity}')
         print(f'Window size: {self.win_size}')
+        print(f'Window type: {self.window_type}')
+        if self.window_type == FixedWindowType.SLIDING.name:
+            print(f'Stride: {self.stride}')
+        if self.discovery_workers:
+            print(f'Discovery workers: {self.discovery_workers}')
 
 
 class IPDDParametersAdaptive(IPDDParameters):
     def __init__(self, logname, approach, perspective, read_log_as, metrics, detector_class, attribute,
                  attribute_name=None, activities=[], save_sublogs=False, save_model_svg=False,
-                 update_model=True, attribute_name_for_plot=None, activities_for_plot=None, real_drifts_for_plot=None):
-        super().__init__(logname, approach, read_log_as, metrics, save_sublogs, save_model_svg)
+                 update_model=True, attribute_name_for_plot=None, activities_for_plot=None, real_drifts_for_plot=None,
+                 trace=False, memory_accounting=False, output_formats=None,
+                 attribute_retention=AttributeRetention.KEEP_ALL.name, attribute_max_values=None,
+                 min_activity_support=0):
+        super().__init__(logname, approach, read_log_as, metrics, save_sublogs, save_model_svg, trace,
+                         memory_accounting, output_formats)
         self.perspective = perspective
         self.attribute = attribute
         self.attribute_name = attribute_name
@@ -163,6 +200,11 @@ class IPDDParametersAdaptive(IPDDParameters):
         self.update_model = update_model
         self.detector_class = detector_class
         self.real_drifts_for_plot = real_drifts_for_plot
+        # retention of the attribute values kept for the plots (KEEP_ALL, RING_BUFFER or SPILL)
+        self.attribute_retention = attribute_retention
+        self.attribute_max_values = attribute_max_values
+        # activities with less events are not analyzed (no detector, plots or files)
+        self.min_activity_support = min_activity_support
 
     def print(self):
         super().print()
@@ -171,6 +213,8 @@ class IPDDParametersAdaptive(IPDDParameters):
         print(f'Attribute name: {self.attribute_name}')
         print(f'Attribute: {self.attribute}')
         print(f'Activities: {self.activities}')
+        if self.min_activity_support:
+            print(f'Minimum activity support: {self.min_activity_support}')
         print(f'Detector: {self.detector_class.get_name()}')
         for key in self.detector_class.parameters:
             print(f'{key}: {self.detector_class.parameters[key]}')
@@ -179,14 +223,24 @@ class IPDDParametersAdaptive(IPDDParameters):
 class IPDDParametersAdaptiveControlflow(IPDDParameters):
     def __init__(self, logname, approach, perspective, read_log_as, win_size, metrics,
                  adaptive_controlflow_approach, detector_class, save_sublogs=False, save_model_svg=False,
-                 update_model=True):
+                 update_model=True, trace=False, memory_accounting=False, output_formats=None,
+                 discovery_backend=DiscoveryBackend.INDUCTIVE.name, quality_metrics=None,
+                 speculative_discovery=False):
         super().__init__(logname=logname, approach=approach, read_log_as=read_log_as,
-                         metrics=metrics, save_sublogs=save_sublogs, save_model_svg=save_model_svg)
+                         metrics=metrics, save_sublogs=save_sublogs, save_model_svg=save_model_svg, trace=trace,
+                         memory_accounting=memory_accounting, output_formats=output_formats)
         self.win_size = win_size
         self.perspective = perspective
         self.adaptive_controlflow_approach = adaptive_controlflow_approach
         self.update_model = update_model
         self.detector_class = detector_class
+        # algorithm for discovering the Petri nets (DiscoveryBackend)
+        self.discovery_backend = discovery_backend
+        # quality metrics (QualityMetric values) replacing the default metric of their quality dimension
+        check_quality_metrics(adaptive_controlflow_approach, quality_metrics)
+        self.quality_metrics = quality_metrics
+        # discover the candidate model in background when a detector reports a warning (trace by trace approach)
+        self.speculative_discovery = speculative_discovery
 
     def print(self):
         super().print()
@@ -194,6 +248,11 @@ class IPDDParametersAdaptiveControlflow(IPDDParameters):
         print(f'Perspective: {self.perspective}')
         print(f'Approach: {self.adaptive_controlflow_approach}')
         print(f'Window size: {self.win_size}')
+        print(f'Discovery backend: {self.discovery_backend}')
+        if self.quality_metrics:
+            print(f'Quality metrics: {self.quality_metrics}')
+        if self.speculative_discovery:
+            print(f'Speculative discovery: {self.speculative_discovery}')
         print(f'Detector: {self.detector_class.get_name()}')
         for key in self.detector_class.parameters:
             print(f'{key}: {self.detector_class.parameters[key]}')
@@ -264,6 +323,8 @@ class InteractiveProcessDriftDetectionFW(metaclass=SingletonMeta):
         self.logs_path = Paths.SUBLOGS_PATH
         self.adaptive_path = Paths.ADAPTIVE_PATH
         self.evaluation_path = Paths.EVALUATION_PATH
+        self.performance_path = Paths.PERFORMANCE_PATH
+        self.profile_path = Paths.PROFILE_PATH
 
     def check_user_path(self, generic_path, user_id, output=True):
         if output:
@@ -346,6 +407,13 @@ class InteractiveProcessDriftDetectionFW(metaclass=SingletonMeta):
     def get_adaptive_path(self, user_id):
         return self.check_user_path(self.adaptive_path, user_id)
 
+    def get_performance_path(self, user_id):
+        return self.check_user_path(self.performance_path, user_id)
+
+    # profiles are saved next to the evaluation outputs
+    def get_profile_path(self, user_id):
+        return self.check_user_path(os.path.join(self.evaluation_path, self.profile_path), user_id)
+
     def get_adaptive_detector_path(self, user_id):
         path = os.path.join(self.adaptive_path, self.current_parameters.logname)
         if self.current_parameters.perspective == AdaptivePerspective.TIME_DATA.name:
@@ -408,6 +476,10 @@ class InteractiveProcessDriftDetectionFW(metaclass=SingletonMeta):
         return self.check_user_path(path, user_id)
 
     def import_log(self, complete_filename, filename):
+        with performance_metrics.measure(Stage.IMPORT):
+            self.import_xes_log(complete_filename, filename)
+
+    def import_xes_log(self, complete_filename, filename):
         # import the chosen event log and calculate some statistics
         self.current_log = LogInfo(complete_filename, filename)
         if '.xes' in complete_filename:
@@ -467,6 +539,20 @@ class InteractiveProcessDriftDetectionFW(metaclass=SingletonMeta):
     def run(self, parameters, user_id='script'):
         # reset information about windows
         self.initial_indexes = None
+        # reset the performance metrics collected in previous runs
+        performance_metrics.reset()
+        # the model files saved by previous runs are not reused
+        discovery_cache.clear_files()
+        # the tracer is only enabled when requested, because it records one span for each window
+        if parameters.trace:
+            tracer.enable()
+        else:
+            tracer.disable()
+        if getattr(parameters, 'memory_accounting', False):
+            memory_accounting.start()
+            memory_accounting.checkpoint('start')
+        else:
+            memory_accounting.stop()
         # set the parameters selected for the current run
         self.current_parameters = parameters
         self.discovery.set_current_parameters(parameters)
@@ -498,6 +584,8 @@ class InteractiveProcessDriftDetectionFW(metaclass=SingletonMeta):
             print(f'Importing event log: {self.current_parameters.logname}')
             self.import_log(complete_filename, self.current_parameters.logname)
 
+        memory_accounting.checkpoint('import', {'event_log': self.current_log.log} if self.current_log else None)
+
         # if metrics not defined, use default metrics for process model
         if not self.current_parameters.metrics:
             self.current_parameters.metrics = self.model_type_definitions.get_default_metrics()
@@ -540,17 +628,80 @@ class InteractiveProcessDriftDetectionFW(metaclass=SingletonMeta):
                                     self.get_similarity_metrics_path(user_id), outputpath_adaptive_sublogs,
                                     self.current_log, self.discovery, user_id,
                                     outputpath_adaptive_detector, outputpath_adaptive_detector_models)
+        # in the EVENT mode the log is converted to a sorted dataframe when creating the AnalyzeDrift
+        memory_accounting.checkpoint('prepare_event_data', {'event_data': self.analyze.event_data})
         self.total_of_windows, self.initial_indexes, self.all_activities, self.initial_event_ids = self.analyze.start_drift_analysis()
         if self.current_parameters.approach == Approach.ADAPTIVE.name and \
                 self.current_parameters.perspective == AdaptivePerspective.TIME_DATA.name:
             self.activities = list(i for i in self.initial_indexes.keys() if len(self.initial_indexes[i].keys()) > 1)
             print(f'Setting the activities with drifts: {self.activities}')
 
+        # the run is only finished after writing all the artifacts (time series and plots)
+        artifact_writer.drain()
+        plot_render_service.wait()
         self.control.finish_mining_calculation()
         print(f'*** Initial indexes for generated windows: {self.initial_indexes}')
         print(f'*** Number of windows: [{self.total_of_windows}]')
+        memory_accounting.checkpoint('finish_mining_calculation')
+        self.save_performance_metrics(user_id)
+        self.save_trace(user_id)
+        self.save_memory_accounting(user_id)
         return self.total_of_windows
 
+    # export the counts and latency histograms collected for each stage (JSON and Prometheus text format)
+    # called at the end of each run, but can be called at any time for getting the current values
+    def save_performance_metrics(self, user_id=None):
+        if user_id is None:
+            user_id = self.user_id
+        return performance_metrics.save(self.get_performance_path(user_id), self.get_run_name())
+
+    # name of the performance files, with the configuration of the run (as the evaluation path), so the
+    # configurations of a massive grid on the same log do not overwrite each other
+    def get_run_name(self):
+        parameters = self.current_parameters
+        if not parameters or not parameters.logname:
+            return 'ipdd'
+        name = f'{parameters.logname}_{parameters.approach}'
+        if parameters.approach == Approach.FIXED.name:
+            name = f'{name}_{parameters.read_log_as}_{parameters.win_unity}_win{parameters.win_size}'
+            if parameters.window_type == FixedWindowType.SLIDING.name:
+                name = f'{name}_{parameters.window_type}_stride{parameters.stride}'
+        elif parameters.approach == Approach.ADAPTIVE.name:
+            name = f'{name}_{parameters.perspective}'
+            if parameters.perspective == AdaptivePerspective.TIME_DATA.name:
+                name = f'{name}_{parameters.read_log_as}_{parameters.attribute}'
+            elif parameters.perspective == AdaptivePerspective.CONTROL_FLOW.name:
+                name = f'{name}_{parameters.adaptive_controlflow_approach}_win{parameters.win_size}' \
+                       f'_{parameters.discovery_backend}'
+                if parameters.quality_metrics:
+                    name = f'{name}_{"_".join(parameters.quality_metrics)}'
+            name = f'{name}_{parameters.detector_class.get_name()}' \
+                   f'{parameters.detector_class.get_parameters_string()}'
+        return name
+
+    def get_performance_metrics(self):
+        return performance_metrics.to_dict()
+
+    # export the spans recorded for the windows (Chrome trace format, viewable in Perfetto)
+    def save_trace(self, user_id=None):
+        if not tracer.is_enabled():
+            return None
+        if user_id is None:
+            user_id = self.user_id
+        filename = os.path.join(self.get_performance_path(user_id), f'{self.get_run_name()}_trace.json')
+        return tracer.save(filename)
+
+    # export the memory checkpoints of the last run (RSS, tracemalloc and size of the retained objects)
+    # stage: optional name for registering a new checkpoint before saving
+    def save_memory_accounting(self, user_id=None, stage=None):
+        if not memory_accounting.is_enabled():
+            return None
+        if stage:
+            memory_accounting.checkpoint(stage)
+        if user_id is None:
+            user_id = self.user_id
+        return memory_accounting.save(self.get_performance_path(user_id), self.get_run_name())
+
     def copy_event_log(self, event_log):
         path, log = os.path.split(event_log)
         new_filepath = os.path.join(self.get_input_path(self.user_id), log)
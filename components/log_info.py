@@ -1,3 +1,9 @@
+import pandas as pd
+
+from components.activity_index import ActivityIndex
+from components.discovery.variant_window import get_variant
+
+
 class LogInfo:
     def __init__(self, complete_filename, filename):
         self.complete_filename = complete_filename
@@ -6,4 +12,29 @@ class LogInfo:
         self.first_traces = None
         self.median_case_duration = None
         self.median_case_duration_in_hours = None
-        self.total_of_cases = None
\ No newline at end of file
+        self.total_of_cases = None
+
+    @property
+    def log(self):
+        return self._log
+
+    # the activity index and the variants are built again when the log is replaced (e.g., converted to a dataframe)
+    @log.setter
+    def log(self, log):
+        self._log = log
+        self.activity_index = None
+        self.variants = None
+
+    def get_activity_index(self):
+        if self.activity_index is None and self._log is not None:
+            if isinstance(self._log, pd.DataFrame):
+                self.activity_index = ActivityIndex.from_dataframe(self._log)
+            else:
+                self.activity_index = ActivityIndex.from_event_log(self._log)
+        return self.activity_index
+
+    # variant (tuple of activities) of each trace, in the order of the log
+    def get_variants(self):
+        if self.variants is None and self._log is not None and not isinstance(self._log, pd.DataFrame):
+            self.variants = [get_variant(trace) for trace in self._log]
+        return self.variants
@@ -0,0 +1,228 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# ignore the allocations done by tracemalloc and by this module when reporting the top allocation sites
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+# current and peak resident set size (in bytes) of the process
+# the peak is read from /proc (VmHWM), which can be reset at each stage, or from getrusage (peak of the process)
+def get_rss():
+    current = None
+    peak = None
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmRSS:'):
+                    current = int(line.split()[1]) * 1024
+                elif line.startswith('VmHWM:'):
+                    peak = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if peak is None and resource:
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != 'darwin':
+            peak *= 1024
+    return current, peak
+
+
+# reset the peak RSS of the process (Linux only), so the next checkpoint reports the peak of the stage
+def reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+        return True
+    except OSError:
+        return False
+
+
+# approximated size (in bytes) of the object and all the objects reachable from it
+# used for the objects retained by IPDD (event log, attribute values, previous sub-logs)
+def get_deep_size(obj):
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        # pandas and numpy objects report the memory of the underlying buffers
+        if hasattr(o, 'memory_usage') and hasattr(o, 'columns'):
+            size += int(o.memory_usage(deep=True).sum())
+            continue
+        if hasattr(o, 'nbytes') and hasattr(o, 'dtype'):
+            size += int(o.nbytes)
+            continue
+        size += sys.getsizeof(o)
+        if isinstance(o, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        if hasattr(o, '__dict__'):
+            stack.append(o.__dict__)
+        for slot in getattr(type(o), '__slots__', ()):
+            if hasattr(o, slot):
+                stack.append(getattr(o, slot))
+    return size
+
+
+# Memory accounting for the stages of IPDD
+# Each checkpoint records the RSS, the memory traced by tracemalloc (current and peak since
+# the previous checkpoint), the top allocation sites, the allocation sites that grew most
+# since the previous checkpoint, and the deep size of the objects informed by the caller
+class MemoryAccounting:
+    def __init__(self, top=10, frames=1):
+        self.top = top
+        self.frames = frames
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.checkpoints = []
+        self.previous_snapshot = None
+        self.started_tracemalloc = False
+
+    def start(self):
+        with self.lock:
+            self.checkpoints = []
+            self.previous_snapshot = None
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self.started_tracemalloc = True
+            tracemalloc.reset_peak()
+            reset_peak_rss()
+            self.enabled = True
+
+    def stop(self):
+        with self.lock:
+            self.enabled = False
+            self.previous_snapshot = None
+            if self.started_tracemalloc:
+                tracemalloc.stop()
+                self.started_tracemalloc = False
+
+    def is_enabled(self):
+        return self.enabled
+
+    # register the memory at the end of a stage
+    # objects: dictionary with the name and the objects retained after the stage
+    def checkpoint(self, stage, objects=None):
+        if not self.enabled:
+            return None
+        with self.lock:
+            rss, peak_rss = get_rss()
+            traced, peak_traced = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+            checkpoint = {
+                'stage': stage,
+                'time': time.time(),
+                'rss': rss,
+                'peak_rss': peak_rss,
+                'traced': traced,
+                'peak_traced': peak_traced,
+                'top_allocations': [self.get_statistic_info(s) for s in snapshot.statistics('lineno')[:self.top]],
+                'top_growth': [],
+                'objects': {},
+            }
+            if self.previous_snapshot:
+                growth = snapshot.compare_to(self.previous_snapshot, 'lineno')[:self.top]
+                checkpoint['top_growth'] = [self.get_statistic_info(s) for s in growth if s.size_diff > 0]
+            if objects:
+                for name, obj in objects.items():
+                    checkpoint['objects'][name] = get_deep_size(obj)
+            self.previous_snapshot = snapshot
+            self.checkpoints.append(checkpoint)
+            tracemalloc.reset_peak()
+            reset_peak_rss()
+        print(f'Memory at stage [{stage}]: RSS {format_size(rss)} - peak RSS {format_size(peak_rss)} - '
+              f'traced {format_size(traced)} - peak traced {format_size(peak_traced)}')
+        return checkpoint
+
+    @staticmethod
+    def get_statistic_info(statistic):
+        frame = statistic.traceback[0]
+        info = {
+            'site': f'{frame.filename}:{frame.lineno}',
+            'size': statistic.size,
+            'count': statistic.count,
+        }
+        if hasattr(statistic, 'size_diff'):
+            info['size_diff'] = statistic.size_diff
+        return info
+
+    def to_dict(self):
+        with self.lock:
+            return {'checkpoints': list(self.checkpoints)}
+
+    def get_report(self):
+        lines = []
+        for c in self.to_dict()['checkpoints']:
+            lines.append(f'Stage [{c["stage"]}]')
+            lines.append(f'  RSS: {format_size(c["rss"])} - peak RSS: {format_size(c["peak_rss"])}')
+            lines.append(f'  traced: {format_size(c["traced"])} - peak traced: {format_size(c["peak_traced"])}')
+            for name, size in c['objects'].items():
+                lines.append(f'  object {name}: {format_size(size)}')
+            lines.append('  top allocation sites:')
+            for s in c['top_allocations']:
+                lines.append(f'    {s["site"]}: {format_size(s["size"])} ({s["count"]} blocks)')
+            if c['top_growth']:
+                lines.append('  top growth since previous stage:')
+                for s in c['top_growth']:
+                    lines.append(f'    {s["site"]}: +{format_size(s["size_diff"])}')
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path, name):
+        if not os.path.exists(path):
+            os.makedirs(path)
+        json_filename = os.path.join(path, f'{name}_memory.json')
+        with open(json_filename, 'w+') as file:
+            json.dump(self.to_dict(), file, indent=2)
+        report_filename = os.path.join(path, f'{name}_memory.txt')
+        with open(report_filename, 'w+') as file:
+            file.write(self.get_report())
+        print(f'Saving memory accounting to {json_filename} and {report_filename}')
+        return json_filename, report_filename
+
+
+def format_size(size):
+    if size is None:
+        return '-'
+    for unit in ['B', 'KiB', 'MiB']:
+        if abs(size) < 1024:
+            return f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GiB'
+
+
+# memory accounting used by all the IPDD components
+memory_accounting = MemoryAccounting()
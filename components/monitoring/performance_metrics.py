@@ -0,0 +1,204 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+from enum import Enum
+from functools import wraps
+from threading import RLock
+
+
+class Stage(str, Enum):
+    IMPORT = 'import'
+    WINDOWING = 'windowing'
+    DISCOVERY = 'discovery'
+    RENDERING = 'rendering'
+    SIMILARITY_METRICS = 'similarity_metrics'
+    CONFORMANCE_METRICS = 'conformance_metrics'
+    PLOTTING = 'plotting'
+    FILE_WRITE = 'file_write'
+
+
+# upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, math.inf)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+        for i, upper_bound in enumerate(self.buckets):
+            if seconds <= upper_bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def get_cumulative_counts(self):
+        cumulative = []
+        total = 0
+        for c in self.bucket_counts:
+            total += c
+            cumulative.append(total)
+        return cumulative
+
+    # estimate the quantile (0-1) using linear interpolation inside the bucket (as Prometheus histogram_quantile)
+    def get_percentile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        lower_bound = 0.0
+        previous = 0
+        for upper_bound, cumulative in zip(self.buckets, self.get_cumulative_counts()):
+            if cumulative >= rank:
+                if upper_bound == math.inf:
+                    return self.max
+                in_bucket = cumulative - previous
+                fraction = (rank - previous) / in_bucket if in_bucket > 0 else 1
+                return min(lower_bound + (upper_bound - lower_bound) * fraction, self.max)
+            lower_bound = upper_bound
+            previous = cumulative
+        return self.max
+
+    def to_dict(self):
+        mean = self.sum / self.count if self.count > 0 else 0
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': mean,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.get_percentile(0.5),
+            'p95': self.get_percentile(0.95),
+            'p99': self.get_percentile(0.99),
+            'buckets': {format_bucket(b): c for b, c in zip(self.buckets, self.get_cumulative_counts())}
+        }
+
+
+def format_bucket(upper_bound):
+    if upper_bound == math.inf:
+        return '+Inf'
+    return f'{upper_bound:g}'
+
+
+# Registry of counters and latency histograms for the IPDD processing stages
+# The same instance is shared by the framework, the windowing strategies, the discovery
+# and the similarity metrics threads, so every update is protected by a lock
+class PerformanceMetrics:
+    def __init__(self):
+        self.lock = RLock()
+        self.counters = {}
+        self.histograms = {}
+        self.started_at = time.time()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+            self.started_at = time.time()
+
+    def increment(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            if stage not in self.histograms:
+                self.histograms[stage] = LatencyHistogram()
+            self.histograms[stage].observe(seconds)
+
+    @contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def get_histogram(self, stage):
+        with self.lock:
+            return self.histograms.get(stage)
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'elapsed_time': time.time() - self.started_at,
+                'counters': dict(self.counters),
+                'stages': {get_stage_name(s): h.to_dict() for s, h in self.histograms.items()}
+            }
+
+    # export the registry using the Prometheus text exposition format
+    def to_prometheus(self):
+        lines = []
+        with self.lock:
+            lines.append('# HELP ipdd_stage_duration_seconds Latency of the IPDD processing stages')
+            lines.append('# TYPE ipdd_stage_duration_seconds histogram')
+            for stage, histogram in self.histograms.items():
+                name = get_stage_name(stage)
+                for b, c in zip(histogram.buckets, histogram.get_cumulative_counts()):
+                    lines.append(f'ipdd_stage_duration_seconds_bucket{{stage="{name}",le="{format_bucket(b)}"}} {c}')
+                lines.append(f'ipdd_stage_duration_seconds_sum{{stage="{name}"}} {histogram.sum}')
+                lines.append(f'ipdd_stage_duration_seconds_count{{stage="{name}"}} {histogram.count}')
+            lines.append('# HELP ipdd_items_total Number of items processed by IPDD')
+            lines.append('# TYPE ipdd_items_total counter')
+            for name, value in self.counters.items():
+                lines.append(f'ipdd_items_total{{name="{name}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path, name):
+        if not os.path.exists(path):
+            os.makedirs(path)
+        json_filename = os.path.join(path, f'{name}_performance_metrics.json')
+        with open(json_filename, 'w+') as file:
+            json.dump(self.to_dict(), file, indent=2)
+        prometheus_filename = os.path.join(path, f'{name}_performance_metrics.prom')
+        with open(prometheus_filename, 'w+') as file:
+            file.write(self.to_prometheus())
+        print(f'Saving performance metrics to {json_filename} and {prometheus_filename}')
+        return json_filename, prometheus_filename
+
+
+def get_stage_name(stage):
+    if isinstance(stage, Stage):
+        return stage.value
+    return str(stage)
+
+
+# registry used by all the IPDD components
+performance_metrics = PerformanceMetrics()
+
+
+# decorator for measuring the latency of a function as one stage of the registry
+def measured(stage):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with performance_metrics.measure(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
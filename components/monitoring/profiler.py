@@ -0,0 +1,273 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import cProfile
+import glob
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from enum import Enum
+
+
+class ProfileMode(str, Enum):
+    DETERMINISTIC = 'deterministic'  # cProfile in every thread + sampled stacks for the flamegraph
+    SAMPLING = 'sampling'  # only the sampled stacks, lower overhead
+
+
+# output path and name of the run profiled by profile_run (deterministic mode), sent to the worker processes
+# (plot render and discovery pools) so they save their profiles with profile_worker
+worker_profile = None
+
+
+def get_worker_profile():
+    return worker_profile
+
+
+# Since Python 3.12 cProfile uses sys.monitoring, which is enabled for all the threads of the interpreter,
+# and only one profiler can be active. Before that, each thread needs its own profiler.
+PROFILE_ALL_THREADS = sys.version_info >= (3, 12)
+
+
+# Sampling profiler that periodically collects the stacks of all the threads (sys._current_frames)
+# The stacks are aggregated in the collapsed format used by flamegraph.pl and speedscope
+class StackSampler:
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, name='IPDD-StackSampler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join()
+
+    def sample(self):
+        own_ident = threading.get_ident()
+        while self.running:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                self.stacks[self.get_collapsed_stack(names.get(ident, str(ident)), frame)] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    @staticmethod
+    def get_collapsed_stack(thread_name, frame):
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        frames.append(thread_name)
+        # the collapsed format starts from the root of the stack
+        return ';'.join(reversed(frames)).replace(' ', '_')
+
+    def save(self, filename):
+        with open(filename, 'w+') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f'{stack} {count}\n')
+        return filename
+
+
+# Deterministic profiler (cProfile) that also covers the threads started during the run,
+# e.g., the similarity metrics threads. The statistics of all the threads are merged using pstats.
+# Before Python 3.12 a profiler can only be disabled by its own thread, so the statistics are collected from
+# the threads that finished: the stop joins the threads started during the run. The daemon threads (e.g., the
+# artifact writer pool) are not finished by the run, so they are only covered by the sampling profiler.
+class ThreadsProfiler:
+    def __init__(self, join_timeout=60):
+        self.lock = threading.Lock()
+        self.profiles = []
+        # threads started during the run and their profilers
+        self.thread_profiles = []
+        self.running = False
+        self.join_timeout = join_timeout
+
+    def new_profile(self):
+        profile = cProfile.Profile()
+        with self.lock:
+            self.profiles.append(profile)
+        return profile
+
+    # called once by each new thread, replacing the hook by a profiler for the thread
+    def thread_hook(self, frame, event, arg):
+        sys.setprofile(None)
+        thread = threading.current_thread()
+        if not self.running or thread.daemon:
+            return
+        profile = cProfile.Profile()
+        with self.lock:
+            self.thread_profiles.append((thread, profile))
+        profile.enable()
+
+    def start(self):
+        self.running = True
+        if not PROFILE_ALL_THREADS:
+            threading.setprofile(self.thread_hook)
+        self.new_profile().enable()
+
+    def stop(self):
+        self.running = False
+        if not PROFILE_ALL_THREADS:
+            threading.setprofile(None)
+        # the profiler of the main thread is the first one
+        self.profiles[0].disable()
+        with self.lock:
+            thread_profiles = self.thread_profiles
+            self.thread_profiles = []
+        for thread, profile in thread_profiles:
+            if thread is not threading.current_thread():
+                thread.join(self.join_timeout)
+            if thread.is_alive():
+                print(f'Thread {thread.name} is still running, its profile is not included')
+                continue
+            with self.lock:
+                self.profiles.append(profile)
+
+    def get_stats(self):
+        stats = None
+        with self.lock:
+            for profile in self.profiles:
+                profile.create_stats()
+                if not profile.stats:
+                    continue
+                if stats is None:
+                    stats = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+        return stats
+
+
+class Profiler:
+    def __init__(self, mode=ProfileMode.DETERMINISTIC, interval=0.005):
+        self.mode = ProfileMode(mode)
+        self.sampler = StackSampler(interval)
+        self.threads_profiler = None
+        if self.mode == ProfileMode.DETERMINISTIC:
+            self.threads_profiler = ThreadsProfiler()
+
+    def start(self):
+        # the sampler is started first, so it is not profiled by cProfile before Python 3.12
+        self.sampler.start()
+        if self.threads_profiler:
+            self.threads_profiler.start()
+
+    def stop(self):
+        if self.threads_profiler:
+            self.threads_profiler.stop()
+        self.sampler.stop()
+
+    # save the files using the name as prefix:
+    # - name.pstats: merged cProfile statistics (only deterministic mode), including the
+    #                profiles saved by worker processes with profile_worker
+    # - name_stats.txt: the functions with the highest cumulative time
+    # - name_collapsed.txt: sampled stacks in collapsed format (flamegraph.pl, speedscope)
+    def save(self, path, name):
+        if not os.path.exists(path):
+            os.makedirs(path)
+        files = []
+        stats = None
+        if self.threads_profiler:
+            stats = self.threads_profiler.get_stats()
+        for worker_file in glob.glob(os.path.join(path, f'{name}_worker_*.pstats')):
+            if stats is None:
+                stats = pstats.Stats(worker_file)
+            else:
+                stats.add(worker_file)
+        if stats:
+            pstats_filename = os.path.join(path, f'{name}.pstats')
+            stats.dump_stats(pstats_filename)
+            files.append(pstats_filename)
+            text_filename = os.path.join(path, f'{name}_stats.txt')
+            with open(text_filename, 'w+') as file:
+                file.write(get_stats_report(stats))
+            files.append(text_filename)
+        files.append(self.sampler.save(os.path.join(path, f'{name}_collapsed.txt')))
+        print(f'Saving profile [{self.mode.value}] to {files}')
+        return files
+
+
+def get_stats_report(stats, lines=50):
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(lines)
+    return stream.getvalue()
+
+
+# the profile option of the scripts can be a boolean or the name of the mode
+def get_profile_mode(profile):
+    if profile is True:
+        return ProfileMode.DETERMINISTIC
+    return ProfileMode(profile)
+
+
+# profile the block and save the results in the output path
+# ex.: with profile_run(framework.get_profile_path('script'), 'cb2.5k'):
+@contextmanager
+def profile_run(output_path, name, mode=ProfileMode.DETERMINISTIC):
+    global worker_profile
+    # remove the worker profiles from a previous run with the same name
+    for worker_file in glob.glob(os.path.join(output_path, f'{name}_worker_*.pstats')):
+        os.remove(worker_file)
+    profiler = Profiler(mode)
+    if profiler.mode == ProfileMode.DETERMINISTIC:
+        worker_profile = (output_path, name)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        worker_profile = None
+        profiler.save(output_path, name)
+
+
+# profile a block executed in a worker process, the pstats file is merged
+# by the profile_run of the parent process using the same output path and name
+@contextmanager
+def profile_worker(output_path, name):
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        if not os.path.exists(output_path):
+            os.makedirs(output_path, exist_ok=True)
+        filename = os.path.join(output_path, f'{name}_worker_{os.getpid()}.pstats')
+        stats = pstats.Stats(profile)
+        # a worker process runs several tasks (one at a time), their profiles are accumulated in the same file
+        if os.path.exists(filename):
+            stats.add(filename)
+        stats.dump_stats(filename)
+
+
+# run fn(*args) in a worker process, profiled when the parent process is profiled
+# worker_profile: value of get_worker_profile() in the parent process (None when the run is not profiled)
+def run_profiled(worker_profile, fn, *args):
+    if worker_profile is None:
+        return fn(*args)
+    with profile_worker(*worker_profile):
+        return fn(*args)
@@ -0,0 +1,154 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import os
+import threading
+import time
+
+
+# span returned when the tracer is disabled, nothing is recorded
+class NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set_arg(self, name, value):
+        pass
+
+
+NO_SPAN = NoSpan()
+
+
+class Span:
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        self.tracer.add_complete_event(self.name, self.category, self.start, end, self.args)
+        return False
+
+    def set_arg(self, name, value):
+        self.args[name] = value
+
+
+# Tracer that records spans using the Chrome trace event format
+# (https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU)
+# The generated JSON can be opened in Perfetto (https://ui.perfetto.dev) or chrome://tracing
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.events = []
+        self.thread_names = {}
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+
+    def enable(self):
+        with self.lock:
+            self.events = []
+            self.thread_names = {}
+            self.origin = time.perf_counter()
+            self.pid = os.getpid()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def is_enabled(self):
+        return self.enabled
+
+    # value sent to the worker processes (plot render and discovery pools) for recording their spans with
+    # run_traced, None when the tracer is disabled
+    # perf_counter uses a system-wide clock, so the origin of the parent process is valid in the workers
+    def get_worker_trace(self):
+        if not self.enabled:
+            return None
+        return self.origin
+
+    # add the events recorded by a worker process with run_traced
+    def add_worker_events(self, events):
+        if not self.enabled or not events:
+            return
+        with self.lock:
+            self.events.extend(events)
+
+    # when the tracer is disabled the cost of a span is one attribute check
+    # the callers should only pass arguments that are cheap to evaluate
+    def span(self, name, category='ipdd', **args):
+        if not self.enabled:
+            return NO_SPAN
+        return Span(self, name, category, args)
+
+    def add_complete_event(self, name, category, start, end, args):
+        thread = threading.current_thread()
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self.origin) * 1e6,  # in microseconds
+            'dur': (end - start) * 1e6,
+            'pid': self.pid,
+            'tid': thread.ident,
+            'args': {k: str(v) if not isinstance(v, (int, float)) else v for k, v in args.items()}
+        }
+        with self.lock:
+            self.events.append(event)
+            if thread.ident not in self.thread_names:
+                self.thread_names[thread.ident] = thread.name
+
+    def get_trace(self):
+        with self.lock:
+            metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': name}}
+                        for tid, name in self.thread_names.items()]
+            return {'traceEvents': metadata + list(self.events), 'displayTimeUnit': 'ms'}
+
+    def save(self, filename):
+        path = os.path.dirname(filename)
+        if path and not os.path.exists(path):
+            os.makedirs(path)
+        with open(filename, 'w+') as file:
+            json.dump(self.get_trace(), file)
+        print(f'Saving trace with {len(self.events)} spans to {filename}')
+        return filename
+
+
+# tracer used by all the IPDD components
+tracer = Tracer()
+
+
+
+# run fn(*args) in a worker process, recording its spans when the parent process is traced
+# worker_trace: value of tracer.get_worker_trace() in the parent process (None when the run is not traced)
+# return the result of fn and the events of the worker (with the names of its threads), which are added
+# to the trace of the parent process with add_worker_events
+def run_traced(worker_trace, fn, *args):
+    if worker_trace is None:
+        return fn(*args), []
+    tracer.enable()
+    tracer.origin = worker_trace
+    try:
+        return fn(*args), tracer.get_trace()['traceEvents']
+    finally:
+        tracer.disable()
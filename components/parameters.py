@@ -12,6 +12,14 @@ class WindowUnityFixed(str, Enum):
     DAY = 'Days'
 
 
+# windows of the fixed approach
+# TUMBLING: consecutive windows without overlap
+# SLIDING: two adjacent windows that move stride traces at each step
+class FixedWindowType(str, Enum):
+    TUMBLING = 'Tumbling window'
+    SLIDING = 'Sliding window'
+
+
 class AdaptivePerspective(str, Enum):
     TIME_DATA = 'Time/Data'
     CONTROL_FLOW = 'Control-flow'
@@ -28,11 +36,40 @@ class ControlflowAdaptiveApproach(str, Enum):
     WINDOW = 'Windowing'
 
 
+# algorithms for discovering the Petri nets of the adaptive approach for control-flow drifts
+class DiscoveryBackend(str, Enum):
+    INDUCTIVE = 'Inductive Miner'
+    INDUCTIVE_INFREQUENT = 'Inductive Miner infrequent (IMf)'
+    INDUCTIVE_DFG = 'Inductive Miner directly-follows (IMd)'
+    HEURISTICS = 'Heuristics Miner'
+
+
+# quality metrics of the adaptive approach for control-flow drifts (the value is the name used by IPDD)
+# fitness: TBR - token-based replay, AL - alignments, DFG - directly-follows pairs of the trace in the DFG
+# precision: ETC - ETConformance, AL - alignments, FP - footprints, DFG - edges of the DFG covered by the traces
+# the DFG metrics use the DFG of the traces used for discovering the model, without replaying the traces
+class QualityMetric(str, Enum):
+    FITNESS_TBR = 'fitnessTBR'
+    FITNESS_AL = 'fitnessAL'
+    FITNESS_DFG = 'fitnessDFG'
+    PRECISION_ETC = 'precisionETC'
+    PRECISION_AL = 'precisionAL'
+    PRECISION_FP = 'precisionFP'
+    PRECISION_DFG = 'precisionDFG'
+
+
 class Approach(str, Enum):
     FIXED = 'Fixed'
     ADAPTIVE = 'Adaptive'
 
 
+# formats of the artifacts (time series and plots) generated by the adaptive approaches
+class OutputFormat(str, Enum):
+    CSV = 'csv'
+    XLSX = 'xlsx'
+    PNG = 'png'
+
+
 class Paths(str, Enum):
     DATA_PATH = 'data'
     OUTPUT_PATH = 'output'
@@ -42,6 +79,16 @@ class Paths(str, Enum):
     SUBLOGS_PATH = 'sublogs'
     ADAPTIVE_PATH = 'adaptive'
     EVALUATION_PATH = 'evaluation'
+    PERFORMANCE_PATH = 'performance'
+    PROFILE_PATH = 'profile'
+    CACHE_PATH = 'cache'
+
+
+# suffix of the files generated by the fixed approach with sliding windows, including the stride
+def get_fixed_window_suffix(parameters):
+    if getattr(parameters, 'window_type', FixedWindowType.TUMBLING.name) == FixedWindowType.SLIDING.name:
+        return f'_sliding{parameters.stride}'
+    return ''
 
 
 def get_value_of_parameter(name):
@@ -0,0 +1,169 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+
+import matplotlib.style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from components.decimation import decimate, DecimationMethod, DEFAULT_MAX_POINTS
+from components.monitoring.performance_metrics import performance_metrics, Stage
+from components.monitoring.profiler import get_worker_profile, run_profiled
+from components.monitoring.tracer import tracer, run_traced
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+PLOT_STYLE = 'seaborn-v0_8-whitegrid' if 'seaborn-v0_8-whitegrid' in matplotlib.style.available \
+    else 'seaborn-whitegrid'
+
+
+# Everything needed for rendering one plot, so it can be sent to another process
+# series: list of (label, x values, y values)
+# change_points: x positions of the detected drifts (red dotted lines)
+# real_drifts: x positions of the real drifts (green dotted lines)
+# label_change_points: show the change points in the legend
+# x_ticks: positions of the ticks of the x axis (default defined by matplotlib)
+# max_points: the series are decimated to this number of points before plotting (None plots all the points),
+#             the points closest to the change points and real drifts are always kept
+class PlotSpec:
+    def __init__(self, filename, title, x_label, y_label, series, change_points=None, real_drifts=None,
+                 label_change_points=False, x_ticks=None, x_ticks_rotation=0, legend=False, bbox_tight=False,
+                 max_points=DEFAULT_MAX_POINTS, decimation=DecimationMethod.LTTB):
+        self.filename = filename
+        self.title = title
+        self.x_label = x_label
+        self.y_label = y_label
+        self.series = series
+        self.change_points = change_points
+        self.real_drifts = real_drifts
+        self.label_change_points = label_change_points
+        self.x_ticks = x_ticks
+        self.x_ticks_rotation = x_ticks_rotation
+        self.legend = legend
+        self.bbox_tight = bbox_tight
+        self.max_points = max_points
+        self.decimation = decimation
+
+    def get_decimated_series(self):
+        keep_x = list(self.change_points or []) + list(self.real_drifts or [])
+        series = []
+        for label, x, y in self.series:
+            x, y = decimate(x, y, self.max_points, keep_x, self.decimation)
+            series.append((label, x, y))
+        return series
+
+
+# render the plot using only the object-oriented API of Matplotlib (no pyplot global state)
+# return the time spent (in seconds)
+def render_plot(spec):
+    start = time.perf_counter()
+    with tracer.span('render_plot', filename=os.path.basename(spec.filename)), matplotlib.style.context(PLOT_STYLE):
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+        for label, x, y in spec.get_decimated_series():
+            ax.plot(x, y, label=label)
+
+        if spec.change_points:
+            for cp in spec.change_points:
+                if spec.label_change_points:
+                    ax.axvline(x=cp, label=cp, color='k', linestyle=':')
+                else:
+                    ax.axvline(x=cp, color='r', linestyle=':')
+
+        if spec.real_drifts:
+            for rd in spec.real_drifts:
+                ax.axvline(x=rd, color='g', linestyle=':')
+
+        if spec.x_ticks is not None:
+            ax.set_xticks(spec.x_ticks)
+            ax.set_xticklabels(spec.x_ticks, rotation=spec.x_ticks_rotation)
+        if spec.legend:
+            ax.legend(bbox_to_anchor=(1.02, 1), loc='upper left')
+        ax.set_xlabel(spec.x_label)
+        ax.set_ylabel(spec.y_label)
+        ax.set_title(spec.title)
+        if spec.bbox_tight:
+            fig.savefig(spec.filename, bbox_inches='tight')
+        else:
+            fig.savefig(spec.filename)
+    return time.perf_counter() - start
+
+
+# Service that renders the plots in a pool of processes
+# The pool uses spawn, because forking a process with running threads (IPDD metrics) is not safe
+# With workers=0 the plots are rendered in the caller thread
+class PlotRenderService:
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self.workers = workers
+        self.executor = None
+        self.lock = Lock()
+        self.futures = []
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                    mp_context=multiprocessing.get_context('spawn'))
+            return self.executor
+
+    def submit(self, spec):
+        if self.workers == 0:
+            self.register_time(render_plot(spec))
+            return None
+        future = self.get_executor().submit(run_traced, tracer.get_worker_trace(), run_profiled, get_worker_profile(),
+                                            render_plot, spec)
+        future.add_done_callback(self.plot_done)
+        with self.lock:
+            self.futures.append((spec.filename, future))
+        return future
+
+    def plot_done(self, future):
+        if future.exception() is None:
+            seconds, events = future.result()
+            self.register_time(seconds)
+            tracer.add_worker_events(events)
+
+    @staticmethod
+    def register_time(seconds):
+        performance_metrics.observe(Stage.PLOTTING, seconds)
+        performance_metrics.increment('plots')
+
+    # wait until all the submitted plots are rendered and return the errors found
+    def wait(self):
+        with self.lock:
+            futures = self.futures
+            self.futures = []
+        errors = []
+        for filename, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f'Error rendering plot {filename}: {e}')
+                errors.append(f'{filename}: {e}')
+        return errors
+
+    def shutdown(self):
+        self.wait()
+        with self.lock:
+            if self.executor:
+                self.executor.shutdown()
+                self.executor = None
+
+
+# service used by all the IPDD components
+plot_render_service = PlotRenderService()
@@ -0,0 +1,90 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+import json
+import os
+from enum import Enum
+
+from components.adaptive.detectors import DetectorWrapper
+from components.file_hash import get_file_sha256
+from components.parameters import Paths
+
+# version of the IPDD results, change it when a change in IPDD modifies the detected drifts,
+# invalidating the cached scenarios
+IPDD_RESULTS_VERSION = 1
+SCENARIO_CACHE_PATH = os.path.join(Paths.DATA_PATH, Paths.CACHE_PATH, 'scenarios')
+# parameters that change the results of a scenario (the parameters not defined by the approach are ignored)
+# the other parameters only change the generated files or the performance (e.g., trace, output_formats,
+# discovery_workers, save_model_svg)
+RESULT_PARAMETERS = ['approach', 'read_log_as', 'metrics', 'win_unity', 'win_size', 'window_type', 'stride',
+                     'perspective', 'attribute', 'attribute_name', 'activities', 'min_activity_support',
+                     'adaptive_controlflow_approach', 'discovery_backend', 'quality_metrics', 'update_model',
+                     'speculative_discovery', 'detector_class']
+
+
+def get_parameter_value(value):
+    if isinstance(value, DetectorWrapper):
+        return value.get_complete_configuration()
+    if isinstance(value, Enum):
+        return value.name
+    if hasattr(value, 'item'):  # numpy scalars
+        return value.item()
+    return str(value)
+
+
+# Cache of the results of the scenarios run by ipdd_massive
+# A scenario is identified by the content of the log, the parameters that change the results (including the
+# detector configuration) and the version of the IPDD results, so re-running a grid only executes the new scenarios
+class ScenarioCache:
+    def __init__(self, path=SCENARIO_CACHE_PATH):
+        self.path = path
+
+    @staticmethod
+    def get_key(parameters):
+        definition = {
+            'version': IPDD_RESULTS_VERSION,
+            'log': get_file_sha256(parameters.logname),
+            'parameters': {key: getattr(parameters, key) for key in RESULT_PARAMETERS if hasattr(parameters, key)},
+        }
+        return hashlib.sha256(json.dumps(definition, sort_keys=True,
+                                         default=get_parameter_value).encode()).hexdigest()
+
+    def get_filename(self, key):
+        return os.path.join(self.path, f'{key}.json')
+
+    # return the results saved for the scenario or None if it was not run yet
+    def load(self, key):
+        filename = self.get_filename(key)
+        if not os.path.exists(filename):
+            return None
+        try:
+            with open(filename, 'r') as file:
+                return json.load(file)['results']
+        except (OSError, ValueError, KeyError) as e:
+            print(f'Error reading scenario cache {filename}: {e}')
+            return None
+
+    def save(self, key, parameters, results):
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+        filename = self.get_filename(key)
+        content = {'logname': parameters.logname, 'results': results}
+        # write to a temporary file first, so an interrupted run never leaves a partial file
+        tmp_filename = f'{filename}.{os.getpid()}.tmp'
+        with open(tmp_filename, 'w') as file:
+            json.dump(content, file, default=get_parameter_value)
+        os.replace(tmp_filename, filename)
+
+
+scenario_cache = ScenarioCache()
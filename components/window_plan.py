@@ -0,0 +1,68 @@
+"""
+    This file is part of Interactive Process Drift (IPDD) Framework.
+    IPDD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    IPDD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+    GNU General Public License for more details.
+    You should have received a copy of the GNU General Public License
+    along with IPDD. If not, see <https://www.gnu.org/licenses/>.
+"""
+import numpy as np
+
+from components.parameters import WindowUnityFixed
+
+
+# Boundaries (begin, end) of the windows of the fixed approach (tumbling windows), calculated before mining
+# any window. They are the same windows defined by the checkpoints of the original loop over the traces:
+# UNITY: a new window each win_size traces
+# HOUR: a new window starts at the first trace more than win_size hours after the beginning of the window
+#       (timestamps: seconds of the first event of each trace)
+# DAY: a new window starts at the first trace more than win_size days after the beginning of the window
+#      (days: ordinal of the date of the first event of each trace)
+# For HOUR and DAY the beginning of the next window is found with np.searchsorted when the log is sorted
+# by the timestamps, otherwise the traces are checked one by one as before
+def get_tumbling_windows(total, win_unity, win_size, timestamps=None, days=None):
+    if total == 0:
+        return []
+    if win_unity == WindowUnityFixed.UNITY.name:
+        begins = list(range(0, total, win_size))
+    elif win_unity == WindowUnityFixed.HOUR.name:
+        begins = get_window_begins(np.asarray(timestamps, dtype=float), win_size * 60 * 60,
+                                   lambda begin, i: (timestamps[i] - timestamps[begin]) / 60 / 60 > win_size)
+    elif win_unity == WindowUnityFixed.DAY.name:
+        begins = get_window_begins(np.asarray(days, dtype=np.int64), win_size,
+                                   lambda begin, i: days[i] - days[begin] > win_size)
+    else:
+        print(f'Incorrent windowing unity [{win_unity}].')
+        begins = [0]
+    ends = begins[1:] + [total]
+    return list(zip(begins, ends))
+
+
+# beginning of each window, the next window starts at the first item where is_checkpoint(begin, item) is true
+# values: sorted values used for finding the candidate item (values[begin] + size)
+def get_window_begins(values, size, is_checkpoint):
+    total = len(values)
+    begins = [0]
+    if total > 1 and np.any(values[1:] < values[:-1]):
+        # not sorted, check each item
+        for i in range(1, total):
+            if is_checkpoint(begins[-1], i):
+                begins.append(i)
+        return begins
+    begin = 0
+    while True:
+        i = max(int(np.searchsorted(values, values[begin] + size, side='right')), begin + 1)
+        # the candidate is adjusted using the original condition (rounding of the conversion to hours)
+        while i - 1 > begin and is_checkpoint(begin, i - 1):
+            i -= 1
+        while i < total and not is_checkpoint(begin, i):
+            i += 1
+        if i >= total:
+            return begins
+        begins.append(i)
+        begin = i
@@ -16,6 +16,7 @@ from pm4py.objects.log.util import interval_lifecycle
 
 from components.adaptive.detectors import SelectDetector, ConceptDriftDetector
 from run_thesis_experiments_massive import Dataset1Configuration, Dataset2Configuration
+from experiments_analysis.results_warehouse import results_warehouse
 from scipy import stats
 import scikit_posthocs as sp
 from autorank import autorank, plot_stats, create_report, latex_table
@@ -280,7 +281,7 @@ def analyze_metrics_ipdd(input_path, filename, dataset_config, selected_column,
                          print_plot_name=True):
     print(f'Reading file {filename}')
     complete_filename = os.path.join(input_path, filename)
-    df = pd.read_excel(complete_filename, index_col=0)
+    df = results_warehouse.read_table(complete_filename, like=selected_column)
     df.index.name = 'logname'
     ############################################################
     # Impact of the window size on the metrics
@@ -312,7 +313,7 @@ def ipdd_plot_change_pattern_all(input_path, filename, selected_column, title, d
 def ipdd_plot_change_pattern(input_path, filename, selected_column, title, dataset_name, winsize, detector_config,
                              print_plot_name=True):
     complete_filename = os.path.join(input_path, filename)
-    df = pd.read_excel(complete_filename, index_col=0)
+    df = results_warehouse.read_table(complete_filename, like=selected_column)
     df.index.name = 'logname'
     print(f'Reading file {filename}')
     ############################################################
@@ -324,7 +325,7 @@ def ipdd_plot_change_pattern(input_path, filename, selected_column, title, datas
 
 def analyze_metrics(dataset_config, input_path, filename, selected_column, title, dataset):
     complete_filename = os.path.join(input_path, filename)
-    df = pd.read_excel(complete_filename, index_col=0)
+    df = results_warehouse.read_table(complete_filename, like=selected_column)
     df.index.name = 'logname'
     print(f'Reading file {filename}')
     ############################################################
@@ -400,34 +401,26 @@ def analyze_dataset_vdd(dataset_config, dataset_name):
     analyze_metrics(dataset_config, vdd_path, vdd_filename, 'mean_delay cluster', 'CLUSTER', dataset_name)
 
 
+# mean value of the metric (over the logs) for each window size, read from the results warehouse
+# for IPDD only the columns of the selected detector configuration are considered
+def get_window_series(complete_filename, key, approach, detector_configuration=None):
+    detector = None
+    if 'Adaptive IPDD' in key:
+        detector = detector_configuration.get_complete_configuration()
+    series = results_warehouse.get_metric_table(complete_filename, approach[metric_key], detector=detector).mean()
+    series.name = key
+    return series
+
+
 def generate_plot_tools(output_folder, approaches, metric_name, dataset, plot_name=None, scale=None,
                         print_plot_name=True, black_white=False):
-    # firstly enrich dict with dataframe from excel
+    # firstly enrich dict with dataframe from the results warehouse
     for key in approaches.keys():
         input_path = approaches[key][path_key]
         filename = approaches[key][filename_key]
         complete_filename = os.path.join(input_path, filename)
-        df = pd.read_excel(complete_filename, index_col=0)
-        df.index.name = 'logname'
         print(f'Reading file {filename}')
-        # filter the selected metric
-        df_filtered = df.filter(like=approaches[key][metric_key], axis=1)
-        df_filtered.index.name = 'log size'
-        # if IPDD filter the selected detector configuration
-        if 'Adaptive IPDD' in key:
-            df_filtered = df_filtered.filter(
-                like=f'{detector_key}={approaches[key][detector_key].get_complete_configuration()}', axis=1)
-            # maintain only the number after 'w=' in the column names (window)
-            df_filtered = df_filtered.rename(
-                columns={element: re.sub(r'\D.*w=(\d+)\D.*', r'\1', element, count=1)
-                         for element in df_filtered.columns.tolist()})
-        else:
-            # maintain only the last number in the column names (window)
-            df_filtered = df_filtered.rename(
-                columns={element: re.sub(r'.*(?:\D|^)(\d+)', r'\1', element, count=1)
-                         for element in df_filtered.columns.tolist()})
-        series = df_filtered.mean()
-        series.name = key
+        series = get_window_series(complete_filename, key, approaches[key], approaches[key].get(detector_key))
         approaches[key][series_key] = series
 
     # configure lines for black and white option
@@ -477,34 +470,15 @@ def generate_plot_tools(output_folder, approaches, metric_name, dataset, plot_na
 # Simular to generate_plot_tools, but handles more than one dataset
 def generate_plot_tools_combined(output_folder, approaches, metric_name, dataset, plot_name=None, scale=None,
                                  print_plot_name=True, black_white=False):
-    # firstly enrich dict with dataframe from excel
+    # firstly enrich dict with dataframe from the results warehouse
     for key in approaches.keys():
         input_path = approaches[key][path_key]
         filenames = approaches[key][filename_key]
         complete_filenames = [os.path.join(input_path, f) for f in filenames]
         series = []
         for complete_filename in complete_filenames:
-            df = pd.read_excel(complete_filename, index_col=0)
-            df.index.name = 'logname'
             print(f'Reading file {complete_filename}')
-            # filter the selected metric
-            df_filtered = df.filter(like=approaches[key][metric_key], axis=1)
-            df_filtered.index.name = 'log size'
-            # if IPDD filter the selected detector configuration
-            if 'Adaptive IPDD' in key:
-                df_filtered = df_filtered.filter(
-                    like=f'{detector_key}={approaches[key][detector_key].get_complete_configuration()}', axis=1)
-                # maintain only the number after 'w=' in the column names (window)
-                df_filtered = df_filtered.rename(
-                    columns={element: re.sub(r'\D.*w=(\d+)\D.*', r'\1', element, count=1)
-                             for element in df_filtered.columns.tolist()})
-            else:
-                # maintain only the last number in the column names (window)
-                df_filtered = df_filtered.rename(
-                    columns={element: re.sub(r'.*(?:\D|^)(\d+)', r'\1', element, count=1)
-                             for element in df_filtered.columns.tolist()})
-            serie = df_filtered.mean()
-            serie.name = key
+            serie = get_window_series(complete_filename, key, approaches[key], approaches[key].get(detector_key))
             series.append(serie)
         df_series = pd.DataFrame(series)
         df_series = df_series.mean()
@@ -560,7 +534,7 @@ def generate_plot_tools_combined(output_folder, approaches, metric_name, dataset
 
 def generate_ipdd_plot_detectors(approach, folder, filename, metric_name, dataset_config, print_plot_name=True):
     complete_filename = os.path.join(folder, filename)
-    df = pd.read_excel(complete_filename, index_col=0)
+    df = results_warehouse.read_table(complete_filename, like=metric_name)
     df.index.name = 'logname'
     print(f'Reading file {filename}')
     # filter the selected metric
@@ -605,7 +579,7 @@ def generate_ipdd_plot_detectors(approach, folder, filename, metric_name, datase
 
 def generate_plot_approach(approach, folder, filename, metric_name):
     complete_filename = os.path.join(folder, filename)
-    df = pd.read_excel(complete_filename, index_col=0)
+    df = results_warehouse.read_table(complete_filename, like=metric_name)
     df.index.name = 'logname'
     print(f'Reading file {filename}')
     # filter the selected metric
@@ -629,34 +603,14 @@ def generate_plot_approach(approach, folder, filename, metric_name):
 
 
 def friedman_tools(output_folder, approaches, dataset_name, metric_name, windows):
-    # firstly enrich dict with dataframe from excel
+    # firstly enrich dict with dataframe from the results warehouse
     for key in approaches.keys():
         input_path = approaches[key][path_key]
         filename = approaches[key][filename_key]
         complete_filename = os.path.join(input_path, filename)
-        df = pd.read_excel(complete_filename, index_col=0)
-        df.index.name = 'logname'
         # print(f'Reading file {filename}')
-        # filter the selected metric
-        df_filtered = df.filter(like=approaches[key][metric_key], axis=1)
-        df_filtered.index.name = 'log size'
-        # if IPDD filter the selected delta
-        if 'Adaptive IPDD' in key:
-            df_filtered = df_filtered.filter(like=f'{detector_key}={detector_config.get_complete_configuration()}',
-                                             axis=1)
-            # maintain only the number after 'w=' in the column names (window)
-            df_filtered = df_filtered.rename(
-                columns={element: re.sub(r'\D.*w=(\d+)\D.*', r'\1', element, count=1)
-                         for element in df_filtered.columns.tolist()})
-        else:
-            # maintain only the last number in the column names (window)
-            df_filtered = df_filtered.rename(
-                columns={element: re.sub(r'.*(?:\D|^)(\d+)', r'\1', element, count=1)
-                         for element in df_filtered.columns.tolist()})
-
-        series = df_filtered.mean()
+        series = get_window_series(complete_filename, key, approaches[key], detector_config)
         series = series.filter(items=windows)
-        series.name = key
         approaches[key][series_key] = series
 
     # compare samples
@@ -707,36 +661,16 @@ def friedman_tools(output_folder, approaches, dataset_name, metric_name, windows
 
 
 def statistical_analysis_comparing_tools(output_folder, approaches, metric_name, windows, order='descending'):
-    # firstly enrich dict with dataframe from excel
+    # firstly enrich dict with dataframe from the results warehouse
     for key in approaches.keys():
         input_path = approaches[key][path_key]
         filenames = approaches[key][filename_key]
         complete_filenames = [os.path.join(input_path, f) for f in filenames]
         series = []
         for complete_filename in complete_filenames:
-            df = pd.read_excel(complete_filename, index_col=0)
-            df.index.name = 'logname'
             # print(f'Reading file {filename}')
-            # filter the selected metric
-            df_filtered = df.filter(like=approaches[key][metric_key], axis=1)
-            df_filtered.index.name = 'log size'
-            # if IPDD filter the selected delta
-            if 'Adaptive IPDD' in key:
-                df_filtered = df_filtered.filter(like=f'{detector_key}={detector_config.get_complete_configuration()}',
-                                             axis=1)
-                # maintain only the number after 'w=' in the column names (window)
-                df_filtered = df_filtered.rename(
-                    columns={element: re.sub(r'\D.*w=(\d+)\D.*', r'\1', element, count=1)
-                             for element in df_filtered.columns.tolist()})
-            else:
-                # maintain only the last number in the column names (window)
-                df_filtered = df_filtered.rename(
-                    columns={element: re.sub(r'.*(?:\D|^)(\d+)', r'\1', element, count=1)
-                             for element in df_filtered.columns.tolist()})
-
-            serie = df_filtered.mean()
+            serie = get_window_series(complete_filename, key, approaches[key], detector_config)
             serie = serie.filter(items=windows)
-            serie.name = key
             series.append(serie)
         df_series = pd.DataFrame(series)
         mean_df = df_series.mean()
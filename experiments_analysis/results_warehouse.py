@@ -0,0 +1,215 @@
+import json
+import os
+import re
+import sqlite3
+
+import pandas as pd
+
+# Local warehouse with the results of the experiments (IPDD, ProDrift and VDD)
+# Each results file (metrics_*.xlsx, results_*.xlsx or the Parquet files saved by ipdd_massive) is ingested
+# once, and again only if the file changes, into a SQLite table with one row for each log and column.
+# The column names ('<metric> <configuration>') are parsed into metric, approach, detector and window,
+# which are indexed, so the plotting functions query only the values they need instead of reading the
+# complete Excel file for each plot
+WAREHOUSE_FILENAME = 'results_warehouse.sqlite'
+
+# metrics reported in the results files, the first part of the column names
+LIST_METRICS = ['Detected drifts', 'Detected at', 'Real drifts', 'drifts -', 'detected at -']
+METRICS = LIST_METRICS + ['F-score', 'Precision', 'Recall', 'False positive rate (FPR)', 'Mean delay',
+                          'f_score', 'precision', 'recall', 'mean_detection_delay', 'mean_delay', 'FPR']
+# list columns of the Parquet files saved by ipdd_massive
+PARQUET_LIST_COLUMNS = {'detected_drifts': 'Detected drifts', 'detected_at': 'Detected at',
+                        'real_drifts': 'Real drifts', 'drifts': 'drifts -'}
+DETECTOR_KEY = 'detector'
+
+
+# split a column name (or a filter such as 'f_score awin') into its parts
+def parse_column(column):
+    metric = ''
+    for m in sorted(METRICS, key=len, reverse=True):
+        if column == m or column.startswith(f'{m} '):
+            metric = m
+            break
+    configuration = column[len(metric):].strip()
+    # IPDD uses 'w=<size> detector=<configuration>', the other tools '<approach> <size>'
+    approach = ''
+    if configuration and not configuration.startswith('w=') and not configuration.startswith(f'{DETECTOR_KEY}='):
+        approach = configuration.split(' ')[0]
+    window = None
+    if match := re.search(r'w=(\d+)', configuration):
+        window = int(match.group(1))
+    elif match := re.search(r'(?:\D|^)(\d+)$', configuration):
+        window = int(match.group(1))
+    detector = None
+    if match := re.search(fr'{DETECTOR_KEY}=(\S+)', configuration):
+        detector = match.group(1)
+    return {'metric': metric, 'configuration': configuration, 'approach': approach, 'window': window,
+            'detector': detector}
+
+
+def infer_dataset(complete_filename):
+    if match := re.search(r'(dataset\d+)', complete_filename):
+        return match.group(1)
+    return ''
+
+
+def infer_tool(complete_filename):
+    filename = os.path.basename(complete_filename).lower()
+    if 'prodrift' in filename:
+        return 'ProDrift'
+    if 'vdd' in filename:
+        return 'VDD'
+    return 'IPDD'
+
+
+def to_drifts(value):
+    if isinstance(value, str):
+        return json.dumps(json.loads(value)) if value.startswith('[') else json.dumps([])
+    if value is None or (not hasattr(value, '__len__') and pd.isna(value)):
+        return json.dumps([])
+    return json.dumps([int(v) for v in value])
+
+
+class ResultsWarehouse:
+    def __init__(self, database=WAREHOUSE_FILENAME):
+        self.database = database
+        self.connection = None
+
+    def get_connection(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.database)
+            self.connection.executescript('''
+                CREATE TABLE IF NOT EXISTS sources (id INTEGER PRIMARY KEY, path TEXT UNIQUE, size INTEGER,
+                                                    mtime_ns INTEGER, dataset TEXT, tool TEXT);
+                CREATE TABLE IF NOT EXISTS results (source_id INTEGER, dataset TEXT, tool TEXT, logname TEXT,
+                                                    log_position INTEGER, column_name TEXT, column_position INTEGER,
+                                                    metric TEXT, configuration TEXT, approach TEXT, detector TEXT,
+                                                    window INTEGER, value REAL, drifts TEXT);
+                CREATE INDEX IF NOT EXISTS results_source ON results (source_id, metric, detector, window);
+                CREATE INDEX IF NOT EXISTS results_query ON results (dataset, metric, tool, approach, detector,
+                                                                     window);
+                CREATE INDEX IF NOT EXISTS results_log ON results (logname, metric);
+            ''')
+        return self.connection
+
+    # ingest the file if it is not in the warehouse or if it changed since the last ingestion
+    # return the id of the source
+    def ingest(self, complete_filename, dataset=None, tool=None):
+        connection = self.get_connection()
+        path = os.path.abspath(complete_filename)
+        stat = os.stat(path)
+        source = connection.execute('SELECT id, size, mtime_ns FROM sources WHERE path = ?', (path,)).fetchone()
+        if source and source[1] == stat.st_size and source[2] == stat.st_mtime_ns:
+            return source[0]
+        if dataset is None:
+            dataset = infer_dataset(path)
+        if tool is None:
+            tool = infer_tool(path)
+        print(f'Ingesting results file {complete_filename}...')
+        rows = self.read_rows(path)
+        with connection:
+            if source:
+                connection.execute('DELETE FROM results WHERE source_id = ?', (source[0],))
+                connection.execute('UPDATE sources SET size = ?, mtime_ns = ?, dataset = ?, tool = ? WHERE id = ?',
+                                   (stat.st_size, stat.st_mtime_ns, dataset, tool, source[0]))
+                source_id = source[0]
+            else:
+                source_id = connection.execute('INSERT INTO sources (path, size, mtime_ns, dataset, tool) '
+                                               'VALUES (?, ?, ?, ?, ?)',
+                                               (path, stat.st_size, stat.st_mtime_ns, dataset, tool)).lastrowid
+            connection.executemany('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                   [(source_id, dataset, tool) + row for row in rows])
+        return source_id
+
+    # rows (logname, log position, column name, column position, metric, configuration, approach, detector,
+    # window, value, drifts) of the results file
+    @staticmethod
+    def read_rows(complete_filename):
+        rows = []
+        if complete_filename.endswith('.parquet'):
+            df = pd.read_parquet(complete_filename)
+            lognames = list(pd.unique(df['logname']))
+            columns = {}
+            for record in df.to_dict('records'):
+                for name, value in record.items():
+                    if name in ['logname', 'configuration']:
+                        continue
+                    metric = PARQUET_LIST_COLUMNS.get(name, name)
+                    column = f'{metric} {record["configuration"]}'
+                    columns.setdefault(column, len(columns))
+                    rows.append(ResultsWarehouse.get_row(record['logname'], lognames.index(record['logname']),
+                                                         column, columns[column], value))
+        else:
+            df = pd.read_excel(complete_filename, index_col=0)
+            for log_position, (logname, values) in enumerate(df.iterrows()):
+                for column_position, (column, value) in enumerate(values.items()):
+                    rows.append(ResultsWarehouse.get_row(logname, log_position, column, column_position, value))
+        return rows
+
+    @staticmethod
+    def get_row(logname, log_position, column, column_position, value):
+        parsed = parse_column(column)
+        drifts = None
+        if parsed['metric'] in LIST_METRICS:
+            drifts = to_drifts(value)
+            value = None
+        elif value is not None and not pd.isna(value):
+            value = float(value)
+        else:
+            value = None
+        return (logname, log_position, column, column_position, parsed['metric'], parsed['configuration'],
+                parsed['approach'], parsed['detector'], parsed['window'], value, drifts)
+
+    @staticmethod
+    def get_filters(like=None, detector=None, window=None):
+        conditions = []
+        parameters = []
+        if like:
+            parsed = parse_column(like)
+            conditions.append('metric = ?')
+            parameters.append(parsed['metric'])
+            if parsed['configuration']:
+                conditions.append('configuration LIKE ?')
+                parameters.append(f'{parsed["configuration"]}%')
+        if detector:
+            conditions.append('detector = ?')
+            parameters.append(detector)
+        if window is not None:
+            conditions.append('window = ?')
+            parameters.append(int(window))
+        return conditions, parameters
+
+    # values of the results file with the same layout of the file (one line for each log and the original
+    # column names), filtered by metric (like, e.g., 'F-score' or 'f_score awin'), detector, and window
+    def read_table(self, complete_filename, like=None, detector=None, window=None):
+        source_id = self.ingest(complete_filename)
+        conditions, parameters = self.get_filters(like, detector, window)
+        query = 'SELECT logname, log_position, column_name, column_position, value FROM results ' \
+                'WHERE source_id = ? AND drifts IS NULL'
+        for condition in conditions:
+            query += f' AND {condition}'
+        df = pd.read_sql_query(query, self.get_connection(), params=[source_id] + parameters)
+        table = df.pivot(index='logname', columns='column_name', values='value')
+        table = table.loc[df.drop_duplicates('logname').sort_values('log_position')['logname'],
+                          df.drop_duplicates('column_name').sort_values('column_position')['column_name']]
+        table.index.name = 'logname'
+        table.columns.name = None
+        return table
+
+    # values of one metric of the results file with one line for each log and one column for each window
+    # (the mean when more than one configuration has the same window), filtered by detector
+    def get_metric_table(self, complete_filename, metric, detector=None):
+        source_id = self.ingest(complete_filename)
+        conditions, parameters = self.get_filters(like=metric, detector=detector)
+        query = 'SELECT logname, log_position, window, value FROM results WHERE source_id = ? AND drifts IS NULL'
+        for condition in conditions:
+            query += f' AND {condition}'
+        df = pd.read_sql_query(query, self.get_connection(), params=[source_id] + parameters)
+        table = df.pivot_table(index='logname', columns='window', values='value', aggfunc='mean')
+        table = table.reindex(df.drop_duplicates('logname').sort_values('log_position')['logname'])
+        table.index.name = 'log size'
+        table.columns = [str(c) for c in table.columns]
+        return table
+
+
+results_warehouse = ResultsWarehouse()
@@ -14,13 +14,15 @@
 import argparse
 import os
 import time
+from contextlib import nullcontext
 
 from components.adaptive.detectors import ConceptDriftDetector, SelectDetector
 from components.parameters import ReadLogAs, WindowUnityFixed, Approach, AttributeAdaptive, AdaptivePerspective, \
-    ControlflowAdaptiveApproach
+    ControlflowAdaptiveApproach, OutputFormat, FixedWindowType, DiscoveryBackend, QualityMetric
 from components.dfg_definitions import Metric
 from components.ippd_fw import InteractiveProcessDriftDetectionFW, IPDDParametersFixed, IPDDParametersAdaptive, \
     IPDDParametersAdaptiveControlflow
+from components.monitoring.profiler import ProfileMode, profile_run, get_profile_mode
 
 
 def main():
@@ -47,6 +49,10 @@ def main():
     # Parameter for fixed or adaptive IPDD for control-flow drifts
     parser.add_argument('--win_size', '-ws', type=int, default=30,
                         help='Window size: numeric value indicating the total of window unities for each window')
+    parser.add_argument('--window_type', '-wt', help='Window type for the fixed approach: t - tumbling window or '
+                                                     's - sliding window', default='t')
+    parser.add_argument('--stride', '-st', type=int, default=1,
+                        help='Stride: number of traces the sliding windows move at each step')
 
     # Options for the adaptive approaches
     parser.add_argument('--delta', '-dt', help='Delta parameter - ADWIN change detector', type=float,
@@ -62,6 +68,8 @@ def main():
     parser.add_argument('--attribute_name', '-atname', help='Attribute name')
     parser.add_argument('--activities', '-activities', nargs='+',
                         help='Activities considered for getting the defined attribute', default=[])
+    parser.add_argument('--min_activity_support', type=int, default=0,
+                        help='Activities with less events are not analyzed (no detector, plots or files)')
 
     # Options for adaptive approach for the control-flow perspective
     parser.add_argument('--adaptive_controlflow_approach', '-cfa', help='Choose the approach for Adaptive IPDD for '
@@ -74,6 +82,42 @@ def main():
     parser.add_argument('--no_update_model',
                         help='Option for update process model after detecting a change point',
                         action='store_true')
+    parser.add_argument('--trace',
+                        help='Option for recording the spans of each window in the Chrome trace format, '
+                             'including the spans of the plot render and discovery worker processes',
+                        action='store_true')
+    parser.add_argument('--memory',
+                        help='Option for saving the memory (RSS, allocation sites and retained objects) of '
+                             'each stage. The run is slower because of tracemalloc',
+                        action='store_true')
+    parser.add_argument('--output_formats', nargs='+',
+                        help='Formats of the time series and plots generated by the adaptive approaches',
+                        default=[f.value for f in OutputFormat], choices=[f.value for f in OutputFormat])
+    parser.add_argument('--profile',
+                        help='Option for profiling the run (deterministic or sampling). The pstats and the '
+                             'collapsed stacks (flamegraph) are saved in the evaluation path',
+                        nargs='?', const=ProfileMode.DETERMINISTIC.value, default=None,
+                        choices=[m.value for m in ProfileMode])
+    parser.add_argument('--discovery_workers',
+                        help='Number of processes for mining the models of the windows in the fixed approach '
+                             '(0 mines the windows one by one)',
+                        type=int, default=0)
+    parser.add_argument('--discovery_backend',
+                        help='Algorithm for discovering the Petri nets of the adaptive approach for control-flow '
+                             'drifts',
+                        default=DiscoveryBackend.INDUCTIVE.name, choices=[b.name for b in DiscoveryBackend])
+    parser.add_argument('--quality_metrics', nargs='+',
+                        help='Quality metrics of the adaptive approach for control-flow drifts, replacing the '
+                             'default metric of their dimension (fitness or precision). The DFG metrics do not '
+                             'replay the traces. Trace by trace supports the precision metrics precisionETC and '
+                             'precisionAL, windowing supports precisionFP and precisionDFG',
+                        default=None, choices=[m.value for m in QualityMetric])
+    parser.add_argument('--speculative_discovery',
+                        help='Option for discovering the candidate model in background when the detector reports '
+                             'a warning (trace by trace approach with HDDM_W), so the detection does not wait for '
+                             'the discovery after a drift. The candidate is discovered by the discovery processes '
+                             'and it is used only if it starts at the drift, so the drifts are the same',
+                        action='store_true')
 
     args = parser.parse_args()
     approach = ''
@@ -93,8 +137,11 @@ def main():
     attribute = ''
     attribute_name = ''
     win_size = 0
+    window_type = FixedWindowType.TUMBLING.name
     if approach == Approach.FIXED.name:
         win_size = args.win_size
+        if args.window_type == 's':
+            window_type = FixedWindowType.SLIDING.name
     elif approach == Approach.ADAPTIVE.name:
         if perspective == AdaptivePerspective.TIME_DATA.name:
             if args.attribute == 'st':
@@ -115,6 +162,7 @@ def main():
                 adaptive_controlflow_approach = ControlflowAdaptiveApproach.WINDOW.name
 
     event_log = args.event_log
+    output_formats = [OutputFormat(f).name for f in args.output_formats]
     real_drifts = args.real_drifts
     if real_drifts and len(real_drifts) == 1 and real_drifts[0] == 0:  # no real drift present in the log
         real_drifts = []
@@ -148,6 +196,11 @@ def main():
             print(f'Adaptive control-flow approach: {adaptive_controlflow_approach}')
             print(f'Export sublogs: {args.save_sublogs}')
             print(f'Update process models: {args.no_update_model}')
+            print(f'Discovery backend: {args.discovery_backend}')
+            if args.quality_metrics:
+                print(f'Quality metrics: {args.quality_metrics}')
+            if args.speculative_discovery:
+                print(f'Speculative discovery: {args.speculative_discovery}')
 
     print(f'Metrics: {[m.value for m in metrics]}')
     print(f'Event log: {event_log}')
@@ -160,7 +213,10 @@ def main():
     parameters = None
     if approach == Approach.FIXED.name:
         parameters = IPDDParametersFixed(event_log, approach, ReadLogAs.TRACE.name, metrics,
-                                         WindowUnityFixed.UNITY.name, win_size)
+                                         WindowUnityFixed.UNITY.name, win_size, trace=args.trace,
+                                         memory_accounting=args.memory, output_formats=output_formats,
+                                         discovery_workers=args.discovery_workers, window_type=window_type,
+                                         stride=args.stride)
     elif approach == Approach.ADAPTIVE.name:
         if perspective == AdaptivePerspective.TIME_DATA.name:
             parameters = IPDDParametersAdaptive(event_log,
@@ -171,7 +227,10 @@ def main():
                                                 detector_class,
                                                 attribute,
                                                 attribute_name,
-                                                activities)
+                                                activities,
+                                                trace=args.trace,
+                                                memory_accounting=args.memory, output_formats=output_formats,
+                                                min_activity_support=args.min_activity_support)
         elif perspective == AdaptivePerspective.CONTROL_FLOW.name:
             parameters = IPDDParametersAdaptiveControlflow(event_log,
                                                            approach,
@@ -182,15 +241,29 @@ def main():
                                                            adaptive_controlflow_approach,
                                                            detector_class,
                                                            save_sublogs=args.save_sublogs,
-                                                           update_model=not args.no_update_model)
-    framework.run_script(parameters)
+                                                           update_model=not args.no_update_model,
+                                                           trace=args.trace,
+                                                           memory_accounting=args.memory, output_formats=output_formats,
+                                                           discovery_backend=args.discovery_backend,
+                                                           quality_metrics=args.quality_metrics,
+                                                           speculative_discovery=args.speculative_discovery)
+    profile_context = nullcontext()
+    if args.profile:
+        profile_context = profile_run(framework.get_profile_path('script'),
+                                      os.path.splitext(os.path.basename(event_log))[0], args.profile)
+    with profile_context:
+        framework.run_script(parameters)
 
-    running = framework.get_status_running()
-    while running:
-        print(f'Waiting for IPDD finishes ... Status running: {running}')
-        time.sleep(2)  # in seconds
         running = framework.get_status_running()
+        while running:
+            print(f'Waiting for IPDD finishes ... Status running: {running}')
+            time.sleep(2)  # in seconds
+            running = framework.get_status_running()
     print(f'IPDD finished drift analysis')
+    # update the performance metrics including the similarity metrics calculated asynchronously
+    framework.save_performance_metrics()
+    framework.save_trace()
+    framework.save_memory_accounting(stage='finish_metrics_calculation')
 
     detected_drifts = None
     total_of_itens = framework.get_number_of_items()
@@ -323,9 +396,19 @@ def run_IPDD_script(parameters, real_drifts=None):
         attribute_name_for_plot = parameters.attribute_name_for_plot
 
     print(f'Starting analyzing process drifts ...')
+    trace = getattr(parameters, 'trace', False)
+    memory = getattr(parameters, 'memory_accounting', False)
+    output_formats = getattr(parameters, 'output_formats', None)
+    profile = getattr(parameters, 'profile', None)
+    discovery_workers = getattr(parameters, 'discovery_workers', 0)
+    window_type = getattr(parameters, 'window_type', FixedWindowType.TUMBLING.name)
+    stride = getattr(parameters, 'stride', 1)
     if parameters.approach == Approach.FIXED.name:
         parameters = IPDDParametersFixed(event_log, parameters.approach, ReadLogAs.TRACE.name, metrics,
-                                         WindowUnityFixed.UNITY.name, win_size)
+                                         WindowUnityFixed.UNITY.name, win_size, trace=trace,
+                                         memory_accounting=memory, output_formats=output_formats,
+                                         discovery_workers=discovery_workers, window_type=window_type,
+                                         stride=stride)
     elif parameters.approach == Approach.ADAPTIVE.name:
         if parameters.perspective == AdaptivePerspective.TIME_DATA.name:
             parameters = IPDDParametersAdaptive(logname=event_log,
@@ -338,7 +421,10 @@ def run_IPDD_script(parameters, real_drifts=None):
                                                 attribute_name=attribute_name,
                                                 activities=activities,
                                                 activities_for_plot=activities_for_plot,
-                                                attribute_name_for_plot=attribute_name_for_plot)
+                                                attribute_name_for_plot=attribute_name_for_plot,
+                                                trace=trace,
+                                                memory_accounting=memory, output_formats=output_formats,
+                                                min_activity_support=getattr(parameters, 'min_activity_support', 0))
         elif parameters.perspective == AdaptivePerspective.CONTROL_FLOW.name:
             parameters = IPDDParametersAdaptiveControlflow(logname=event_log,
                                                            approach=parameters.approach,
@@ -349,15 +435,32 @@ def run_IPDD_script(parameters, real_drifts=None):
                                                            adaptive_controlflow_approach=parameters.adaptive_controlflow_approach,
                                                            detector_class=detector_class,
                                                            save_sublogs=parameters.save_sublogs,
-                                                           update_model=parameters.update_model)
-    framework.run_script(parameters)
+                                                           update_model=parameters.update_model,
+                                                           trace=trace,
+                                                           memory_accounting=memory, output_formats=output_formats,
+                                                           discovery_backend=getattr(parameters, 'discovery_backend',
+                                                                                     DiscoveryBackend.INDUCTIVE.name),
+                                                           quality_metrics=getattr(parameters, 'quality_metrics', None),
+                                                           speculative_discovery=getattr(parameters,
+                                                                                         'speculative_discovery',
+                                                                                         False))
+    profile_context = nullcontext()
+    if profile:
+        profile_context = profile_run(framework.get_profile_path('script'),
+                                      os.path.splitext(os.path.basename(event_log))[0], get_profile_mode(profile))
+    with profile_context:
+        framework.run_script(parameters)
 
-    running = framework.get_status_running()
-    while running:
-        print(f'Waiting for IPDD finishes ... Status running: {running}')
-        time.sleep(2)  # in seconds
         running = framework.get_status_running()
+        while running:
+            print(f'Waiting for IPDD finishes ... Status running: {running}')
+            time.sleep(2)  # in seconds
+            running = framework.get_status_running()
     print(f'IPDD finished drift analysis')
+    # update the performance metrics including the similarity metrics calculated asynchronously
+    framework.save_performance_metrics()
+    framework.save_trace()
+    framework.save_memory_accounting(stage='finish_metrics_calculation')
 
     detected_drifts = None
     total_of_itens = framework.get_number_of_items()
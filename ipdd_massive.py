@@ -65,14 +65,19 @@ class DatasetSampleConfiguration:
 
 import os
 import time
+from contextlib import nullcontext
+
 import pandas as pd
+import pyarrow as pa
 import re
 
-from components.evaluate.manage_evaluation_metrics import EvaluationMetricList
+from components.evaluate.manage_evaluation_metrics import EvaluationMetricList, ManageEvaluationMetrics
 from components.parameters import ReadLogAs, WindowUnityFixed, Approach, AttributeAdaptive, AdaptivePerspective, \
     ControlflowAdaptiveApproach
 from components.ippd_fw import InteractiveProcessDriftDetectionFW, IPDDParametersFixed, IPDDParametersAdaptive, \
     IPDDParametersAdaptiveControlflow
+from components.monitoring.profiler import profile_run, get_profile_mode
+from components.scenario_cache import scenario_cache
 
 DRIFTS_KEY = 'drifts - '
 DETECTED_AT_KEY = 'detected at - '
@@ -80,7 +85,24 @@ ACTIVITY_KEY = 'activity'
 DETECTOR_KEY = 'detector'
 
 
-def run_massive_adaptive_data(dataset_config, metrics=None):
+# run one scenario and wait until IPDD finishes
+# profile: False, True or the profile mode (deterministic or sampling) - the pstats and
+# collapsed stacks are saved in the evaluation path using the profile name
+def run_scenario(framework, parameters, profile=False, profile_name='', sleep_time=2):
+    profile_context = nullcontext()
+    if profile:
+        profile_context = profile_run(framework.get_profile_path('script'), profile_name, get_profile_mode(profile))
+    with profile_context:
+        framework.run_script(parameters)
+
+        running = framework.get_status_running()
+        while running:
+            print(f'Waiting for IPDD finishes ... Status running: {running}')
+            time.sleep(sleep_time)  # in seconds
+            running = framework.get_status_running()
+
+
+def run_massive_adaptive_data(dataset_config, metrics=None, profile=False, excel_report=False):
     # getting instance of the IPDD
     framework = InteractiveProcessDriftDetectionFW(script=True)
     if not metrics:
@@ -125,13 +147,7 @@ def run_massive_adaptive_data(dataset_config, metrics=None):
                                                     activities_for_plot=activities_for_plot,
                                                     attribute_name_for_plot=attribute_name_for_plot,
                                                     activities=activities)
-                framework.run_script(parameters)
-
-                running = framework.get_status_running()
-                while running:
-                    print(f'Waiting for IPDD finishes ... Status running: {running}')
-                    time.sleep(2)  # in seconds
-                    running = framework.get_status_running()
+                run_scenario(framework, parameters, profile, f'{os.path.splitext(log)[0]}_{at}_delta{d}')
                 print(f'Adaptive IPDD finished drift analysis on the data perspective')
                 detected_drifts = {}
                 # get the activities that report a drift using the change detector
@@ -146,15 +162,14 @@ def run_massive_adaptive_data(dataset_config, metrics=None):
                         print(
                             f'IPDD detect control-flow drift for activity {activity} in windows {windows} - traces {traces}')
 
-                out_filename = os.path.join(framework.get_evaluation_path('script'), f'{dataset_config.dataset_name}_results_IPDD_{Approach.ADAPTIVE.name}_'
-                                                                                     f'{AdaptivePerspective.TIME_DATA.name}_'
-                                                                                     f'{AttributeAdaptive.OTHER.name}-'
-                                                                                     f'{at}.xlsx')
-                df = pd.DataFrame.from_dict(dict_results, orient='index')
-                df.to_excel(out_filename)
+                out_filename = f'{dataset_config.dataset_name}_results_IPDD_{Approach.ADAPTIVE.name}_' \
+                               f'{AdaptivePerspective.TIME_DATA.name}_' \
+                               f'{AttributeAdaptive.OTHER.name}-' \
+                               f'{at}.parquet'
+                save_results(dict_results, framework.get_evaluation_path('script'), out_filename, excel_report)
 
 
-def run_massive_adaptive_time(dataset_config, metrics=None, evaluate=False):
+def run_massive_adaptive_time(dataset_config, metrics=None, evaluate=False, profile=False, excel_report=False):
     # getting instance of the IPDD
     framework = InteractiveProcessDriftDetectionFW(script=True)
     if not metrics:
@@ -213,13 +228,7 @@ def run_massive_adaptive_time(dataset_config, metrics=None, evaluate=False):
                                                 activities=activities,
                                                 activities_for_plot=activities_for_plot,
                                                     save_model_svg=True)
-            framework.run_script(parameters)
-
-            running = framework.get_status_running()
-            while running:
-                print(f'Waiting for IPDD finishes ... Status running: {running}')
-                time.sleep(2)  # in seconds
-                running = framework.get_status_running()
+            run_scenario(framework, parameters, profile, f'{os.path.splitext(log)[0]}_{detector.get_name()}{detector.get_parameters_string()}')
             print(f'Adaptive IPDD finished drift analysis on the data perspective')
             detected_drifts = {}
             # get the activities that report a drift using the change detector
@@ -237,15 +246,15 @@ def run_massive_adaptive_time(dataset_config, metrics=None, evaluate=False):
     out_filepath = framework.get_evaluation_path('script')
     out_filename = f'{dataset_config.dataset_name}_results_IPDD_{Approach.ADAPTIVE.name}_'\
                    f'{AdaptivePerspective.TIME_DATA.name}_' \
-                   f'{dataset_config.attribute}.xlsx'
+                   f'{dataset_config.attribute}.parquet'
 
-    df = pd.DataFrame.from_dict(dict_results, orient='index')
-    df.to_excel(os.path.join(out_filepath, out_filename))
+    save_results(dict_results, out_filepath, out_filename, excel_report)
     if evaluate:
-        calculate_metrics_massive(out_filepath, out_filename, dataset_config, True)
+        calculate_metrics_massive(out_filepath, out_filename, dataset_config, True, excel_report)
 
 
-def run_massive_fixed_controlflow(dataset_config, metrics=None, evaluate=None):
+def run_massive_fixed_controlflow(dataset_config, metrics=None, evaluate=None, profile=False, excel_report=False,
+                                  use_cache=True):
     # getting instance of the IPDD
     framework = InteractiveProcessDriftDetectionFW(script=True)
     if not metrics:
@@ -265,30 +274,30 @@ def run_massive_fixed_controlflow(dataset_config, metrics=None, evaluate=None):
             log_filename = os.path.join(dataset_config.input_path, log)
             parameters = IPDDParametersFixed(log_filename, Approach.FIXED.name, ReadLogAs.TRACE.name,
                                              metrics, WindowUnityFixed.UNITY.name, w)
-            framework.run_script(parameters)
-
-            running = framework.get_status_running()
-            while running:
-                print(f'Waiting for IPDD finishes ... Status running: {running}')
-                time.sleep(2)  # in seconds
-                running = framework.get_status_running()
-            print(f'Fixed IPDD finished drift analysis')
-            windows_with_drifts, detected_drifts = framework.get_windows_with_drifts()
+            # scenarios already run with the same log and parameters are read from the cache
+            cache_key = scenario_cache.get_key(parameters)
+            cached_results = scenario_cache.load(cache_key) if use_cache else None
+            if cached_results is None:
+                run_scenario(framework, parameters, profile, f'{os.path.splitext(log)[0]}_w{w}')
+                print(f'Fixed IPDD finished drift analysis')
+                windows_with_drifts, detected_drifts = framework.get_windows_with_drifts()
+                scenario_cache.save(cache_key, parameters, {'windows': windows_with_drifts, 'drifts': detected_drifts})
+            else:
+                print(f'Scenario found in the cache, skipping...')
+                windows_with_drifts, detected_drifts = cached_results['windows'], cached_results['drifts']
             dict_results[log][f'{DRIFTS_KEY}w={w}'] = detected_drifts
             print(f'Fixed IPDD detect control-flow drift in windows {windows_with_drifts} - traces {detected_drifts}')
 
-    out_filename = f'{dataset_config.dataset_name}_results_IPDD_{Approach.FIXED.name}.xlsx'
-    out_complete_filename = os.path.join(framework.get_evaluation_path('script'),
-                                         out_filename)
-    df = pd.DataFrame.from_dict(dict_results, orient='index')
-    df.to_excel(out_complete_filename)
+    out_filename = f'{dataset_config.dataset_name}_results_IPDD_{Approach.FIXED.name}.parquet'
+    save_results(dict_results, framework.get_evaluation_path('script'), out_filename, excel_report)
     if evaluate:
         calculate_metrics_massive(framework.get_evaluation_path('script'),
-                                  out_filename, dataset_config, True)
+                                  out_filename, dataset_config, True, excel_report)
 
 
 def run_massive_adaptive_controlflow(dataset_config, adaptive_approach, metrics=None, evaluate=False,
-                                     save_sublogs=False, save_model_png=False):
+                                     save_sublogs=False, save_model_png=False, profile=False, excel_report=False,
+                                     use_cache=True):
     # getting instance of the IPDD
     framework = InteractiveProcessDriftDetectionFW(script=True)
     if not metrics:
@@ -318,46 +327,49 @@ def run_massive_adaptive_controlflow(dataset_config, adaptive_approach, metrics=
                                                                adaptive_controlflow_approach=adaptive_approach.name,
                                                                detector_class=detector, save_sublogs=save_sublogs,
                                                                save_model_svg=save_model_png)
-                framework.run_script(parameters)
-
-                running = framework.get_status_running()
-                while running:
-                    print(f'Waiting for IPDD finishes ... Status running: {running}')
-                    time.sleep(20)  # in seconds
-                    running = framework.get_status_running()
-                print(f'Adaptive IPDD finished drift analysis')
-                detected_drifts = framework.get_initial_trace_indexes()
-                # remove the index 0
-                if detected_drifts:
-                    detected_drifts = detected_drifts[1:]
+                # scenarios already run with the same log and parameters are read from the cache
+                cache_key = scenario_cache.get_key(parameters)
+                cached_results = scenario_cache.load(cache_key) if use_cache else None
+                if cached_results is None:
+                    run_scenario(framework, parameters, profile, f'{os.path.splitext(log)[0]}_{adaptive_approach.name}_w{w}_{detector.get_name()}{detector.get_parameters_string()}', sleep_time=20)
+                    print(f'Adaptive IPDD finished drift analysis')
+                    detected_drifts = framework.get_initial_trace_indexes()
+                    # remove the index 0
+                    if detected_drifts:
+                        detected_drifts = detected_drifts[1:]
+                    scenario_cache.save(cache_key, parameters, {'drifts': detected_drifts})
+                else:
+                    print(f'Scenario found in the cache, skipping...')
+                    detected_drifts = cached_results['drifts']
                 dict_results[log][f'{DRIFTS_KEY}w={w} {DETECTOR_KEY}={detector.get_name()}{detector.get_parameters_string()}'] = detected_drifts
                 print(
                     f'Adaptive IPDD detect control-flow drifts in traces {detected_drifts}')
 
     out_filename = f'{dataset_config.dataset_name}_results_IPDD_{Approach.ADAPTIVE.name}' \
                    f'_{AdaptivePerspective.CONTROL_FLOW.name}' \
-                   f'_{adaptive_approach.name}.xlsx'
-    out_complete_filename = os.path.join(framework.get_evaluation_path('script'),
-                                         out_filename)
-    df = pd.DataFrame.from_dict(dict_results, orient='index')
-    df.to_excel(out_complete_filename)
+                   f'_{adaptive_approach.name}.parquet'
+    save_results(dict_results, framework.get_evaluation_path('script'), out_filename, excel_report)
     if evaluate:
         calculate_metrics_massive(framework.get_evaluation_path('script'),
-                                  out_filename, dataset_config, True)
+                                  out_filename, dataset_config, True, excel_report)
 
 
 def run_massive_adaptive_controlflow_trace_by_trace(dataset_config, metrics=None, evaluate=False,
-                                                    save_sublogs=False, save_model_svg=False):
+                                                    save_sublogs=False, save_model_svg=False, profile=False,
+                                                    excel_report=False, use_cache=True):
     run_massive_adaptive_controlflow(dataset_config,
                                      ControlflowAdaptiveApproach.TRACE,
-                                     metrics, evaluate, save_sublogs, save_model_svg)
+                                     metrics, evaluate, save_sublogs, save_model_svg, profile,
+                                     excel_report, use_cache)
 
 
 def run_massive_adaptive_controlflow_windowing(dataset_config, metrics=None, evaluate=False,
-                                               save_sublogs=False, save_model_svg=False):
+                                               save_sublogs=False, save_model_svg=False, profile=False,
+                                               excel_report=False, use_cache=True):
     run_massive_adaptive_controlflow(dataset_config,
                                      ControlflowAdaptiveApproach.WINDOW,
-                                     metrics, evaluate, save_sublogs, save_model_svg)
+                                     metrics, evaluate, save_sublogs, save_model_svg, profile,
+                                     excel_report, use_cache)
 
 
 def convert_list_to_int(string_list):
@@ -369,23 +381,103 @@ def convert_list_to_int(string_list):
     return integer_list
 
 
-def calculate_metrics_massive(filepath, filename, dataset_config, save_input_for_calculation=False):
+# The results of the massive experiments are saved in Parquet, one row for each log and configuration,
+# with the drifts stored as list columns, so they are read back without parsing
+# The Excel files (one column for each configuration) are only generated as an optional final report
+RESULTS_SCHEMA = pa.schema([('logname', pa.string()),
+                            ('configuration', pa.string()),
+                            ('drifts', pa.list_(pa.int64())),
+                            ('detected_at', pa.list_(pa.int64()))])
+
+
+def to_int_list(values):
+    if values is None:
+        return []
+    return [int(v) for v in values]
+
+
+# convert the results of the run_massive functions (keys DRIFTS_KEY/DETECTED_AT_KEY + configuration)
+# to the results table
+def get_results_dataframe(dict_results):
+    rows = {}
+    for logname in dict_results.keys():
+        for key, value in dict_results[logname].items():
+            if DRIFTS_KEY in key:
+                column, configuration = 'drifts', key[len(DRIFTS_KEY):]
+            elif DETECTED_AT_KEY in key:
+                column, configuration = 'detected_at', key[len(DETECTED_AT_KEY):]
+            else:
+                continue
+            row = rows.setdefault((logname, configuration), {'logname': logname, 'configuration': configuration,
+                                                             'drifts': [], 'detected_at': None})
+            row[column] = to_int_list(value)
+    return pd.DataFrame(list(rows.values()), columns=RESULTS_SCHEMA.names)
+
+
+def save_results(dict_results, filepath, filename, excel_report=False):
+    df = get_results_dataframe(dict_results)
+    complete_filename = os.path.join(filepath, filename)
+    print(f'Saving results at file {complete_filename}...')
+    df.to_parquet(complete_filename, schema=RESULTS_SCHEMA, index=False)
+    if excel_report:
+        export_results_report(df, f'{os.path.splitext(complete_filename)[0]}.xlsx')
+
+
+def read_results(complete_filename):
+    if complete_filename.endswith('.xlsx'):
+        return read_results_report(complete_filename)
+    df = pd.read_parquet(complete_filename)
+    for column in ['drifts', 'detected_at']:
+        df[column] = [to_int_list(v) if v is not None else None for v in df[column]]
+    return df
+
+
+# Excel report with one line for each log and one column for each configuration
+def export_results_report(df, complete_filename):
+    report = {}
+    for row in df.itertuples(index=False):
+        report.setdefault(row.logname, {})
+        report[row.logname][f'{DRIFTS_KEY}{row.configuration}'] = row.drifts
+        if row.detected_at is not None:
+            report[row.logname][f'{DETECTED_AT_KEY}{row.configuration}'] = row.detected_at
+    print(f'Saving report at file {complete_filename}...')
+    pd.DataFrame.from_dict(report, orient='index').to_excel(complete_filename)
+
+
+# results saved by previous versions (Excel with the lists of drifts as strings)
+def read_results_report(complete_filename):
+    complete_results = pd.read_excel(complete_filename, index_col=0).T.to_dict()
+    for logname in complete_results.keys():
+        for key in complete_results[logname].keys():
+            # get list of trace ids from excel and convert to a list of integers
+            if type(complete_results[logname][key]) == str:
+                trace_ids_list = complete_results[logname][key][1:-1].split(",")
+            else:  # for activities not present in the log
+                trace_ids_list = []
+            complete_results[logname][key] = convert_list_to_int(trace_ids_list)
+    return get_results_dataframe(complete_results)
+
+
+def calculate_metrics_massive(filepath, filename, dataset_config, save_input_for_calculation=False,
+                              excel_report=False):
     metrics = [item.value for item in EvaluationMetricList]
-    # getting instance of the IPDD
-    framework = InteractiveProcessDriftDetectionFW(script=True)
 
     input_filename = os.path.join(filepath, filename)
     print(f'*****************************************************************')
     print(f'Calculating metrics for file {input_filename}...')
     print(f'*****************************************************************')
-    df = pd.read_excel(input_filename, index_col=0)
-    complete_results = df.T.to_dict()
-    metrics_results = {}
-    for logname in complete_results.keys():
+    df = read_results(input_filename)
+    # results evaluated (logname, configuration) with the real and detected drifts
+    grid = []
+    grid_real_drifts = []
+    grid_detected_drifts = []
+    grid_items = []
+    for row in df.itertuples(index=False):
+        logname = row.logname
+        configuration = row.configuration
         if logname not in dataset_config.lognames:
             print(f'Logname {logname} not configured for the dataset. IGNORING...')
             continue
-        metrics_results[logname] = {}
         regexp = r'(\d.*).xes'
         if match := re.search(regexp, logname):
             logsize = match.group(1)
@@ -393,80 +485,77 @@ def calculate_metrics_massive(filepath, filename, dataset_config, save_input_for
             # if the name do not use the pattern for log size, use the logname
             logsize = logname
 
-        change_points = {}
-        detected_at = {}
-        for key in complete_results[logname].keys():
-            # get list of trace ids from excel and convert to a list of integers
-            if type(complete_results[logname][key]) == str:
-                trace_ids_list = complete_results[logname][key][1:-1].split(",")
-            else:  # for activities not present in the log
-                trace_ids_list = []
-            trace_ids_list = convert_list_to_int(trace_ids_list)
-
-            # insert into change points or detected points
-            if DRIFTS_KEY in key:
-                configuration = key[len(DRIFTS_KEY):]
-                change_points[configuration] = trace_ids_list
-            elif DETECTED_AT_KEY in key:
-                configuration = key[len(DETECTED_AT_KEY):]
-                detected_at[configuration] = trace_ids_list
-
-        for configuration in change_points.keys():
-            if hasattr(dataset_config, "activities") and dataset_config.activities is not None:
-                # get the activity name in the configuration
-                regexp = fr'{ACTIVITY_KEY}=(.*)'
-                if match := re.search(regexp, configuration):
-                    activity_reported = match.group(1)
-                else:
-                    print('Could not find the activity name in the results')
-                    return
-
-                # in this case the drifts are reported by activity (Time/Data perspective)
-                for a in dataset_config.activities:
-                    if a == activity_reported:
-                        # get the actual change points
-                        if (logsize in dataset_config.actual_change_points[activity_reported]):
-                            real_change_points = dataset_config.actual_change_points[activity_reported][logsize]
-                            instances = dataset_config.number_of_instances[activity_reported][logsize]
-                        else:
-                            real_change_points = dataset_config.actual_change_points[activity_reported][logname]
-                            instances = dataset_config.number_of_instances[activity_reported][logname]
-
-                        # get the detected at information if available and convert to a list of integers
-                        metrics_summary = framework.evaluate(real_change_points,
-                                                             change_points[configuration],
-                                                             instances)
-                        # add the calculated metrics to the dictionary
-                        if save_input_for_calculation:
-                            metrics_results[logname][f'Detected drifts {configuration}'] = change_points[configuration]
-                            if len(detected_at) > 0:
-                                metrics_results[logname][f'Detected at {configuration}'] = detected_at[configuration]
-                            metrics_results[logname][f'Real drifts {configuration}'] = real_change_points
-                        for m in metrics:
-                            metrics_results[logname][f'{m} {configuration}'] = metrics_summary[m]
+        if hasattr(dataset_config, "activities") and dataset_config.activities is not None:
+            # get the activity name in the configuration
+            regexp = fr'{ACTIVITY_KEY}=(.*)'
+            if match := re.search(regexp, configuration):
+                activity_reported = match.group(1)
             else:
-                # get the actual change points
-                real_change_points = dataset_config.actual_change_points[logsize]
-                instances = dataset_config.number_of_instances[logsize]
-
-                # get the detected at information if available and convert to a list of integers
-                metrics_summary = framework.evaluate(real_change_points,
-                                                     change_points[configuration],
-                                                     instances)
-                # add the calculated metrics to the dictionary
-                if save_input_for_calculation:
-                    metrics_results[logname][f'Detected drifts {configuration}'] = change_points[configuration]
-                    if len(detected_at) > 0:
-                        metrics_results[logname][f'Detected at {configuration}'] = detected_at[configuration]
-                    metrics_results[logname][f'Real drifts {configuration}'] = real_change_points
-                for m in metrics:
-                    metrics_results[logname][f'{m} {configuration}'] = metrics_summary[m]
-    df = pd.DataFrame(metrics_results).T
-    out_filename = filename[:-(len('.xlsx'))]
-    out_filename = f'metrics_{out_filename}.xlsx'
-    out_complete_filename = os.path.join(filepath, out_filename)
+                print('Could not find the activity name in the results')
+                return
+
+            # in this case the drifts are reported by activity (Time/Data perspective)
+            if activity_reported not in dataset_config.activities:
+                continue
+            # get the actual change points
+            if logsize in dataset_config.actual_change_points[activity_reported]:
+                real_change_points = dataset_config.actual_change_points[activity_reported][logsize]
+                instances = dataset_config.number_of_instances[activity_reported][logsize]
+            else:
+                real_change_points = dataset_config.actual_change_points[activity_reported][logname]
+                instances = dataset_config.number_of_instances[activity_reported][logname]
+        else:
+            # get the actual change points
+            real_change_points = dataset_config.actual_change_points[logsize]
+            instances = dataset_config.number_of_instances[logsize]
+        grid.append(row)
+        grid_real_drifts.append(real_change_points)
+        grid_detected_drifts.append(row.drifts)
+        grid_items.append(instances)
+
+    # calculate the metrics of all the results (configurations x logs) at once
+    values = ManageEvaluationMetrics.calculate_evaluation_metrics_grid(metrics, grid_real_drifts,
+                                                                       grid_detected_drifts, grid_items)
+    df_metrics = pd.DataFrame({
+        'logname': [row.logname for row in grid],
+        'configuration': [row.configuration for row in grid],
+        'real_drifts': [to_int_list(r) for r in grid_real_drifts],
+        'detected_drifts': [row.drifts for row in grid],
+        'detected_at': [row.detected_at for row in grid],
+        **{m: values[m] for m in metrics}
+    })
+    out_filename = f'metrics_{os.path.splitext(filename)[0]}'
+    out_complete_filename = os.path.join(filepath, f'{out_filename}.parquet')
     print(f'*****************************************************************')
     print(f'Metrics for file {input_filename} calculated')
     print(f'Saving results at file {out_complete_filename}...')
-    df.to_excel(out_complete_filename)
+    schema = pa.schema([('logname', pa.string()),
+                        ('configuration', pa.string()),
+                        ('real_drifts', pa.list_(pa.int64())),
+                        ('detected_drifts', pa.list_(pa.int64())),
+                        ('detected_at', pa.list_(pa.int64()))] +
+                       [(m, pa.float64()) for m in metrics])
+    df_metrics.to_parquet(out_complete_filename, schema=schema, index=False)
+    if excel_report:
+        export_metrics_report(df_metrics, metrics, os.path.join(filepath, f'{out_filename}.xlsx'),
+                              save_input_for_calculation)
     print(f'*****************************************************************')
+    return df_metrics
+
+
+# Excel report with one line for each log and the metrics of each configuration in columns
+def export_metrics_report(df_metrics, metrics, complete_filename, save_input_for_calculation=False):
+    report = {}
+    for row in df_metrics.to_dict('records'):
+        logname = row['logname']
+        configuration = row['configuration']
+        report.setdefault(logname, {})
+        if save_input_for_calculation:
+            report[logname][f'Detected drifts {configuration}'] = row['detected_drifts']
+            if row['detected_at'] is not None:
+                report[logname][f'Detected at {configuration}'] = row['detected_at']
+            report[logname][f'Real drifts {configuration}'] = row['real_drifts']
+        for m in metrics:
+            report[logname][f'{m} {configuration}'] = row[m]
+    print(f'Saving report at file {complete_filename}...')
+    pd.DataFrame(report).T.to_excel(complete_filename)
@@ -17,6 +17,7 @@ from components.adaptive.detectors import SelectDetector, ConceptDriftDetector
 from components.evaluate.manage_evaluation_metrics import EvaluationMetricList
 from components.parameters import AttributeAdaptive
 from ipdd_massive import run_massive_adaptive_time, DETECTOR_KEY, ACTIVITY_KEY
+from experiments_analysis.results_warehouse import results_warehouse
 import matplotlib.pyplot as plt
 import os
 from pm4py.objects.log.util import interval_lifecycle
@@ -308,7 +309,7 @@ def extract_durations_from_log(log_configuration):
 
 def generate_ipdd_plot_detectors(approach, folder, filename, metric_name, dataset_config, print_plot_name=True):
     complete_filename = os.path.join(folder, filename)
-    df = pd.read_excel(complete_filename, index_col=0)
+    df = results_warehouse.read_table(complete_filename, like=metric_name)
     df.index.name = 'logname'
     print(f'Reading file {filename}')
     # filter the selected metric
@@ -381,7 +382,7 @@ def generate_ipdd_plot_detectors(approach, folder, filename, metric_name, datase
 
 def generate_ipdd_plot_detectors_by_type(approach, folder, filename, metric_name, dataset_config, print_plot_name=True):
     complete_filename = os.path.join(folder, filename)
-    df = pd.read_excel(complete_filename, index_col=0)
+    df = results_warehouse.read_table(complete_filename, like=metric_name)
     df.index.name = 'logname'
     print(f'Reading file {filename}')
     # filter the selected metric
@@ -449,7 +450,7 @@ def generate_ipdd_plot_detectors_by_type(approach, folder, filename, metric_name
 
 def MCDM_analysis(plot_name, folder, file, metrics_MCDM):
     complete_filename = os.path.join(folder, file)
-    df = pd.read_excel(complete_filename, index_col=0)
+    df = results_warehouse.read_table(complete_filename)
     df.index.name = 'logname'
     print(f'Reading file {file}')
 
@@ -565,7 +566,7 @@ def analyze_IPDD_time():
 
 def delta_analysis(plot_name, folder, file, metrics_MCDM):
     complete_filename = os.path.join(folder, file)
-    df = pd.read_excel(complete_filename, index_col=0)
+    df = results_warehouse.read_table(complete_filename)
     df.index.name = 'logname'
     print(f'Reading file {file}')
 
@@ -802,7 +803,7 @@ if __name__ == '__main__':
     # dataset3 = RealEventLogConfiguration()
 
     # run experiments
-    run_massive_adaptive_time(dataset1, evaluate=True)
+    run_massive_adaptive_time(dataset1, evaluate=True, excel_report=True)
     run_massive_adaptive_time(dataset2)
     # run_massive_adaptive_time(dataset3)
 
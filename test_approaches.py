@@ -1,11 +1,13 @@
 import os
 
+import pytest
+
 from components.adaptive.detectors import SelectDetector, ConceptDriftDetector
 from components.dfg_definitions import Metric
 from components.evaluate.manage_evaluation_metrics import EvaluationMetricList
 from components.ippd_fw import IPDDParametersFixed, IPDDParametersAdaptiveControlflow, IPDDParametersAdaptive
 from components.parameters import Approach, WindowUnityFixed, ReadLogAs, AdaptivePerspective, \
-    ControlflowAdaptiveApproach, AttributeAdaptive
+    ControlflowAdaptiveApproach, AttributeAdaptive, FixedWindowType, QualityMetric
 from ipdd_cli import run_IPDD_script
 
 
@@ -56,6 +58,28 @@ def test_fixed_control_flow_detection_nok2():
     assert metrics[EvaluationMetricList.F_SCORE.value] == 0
 
 
+def test_fixed_sliding_window_parameters_nok():
+    log_filename = os.path.join('datasets/dataset1', 'cb2.5k.xes')
+    metrics = [Metric.NODES.name, Metric.EDGES.name]
+    for stride in [0, -1]:
+        with pytest.raises(ValueError):
+            IPDDParametersFixed(logname=log_filename, approach=Approach.FIXED.name, read_log_as=ReadLogAs.TRACE.name,
+                                metrics=metrics, winunity=WindowUnityFixed.UNITY.name, winsize=250,
+                                window_type=FixedWindowType.SLIDING.name, stride=stride)
+    # the sliding windows are defined by the number of traces
+    with pytest.raises(ValueError):
+        IPDDParametersFixed(logname=log_filename, approach=Approach.FIXED.name, read_log_as=ReadLogAs.TRACE.name,
+                            metrics=metrics, winunity=WindowUnityFixed.HOUR.name, winsize=2,
+                            window_type=FixedWindowType.SLIDING.name)
+    with pytest.raises(ValueError):
+        IPDDParametersFixed(logname=log_filename, approach=Approach.FIXED.name, read_log_as=ReadLogAs.EVENT.name,
+                            metrics=metrics, winunity=WindowUnityFixed.UNITY.name, winsize=250,
+                            window_type=FixedWindowType.SLIDING.name)
+    # the stride is ignored by the tumbling windows
+    IPDDParametersFixed(logname=log_filename, approach=Approach.FIXED.name, read_log_as=ReadLogAs.TRACE.name,
+                        metrics=metrics, winunity=WindowUnityFixed.HOUR.name, winsize=2, stride=0)
+
+
 def test_adaptive_control_flow_trace_ok1():
     input_path = 'datasets/dataset1'
     log = 'cm2.5k.xes'
@@ -162,6 +186,36 @@ def test_adaptive_control_flow_windowing_ok1():
     assert mean_delay == 27.67 # after fixing river
 
 
+def test_adaptive_control_flow_quality_metrics_nok():
+    log_filename = os.path.join('datasets/dataset1', 'cb2.5k.xes')
+    detector_class = SelectDetector.get_detector_instance(ConceptDriftDetector.ADWIN.name)
+    unsupported = [
+        (ControlflowAdaptiveApproach.TRACE.name, QualityMetric.PRECISION_FP.value),
+        (ControlflowAdaptiveApproach.TRACE.name, QualityMetric.PRECISION_DFG.value),
+        (ControlflowAdaptiveApproach.WINDOW.name, QualityMetric.PRECISION_ETC.value),
+    ]
+    supported = [
+        (ControlflowAdaptiveApproach.TRACE.name, [QualityMetric.FITNESS_DFG.value, QualityMetric.PRECISION_AL.value]),
+        (ControlflowAdaptiveApproach.WINDOW.name, [QualityMetric.FITNESS_DFG.value,
+                                                   QualityMetric.PRECISION_DFG.value]),
+    ]
+    for approach, metric in unsupported:
+        with pytest.raises(ValueError):
+            IPDDParametersAdaptiveControlflow(logname=log_filename, approach=Approach.ADAPTIVE.name,
+                                              perspective=AdaptivePerspective.CONTROL_FLOW.name,
+                                              read_log_as=ReadLogAs.TRACE.name, win_size=100,
+                                              metrics=[Metric.NODES.name, Metric.EDGES.name],
+                                              adaptive_controlflow_approach=approach, detector_class=detector_class,
+                                              quality_metrics=[QualityMetric.FITNESS_DFG.value, metric])
+    for approach, metrics in supported:
+        IPDDParametersAdaptiveControlflow(logname=log_filename, approach=Approach.ADAPTIVE.name,
+                                          perspective=AdaptivePerspective.CONTROL_FLOW.name,
+                                          read_log_as=ReadLogAs.TRACE.name, win_size=100,
+                                          metrics=[Metric.NODES.name, Metric.EDGES.name],
+                                          adaptive_controlflow_approach=approach, detector_class=detector_class,
+                                          quality_metrics=metrics)
+
+
 def test_adaptive_time_ok1():
     input_path = ('datasets/dataset_manufacturing/initial_scenarios')
     log = 'DR_MS.xes'
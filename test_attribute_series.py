@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.adaptive.attribute_series import AttributeSeries, AttributeRetention
+
+
+def fill(series, total):
+    for i in range(total):
+        series.append(i, float(i * 10), 1000.0 + i, f'case{i}')
+
+
+def test_keep_all_grows_and_keeps_order():
+    series = AttributeSeries()
+    fill(series, 3000)
+    df = series.to_dataframe()
+    assert len(series) == 3000
+    assert list(df['index']) == list(range(3000))
+    assert list(df['value']) == [i * 10.0 for i in range(3000)]
+    assert df['case_id'].iloc[-1] == 'case2999'
+    assert list(df.index) == list(range(3000))
+
+
+def test_same_index_replaces_the_value():
+    series = AttributeSeries()
+    series.append(0, 1.0, 1000.0, 'case0')
+    series.append(0, 2.0, 1001.0, 'case0')
+    series.append(1, 3.0, 1002.0, 'case1')
+    df = series.to_dataframe()
+    assert len(series) == 2
+    assert list(df['value']) == [2.0, 3.0]
+
+
+def test_ring_buffer_keeps_last_values():
+    series = AttributeSeries(AttributeRetention.RING_BUFFER.name, max_values=100)
+    fill(series, 250)
+    df = series.to_dataframe()
+    assert len(series) == 250
+    assert list(df['index']) == list(range(150, 250))
+    # the row labels are the positions in the complete series
+    assert list(df.index) == list(range(150, 250))
+
+
+def test_spill_reads_back_all_values(tmp_path):
+    series = AttributeSeries(AttributeRetention.SPILL.name, max_values=100, spill_path=str(tmp_path))
+    fill(series, 350)
+    assert len(series.spilled_files) == 3
+    df = series.to_dataframe()
+    assert list(df['index']) == list(range(350))
+    assert list(df['case_id']) == [f'case{i}' for i in range(350)]
+    series.clear()
+    assert not any(os.listdir(tmp_path))
+
+
+def test_retention_requires_max_values():
+    with pytest.raises(ValueError):
+        AttributeSeries(AttributeRetention.RING_BUFFER.name)
+
+
+def test_timestamps_with_timezone():
+    series = AttributeSeries()
+    timestamps = pd.date_range('2020-01-01', periods=5, freq='h', tz='Europe/Lisbon')
+    for i, timestamp in enumerate(timestamps):
+        series.append(i, float(i), timestamp, f'case{i}')
+    df = series.to_dataframe()
+    assert list(df['timestamp']) == list(timestamps)
+    assert np.array_equal(df['value'].to_numpy(), np.arange(5, dtype=float))
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from components.decimation import decimate, DecimationMethod
+
+
+def test_decimate_short_series_unchanged():
+    x = np.arange(100)
+    y = np.sin(x)
+    decimated_x, decimated_y = decimate(x, y, max_points=200)
+    assert np.array_equal(decimated_x, x)
+    assert np.array_equal(decimated_y, y)
+
+
+def test_decimate_lttb_keeps_extremes_and_limits():
+    x = np.arange(10000)
+    y = np.zeros(10000)
+    y[5000] = 100
+    decimated_x, decimated_y = decimate(x, y, max_points=100)
+    assert len(decimated_x) == 100
+    assert decimated_x[0] == 0 and decimated_x[-1] == 9999
+    # the peak forms the largest triangle in its bucket
+    assert 5000 in decimated_x
+    assert np.all(np.diff(decimated_x) > 0)
+
+
+def test_decimate_minmax_keeps_min_and_max_of_each_bucket():
+    rng = np.random.default_rng(42)
+    x = np.arange(5000)
+    y = rng.normal(size=5000)
+    decimated_x, decimated_y = decimate(x, y, max_points=100, method=DecimationMethod.MINMAX)
+    assert len(decimated_x) <= 100
+    assert y.min() in decimated_y
+    assert y.max() in decimated_y
+    assert np.array_equal(decimated_y, y[decimated_x])
+
+
+def test_decimate_keeps_points_around_change_points():
+    x = np.arange(10000)
+    y = np.ones(10000)
+    decimated_x, decimated_y = decimate(x, y, max_points=50, keep_x=[1234, 8765])
+    assert {1233, 1234, 8764, 8765}.issubset(set(decimated_x))
+
+
+def test_decimate_timestamps():
+    x = pd.date_range('2020-01-01', periods=5000, freq='h').to_numpy()
+    y = np.arange(5000, dtype=float)
+    decimated_x, decimated_y = decimate(x, y, max_points=100)
+    assert len(decimated_x) == 100
+    assert decimated_x.dtype == x.dtype
+    assert decimated_x[0] == x[0] and decimated_x[-1] == x[-1]
@@ -0,0 +1,72 @@
+import numpy as np
+from river import drift
+
+from components.adaptive.detector_bank import AdwinBank, HddmWBank
+from components.adaptive.detectors import SelectDetector, ConceptDriftDetector
+
+
+def river_drifts(detector, values):
+    drifts = []
+    for i, value in enumerate(values):
+        detector.update(value)
+        if detector.drift_detected:
+            drifts.append(i)
+    return drifts
+
+
+def bank_drifts(bank, streams):
+    # row k of the batch has the k-th value of each stream
+    values = np.full((max(len(s) for s in streams), len(streams)), np.nan)
+    for j, s in enumerate(streams):
+        values[:len(s), j] = s
+    drifts = [[] for _ in streams]
+    for j, i in bank.update_batch(values):
+        drifts[j].append(i)
+    return drifts
+
+
+def step_streams():
+    rng = np.random.default_rng(7)
+    streams = []
+    for level in [0.1, 0.3, 0.5]:
+        # values in [0, 1], with a change in the mean in the middle of the stream
+        values = np.concatenate([rng.uniform(0, level, 500), rng.uniform(1 - level, 1, 500)])
+        streams.append(values)
+    # streams with different lengths
+    streams.append(rng.uniform(0, 1, 300))
+    return streams
+
+
+def test_hddm_w_bank_matches_river():
+    streams = step_streams()
+    drifts = bank_drifts(HddmWBank(len(streams)), streams)
+    for values, detected in zip(streams, drifts):
+        assert detected == river_drifts(drift.binary.HDDM_W(), values)
+    # the change of the first streams is detected
+    assert all(len(detected) > 0 for detected in drifts[:3])
+
+
+def test_hddm_w_bank_two_sided_matches_river():
+    streams = [s[::-1] for s in step_streams()]
+    bank = HddmWBank(len(streams), two_sided_test=True)
+    for values, detected in zip(streams, bank_drifts(bank, streams)):
+        assert detected == river_drifts(drift.binary.HDDM_W(two_sided_test=True), values)
+
+
+def test_adwin_bank_detects_the_step_change():
+    streams = step_streams()[:3]
+    drifts = bank_drifts(AdwinBank(len(streams)), streams)
+    for values, detected in zip(streams, drifts):
+        expected = river_drifts(drift.ADWIN(), values)
+        # river compresses the window in buckets, so the bank may detect the change some values before
+        assert len(detected) == len(expected) == 1
+        assert 500 <= detected[0] <= expected[0]
+
+
+def test_detector_bank_uses_the_detector_parameters():
+    parameters = {'drift_confidence': 0.001, 'warning_confidence': 0.005, 'lambda_val': 0.1, 'two_sided_test': False}
+    bank = SelectDetector.get_detector_bank(ConceptDriftDetector.HDDM_W.name, 2, parameters)
+    assert isinstance(bank, HddmWBank)
+    assert bank.lambda_val == 0.1
+    assert SelectDetector.get_detector_instance(ConceptDriftDetector.HDDM_W.name).exact_bank
+    assert not SelectDetector.get_detector_instance(ConceptDriftDetector.ADWIN.name).exact_bank
@@ -0,0 +1,122 @@
+import os
+
+from components.discovery.discovery_cache import DiscoveryCache
+from components.monitoring.performance_metrics import performance_metrics
+
+
+def counting_discover(calls, model):
+    def discover():
+        calls.append(model)
+        return model
+    return discover
+
+
+def test_get_model_discovers_once():
+    performance_metrics.reset()
+    cache = DiscoveryCache()
+    calls = []
+    assert cache.get_model('petri_net', 'f1', counting_discover(calls, 'model1')) == 'model1'
+    assert cache.get_model('petri_net', 'f1', counting_discover(calls, 'other')) == 'model1'
+    # models of different kinds have different entries
+    assert cache.get_model('process_tree', 'f1', counting_discover(calls, 'tree1')) == 'tree1'
+    assert calls == ['model1', 'tree1']
+    assert performance_metrics.counters['discovery_cache_hits'] == 1
+
+
+def test_least_recently_used_model_is_evicted():
+    cache = DiscoveryCache(max_models=2)
+    calls = []
+    cache.get_model('petri_net', 'f1', counting_discover(calls, 'model1'))
+    cache.get_model('petri_net', 'f2', counting_discover(calls, 'model2'))
+    # f1 becomes the most recently used, so f2 is evicted by f3
+    cache.get_model('petri_net', 'f1', counting_discover(calls, 'model1'))
+    cache.get_model('petri_net', 'f3', counting_discover(calls, 'model3'))
+    assert list(cache.models) == [('petri_net', 'f1'), ('petri_net', 'f3')]
+    cache.get_model('petri_net', 'f2', counting_discover(calls, 'model2'))
+    assert calls == ['model1', 'model2', 'model3', 'model2']
+
+
+def write_file(calls, content):
+    def export(filename):
+        calls.append(filename)
+        with open(filename, 'w') as f:
+            f.write(content)
+    return export
+
+
+def test_save_file_copies_the_first_occurrence(tmp_path):
+    performance_metrics.reset()
+    cache = DiscoveryCache()
+    calls = []
+    first = str(tmp_path / 'window1.pnml')
+    second = str(tmp_path / 'window2.pnml')
+    cache.save_file('petri_net', 'f1', first, write_file(calls, 'model1'))
+    cache.save_file('petri_net', 'f1', second, write_file(calls, 'other'))
+    assert calls == [first]
+    assert not os.path.samefile(first, second)
+    with open(second) as f:
+        assert f.read() == 'model1'
+    assert performance_metrics.counters['deduplicated_models'] == 1
+    # saving again in the same file does nothing
+    cache.save_file('petri_net', 'f1', first, write_file(calls, 'other'))
+    assert calls == [first]
+
+
+def test_exporting_a_copy_does_not_change_the_first_occurrence(tmp_path):
+    cache = DiscoveryCache()
+    calls = []
+    first = str(tmp_path / 'dfg_w1.gv')
+    second = str(tmp_path / 'dfg_w2.gv')
+    cache.save_file('dfg', 'f1', first, write_file(calls, 'model1'))
+    cache.save_file('dfg', 'f1', second, write_file(calls, 'model1'))
+    # another model saved in the file of the copy (e.g., by a later run)
+    cache.save_file('dfg', 'f2', second, write_file(calls, 'model2'))
+    with open(first) as f:
+        assert f.read() == 'model1'
+    with open(second) as f:
+        assert f.read() == 'model2'
+
+
+def test_existing_hard_link_is_replaced(tmp_path):
+    cache = DiscoveryCache()
+    calls = []
+    first = str(tmp_path / 'dfg_w1.gv')
+    second = str(tmp_path / 'dfg_w2.gv')
+    write_file(calls, 'model1')(first)
+    os.link(first, second)
+    cache.save_file('dfg', 'f2', second, write_file(calls, 'model2'))
+    with open(first) as f:
+        assert f.read() == 'model1'
+
+
+def test_files_are_not_shared_between_directories_or_runs(tmp_path):
+    cache = DiscoveryCache()
+    calls = []
+    os.makedirs(str(tmp_path / 'run1'))
+    os.makedirs(str(tmp_path / 'run2'))
+    first = str(tmp_path / 'run1' / 'window1.pnml')
+    other_directory = str(tmp_path / 'run2' / 'window1.pnml')
+    cache.save_file('petri_net', 'f1', first, write_file(calls, 'model1'))
+    cache.save_file('petri_net', 'f1', other_directory, write_file(calls, 'model1'))
+    assert calls == [first, other_directory]
+    cache.clear_files()
+    second = str(tmp_path / 'run1' / 'window2.pnml')
+    cache.save_file('petri_net', 'f1', second, write_file(calls, 'model1'))
+    assert calls == [first, other_directory, second]
+
+
+def test_save_file_exports_other_formats_and_missing_files(tmp_path):
+    cache = DiscoveryCache()
+    calls = []
+    pnml = str(tmp_path / 'window1.pnml')
+    svg = str(tmp_path / 'window1.svg')
+    cache.save_file('petri_net', 'f1', pnml, write_file(calls, 'model1'))
+    cache.save_file('petri_net', 'f1', svg, write_file(calls, 'image1'))
+    assert calls == [pnml, svg]
+    # the first file was removed, so the model is exported again
+    os.remove(pnml)
+    other = str(tmp_path / 'window2.pnml')
+    cache.save_file('petri_net', 'f1', other, write_file(calls, 'model1'))
+    assert calls == [pnml, svg, other]
+    with open(other) as f:
+        assert f.read() == 'model1'
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from components.evaluate.drift_matching import DriftMatching
+from components.evaluate.manage_evaluation_metrics import Fscore, Precision, Recall, FPR, MeanDelay, \
+    ManageEvaluationMetrics, EvaluationMetricList
+
+
+# list-based matching used before DriftMatching, kept as the reference of the matching rules
+def reference_basic_metrics(real_drifts, detected_drifts, items):
+    real_drifts = sorted(real_drifts)
+    tp = fp = fn = 0
+    total_distance = 0
+    for detected_cp in sorted(detected_drifts):
+        possible_real_drifts = sorted([cp for cp in real_drifts if detected_cp >= cp], reverse=True)
+        if len(possible_real_drifts) > 0:
+            total_distance += detected_cp - possible_real_drifts[0]
+            tp += 1
+            # the older real drifts are not detected anymore
+            fn += len(possible_real_drifts) - 1
+            for rp in possible_real_drifts:
+                real_drifts.remove(rp)
+        else:
+            fp += 1
+    fn += len(real_drifts)
+    return tp, fp, fn, items - tp - fp - fn, total_distance
+
+
+def reference_metrics(real_drifts, detected_drifts, items):
+    tp, fp, fn, tn, total_distance = reference_basic_metrics(real_drifts, detected_drifts, items)
+    precision = tp / (tp + fp) if tp + fp > 0 else 0
+    recall = tp / (tp + fn) if tp + fn > 0 else 0
+    f_score = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0
+    return {
+        EvaluationMetricList.F_SCORE.value: f_score,
+        EvaluationMetricList.PRECISION.value: precision,
+        EvaluationMetricList.RECALL.value: recall,
+        EvaluationMetricList.FPR.value: fp / (fp + tn),
+        EvaluationMetricList.MEAN_DELAY.value: total_distance / tp if tp > 0 else 0,
+    }
+
+
+def random_cases(seed, total):
+    rng = np.random.default_rng(seed)
+    cases = []
+    for _ in range(total):
+        items = int(rng.integers(50, 2000))
+        # few drifts in a small range to have repeated and close drifts
+        high = int(rng.choice([20, items]))
+        real = rng.integers(0, high, rng.integers(0, 6)).tolist()
+        detected = rng.integers(0, high, rng.integers(0, 8)).tolist()
+        cases.append((real, detected, items))
+    return cases
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_grid_matching_matches_reference(seed):
+    cases = random_cases(seed, 200)
+    matching = DriftMatching(*zip(*cases))
+    for k, (real, detected, items) in enumerate(cases):
+        expected = reference_basic_metrics(real, detected, items)
+        assert (matching.tp[k], matching.fp[k], matching.fn[k], matching.tn[k],
+                matching.total_distance[k]) == expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_evaluation_metrics_match_reference(seed):
+    metric_classes = {
+        EvaluationMetricList.F_SCORE.value: Fscore,
+        EvaluationMetricList.PRECISION.value: Precision,
+        EvaluationMetricList.RECALL.value: Recall,
+        EvaluationMetricList.FPR.value: FPR,
+        EvaluationMetricList.MEAN_DELAY.value: MeanDelay,
+    }
+    cases = random_cases(100 + seed, 100)
+    grid = ManageEvaluationMetrics.calculate_evaluation_metrics_grid(list(metric_classes), *zip(*cases))
+    for k, (real, detected, items) in enumerate(cases):
+        expected = reference_metrics(real, detected, items)
+        for name, metric_class in metric_classes.items():
+            assert metric_class(list(real), list(detected), items).calculate() == pytest.approx(expected[name])
+            assert grid[name][k] == pytest.approx(expected[name])
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_saved_values_keep_the_types_of_the_metric_classes(seed):
+    metric_classes = {
+        EvaluationMetricList.F_SCORE.value: Fscore,
+        EvaluationMetricList.PRECISION.value: Precision,
+        EvaluationMetricList.RECALL.value: Recall,
+        EvaluationMetricList.FPR.value: FPR,
+        EvaluationMetricList.MEAN_DELAY.value: MeanDelay,
+    }
+    # cases without real or detected drifts and with detections at the real drifts
+    cases = random_cases(200 + seed, 100) + [([], [], 100), ([10], [], 100), ([], [10], 100), ([10], [10], 100)]
+    grid = ManageEvaluationMetrics.calculate_evaluation_metrics_grid(list(metric_classes), *zip(*cases))
+    for k, (real, detected, items) in enumerate(cases):
+        for name, metric_class in metric_classes.items():
+            expected = metric_class(list(real), list(detected), items).calculate()
+            value = ManageEvaluationMetrics.get_metric_value(name, grid[name][k], real, detected)
+            assert type(value) is type(expected)
+            assert value == pytest.approx(expected)
+
+
+def test_matching_without_drifts():
+    matching = DriftMatching([[], [100]], [[], []], [1000, 1000])
+    assert list(matching.tp) == [0, 0]
+    assert list(matching.fn) == [0, 1]
+    assert list(matching.f_score()) == [0, 0]
+    assert list(matching.mean_delay()) == [0, 0]
@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.evaluate.manage_evaluation_metrics import EvaluationMetricList, Fscore, MeanDelay
+from ipdd_massive import save_results, read_results, calculate_metrics_massive, DRIFTS_KEY, DETECTED_AT_KEY
+
+
+class DatasetConfig:
+    lognames = ['cb1000.xes', 'cb2000.xes']
+    actual_change_points = {'1000': [100, 500], '2000': [200, 1000]}
+    number_of_instances = {'1000': 1000, '2000': 2000}
+
+
+RESULTS = {
+    'cb1000.xes': {f'{DRIFTS_KEY}win50': [110, 530], f'{DETECTED_AT_KEY}win50': [150, 560],
+                   f'{DRIFTS_KEY}win100': [np.int64(120)]},
+    'cb2000.xes': {f'{DRIFTS_KEY}win50': [], f'{DETECTED_AT_KEY}win50': [],
+                   f'{DRIFTS_KEY}win100': [50, 210, 1100]},
+}
+
+
+def get_rows(df):
+    return sorted((row.logname, row.configuration, row.drifts, row.detected_at) for row in df.itertuples(index=False))
+
+
+def test_results_round_trip(tmp_path):
+    save_results(RESULTS, str(tmp_path), 'results.parquet')
+    df = read_results(os.path.join(str(tmp_path), 'results.parquet'))
+    assert get_rows(df) == [
+        ('cb1000.xes', 'win100', [120], None),
+        ('cb1000.xes', 'win50', [110, 530], [150, 560]),
+        ('cb2000.xes', 'win100', [50, 210, 1100], None),
+        ('cb2000.xes', 'win50', [], []),
+    ]
+    assert all(type(d) is int for drifts in df['drifts'] for d in drifts)
+
+
+def test_legacy_excel_results_are_read(tmp_path):
+    save_results(RESULTS, str(tmp_path), 'results.parquet')
+    # Excel saved by the previous versions, with the lists as strings
+    legacy = pd.DataFrame.from_dict({logname: {key: str(list(map(int, value))) for key, value in results.items()}
+                                     for logname, results in RESULTS.items()}, orient='index')
+    legacy_filename = os.path.join(str(tmp_path), 'results.xlsx')
+    legacy.to_excel(legacy_filename)
+    parquet_df = read_results(os.path.join(str(tmp_path), 'results.parquet'))
+    assert get_rows(read_results(legacy_filename)) == get_rows(parquet_df)
+
+
+def test_metrics_massive_round_trip(tmp_path):
+    save_results(RESULTS, str(tmp_path), 'results.parquet')
+    df_metrics = calculate_metrics_massive(str(tmp_path), 'results.parquet', DatasetConfig())
+    saved = pd.read_parquet(os.path.join(str(tmp_path), 'metrics_results.parquet'))
+    assert len(saved) == len(df_metrics) == 4
+    for row, saved_row in zip(df_metrics.to_dict('records'), saved.to_dict('records')):
+        logsize = row['logname'][2:6]
+        assert list(saved_row['real_drifts']) == DatasetConfig.actual_change_points[logsize]
+        assert list(saved_row['detected_drifts']) == row['detected_drifts']
+        if row['detected_at'] is None:
+            assert saved_row['detected_at'] is None
+        else:
+            assert list(saved_row['detected_at']) == row['detected_at']
+        items = DatasetConfig.number_of_instances[logsize]
+        real = DatasetConfig.actual_change_points[logsize]
+        assert saved_row[EvaluationMetricList.F_SCORE.value] == pytest.approx(
+            Fscore(list(real), list(row['detected_drifts']), items).calculate())
+        assert saved_row[EvaluationMetricList.MEAN_DELAY.value] == pytest.approx(
+            MeanDelay(list(real), list(row['detected_drifts']), items).calculate())
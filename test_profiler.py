@@ -0,0 +1,48 @@
+import threading
+import time
+
+from components.monitoring.profiler import ThreadsProfiler, PROFILE_ALL_THREADS
+
+
+def profiled_function(seconds):
+    time.sleep(seconds)
+
+
+def get_functions(stats):
+    return {name for _, _, name in stats.stats}
+
+
+def test_threads_started_during_the_run_are_joined_before_collecting():
+    profiler = ThreadsProfiler()
+    profiler.start()
+    thread = threading.Thread(target=profiled_function, args=(0.2,))
+    thread.start()
+    profiler.stop()
+    # the stop waits until the thread finishes, so the profiler is not running when the stats are collected
+    assert not thread.is_alive()
+    assert 'profiled_function' in get_functions(profiler.get_stats())
+
+
+def test_daemon_threads_are_not_profiled():
+    profiler = ThreadsProfiler()
+    release = threading.Event()
+    profiler.start()
+    thread = threading.Thread(target=release.wait, daemon=True)
+    thread.start()
+    profiler.stop()
+    assert thread.is_alive()
+    release.set()
+    thread.join()
+    if not PROFILE_ALL_THREADS:
+        assert len(profiler.profiles) == 1
+
+
+def test_threads_started_after_the_stop_are_not_profiled():
+    profiler = ThreadsProfiler()
+    profiler.start()
+    profiler.stop()
+    thread = threading.Thread(target=profiled_function, args=(0,))
+    thread.start()
+    thread.join()
+    assert profiler.thread_profiles == []
+    assert len(profiler.profiles) == 1
@@ -0,0 +1,44 @@
+import pytest
+
+from components.apply_window import calculate_quality_metric_dfg, calculate_quality_metric_footprints, \
+    get_quality_metrics, QUALITY_METRICS_BY_APPROACH
+from components.discovery.variant_window import VariantWindow
+from components.parameters import QualityMetric, ControlflowAdaptiveApproach
+
+REFERENCE = VariantWindow([('a', 'b', 'c', 'd'), ('a', 'c', 'b', 'd')])
+
+
+def test_fitness_dfg_is_one_when_all_the_pairs_are_in_the_reference():
+    for variant in [('a', 'b', 'c', 'd'), ('a', 'c', 'b', 'd'), ('a', 'b', 'c', 'b', 'd'), ()]:
+        assert calculate_quality_metric_dfg(QualityMetric.FITNESS_DFG.value, variant, REFERENCE) == 1
+
+
+def test_fitness_dfg_counts_the_missing_pairs():
+    # (a, e) and (e, d) are not in the reference, the start and end activities are
+    assert calculate_quality_metric_dfg(QualityMetric.FITNESS_DFG.value, ('a', 'e', 'd'), REFERENCE) == \
+        pytest.approx(2 / 4)
+    # start activity b and end activity c are not in the reference, (b, c) is
+    assert calculate_quality_metric_dfg(QualityMetric.FITNESS_DFG.value, ('b', 'c'), REFERENCE) == \
+        pytest.approx(1 / 3)
+    assert calculate_quality_metric_dfg(QualityMetric.FITNESS_DFG.value, ('e',), REFERENCE) == 0
+
+
+def test_precision_dfg_is_the_edge_coverage_of_the_window():
+    reference_edges = REFERENCE.get_relations_set()
+    assert calculate_quality_metric_footprints(QualityMetric.PRECISION_DFG.value, REFERENCE, reference_edges) == 1
+    # the window covers (a, b), (b, c) and (c, d) of the 6 edges of the reference
+    window = VariantWindow([('a', 'b', 'c', 'd')])
+    assert calculate_quality_metric_footprints(QualityMetric.PRECISION_DFG.value, window, reference_edges) == \
+        pytest.approx(3 / 6)
+    assert calculate_quality_metric_footprints(QualityMetric.PRECISION_DFG.value, window, set()) == 1
+
+
+def test_precision_dfg_is_only_supported_by_the_windowing_approach():
+    assert QualityMetric.PRECISION_DFG.value not in QUALITY_METRICS_BY_APPROACH[ControlflowAdaptiveApproach.TRACE.name]
+    with pytest.raises(ValueError):
+        get_quality_metrics(ControlflowAdaptiveApproach.TRACE.name, {}, [QualityMetric.PRECISION_DFG.value])
+    metrics = get_quality_metrics(ControlflowAdaptiveApproach.WINDOW.name,
+                                  {'FITNESS': QualityMetric.FITNESS_TBR.value,
+                                   'PRECISION': QualityMetric.PRECISION_FP.value},
+                                  [QualityMetric.PRECISION_DFG.value])
+    assert metrics == {'FITNESS': QualityMetric.FITNESS_TBR.value, 'PRECISION': QualityMetric.PRECISION_DFG.value}
@@ -0,0 +1,56 @@
+import os
+
+from components.adaptive.detectors import SelectDetector, ConceptDriftDetector
+from components.dfg_definitions import Metric
+from components.ippd_fw import IPDDParametersFixed, IPDDParametersAdaptiveControlflow
+from components.parameters import Approach, ReadLogAs, WindowUnityFixed, AdaptivePerspective, \
+    ControlflowAdaptiveApproach
+from components.scenario_cache import ScenarioCache
+
+
+def write_log(tmp_path, name, content):
+    filename = os.path.join(str(tmp_path), name)
+    with open(filename, 'w') as file:
+        file.write(content)
+    return filename
+
+
+def get_fixed_parameters(logname, win_size=100, **kwargs):
+    return IPDDParametersFixed(logname, Approach.FIXED.name, ReadLogAs.TRACE.name, [Metric.NODES.name],
+                               WindowUnityFixed.UNITY.name, win_size, **kwargs)
+
+
+def get_controlflow_parameters(logname, delta):
+    detector_class = SelectDetector.get_detector_instance(ConceptDriftDetector.ADWIN.name, {'delta': delta})
+    return IPDDParametersAdaptiveControlflow(logname, Approach.ADAPTIVE.name, AdaptivePerspective.CONTROL_FLOW.name,
+                                             ReadLogAs.TRACE.name, 30, [Metric.NODES.name],
+                                             ControlflowAdaptiveApproach.TRACE.name, detector_class)
+
+
+def test_scenario_results_are_loaded_after_saving(tmp_path):
+    cache = ScenarioCache(os.path.join(str(tmp_path), 'scenarios'))
+    parameters = get_fixed_parameters(write_log(tmp_path, 'log.xes', 'log'))
+    key = cache.get_key(parameters)
+    assert cache.load(key) is None
+    cache.save(key, parameters, {'drifts': [100, 200]})
+    assert cache.load(key) == {'drifts': [100, 200]}
+
+
+def test_scenario_key_ignores_the_parameters_that_do_not_change_the_results(tmp_path):
+    logname = write_log(tmp_path, 'log.xes', 'log')
+    key = ScenarioCache.get_key(get_fixed_parameters(logname))
+    assert ScenarioCache.get_key(get_fixed_parameters(logname, trace=True, memory_accounting=True,
+                                                      output_formats=[], discovery_workers=4,
+                                                      save_model_svg=True)) == key
+    # the same content with another name
+    assert ScenarioCache.get_key(get_fixed_parameters(write_log(tmp_path, 'copy.xes', 'log'))) == key
+
+
+def test_scenario_key_changes_with_the_results(tmp_path):
+    logname = write_log(tmp_path, 'log.xes', 'log')
+    key = ScenarioCache.get_key(get_fixed_parameters(logname))
+    assert ScenarioCache.get_key(get_fixed_parameters(logname, win_size=200)) != key
+    assert ScenarioCache.get_key(get_fixed_parameters(write_log(tmp_path, 'other.xes', 'other log'))) != key
+    controlflow_key = ScenarioCache.get_key(get_controlflow_parameters(logname, 0.002))
+    assert controlflow_key == ScenarioCache.get_key(get_controlflow_parameters(logname, 0.002))
+    assert controlflow_key != ScenarioCache.get_key(get_controlflow_parameters(logname, 0.05))
@@ -0,0 +1,85 @@
+import os
+
+from components.adaptive.detectors import SelectDetector, ConceptDriftDetector
+from components.adaptive.signal_cache import SignalCache, signal_cache
+from components.apply_window import AnalyzeDrift
+from components.dfg_definitions import Metric
+from components.ippd_fw import IPDDParametersAdaptiveControlflow
+from components.parameters import Approach, ReadLogAs, AdaptivePerspective, ControlflowAdaptiveApproach
+from ipdd_cli import run_IPDD_script
+from test_speculative_discovery import write_drift_log
+
+
+def test_signal_is_loaded_after_saving(tmp_path):
+    log_filename = os.path.join(str(tmp_path), 'log.xes')
+    with open(log_filename, 'w') as file:
+        file.write('log')
+    cache = SignalCache(os.path.join(str(tmp_path), 'signals'))
+    metrics = {'fitness': 'fitnessTBR', 'precision': 'precisionETC'}
+    key = cache.get_key(log_filename, metrics, 30, 100)
+    assert cache.load(key) is None
+    cache.save(key, {'fitness': [1, 0.5], 'precision': [1, 1]})
+    signals = cache.load(key)
+    assert {dimension: list(values) for dimension, values in signals.items()} == {'fitness': [1, 0.5],
+                                                                                  'precision': [1, 1]}
+    # the signal depends on the metrics, window, number of traces and discovery
+    assert cache.get_key(log_filename, {'fitness': 'fitnessAL'}, 30, 100) != key
+    assert cache.get_key(log_filename, metrics, 50, 100) != key
+    assert cache.get_key(log_filename, metrics, 30, 200) != key
+    assert cache.get_key(log_filename, metrics, 30, 100, 'split') != key
+    assert cache.get_key(log_filename, dict(reversed(metrics.items())), 30, 100) == key
+
+
+def run_without_model_update(monkeypatch, log_filename, cache_path, drift_confidence):
+    loaded = []
+    signals = {}
+    load = SignalCache.load
+    plot_signal = AnalyzeDrift.plot_signal_adaptive_controlflow
+
+    def load_signal(cache, key):
+        cached_signals = load(cache, key)
+        loaded.append(cached_signals is not None)
+        return cached_signals
+
+    def save_signal(analyze_drift, values, metrics, drifts=None):
+        signals.update({m: list(values[m]) for m in metrics})
+        plot_signal(analyze_drift, values, metrics, drifts)
+
+    monkeypatch.setattr(signal_cache, 'path', cache_path)
+    monkeypatch.setattr(SignalCache, 'load', load_signal)
+    monkeypatch.setattr(AnalyzeDrift, 'plot_signal_adaptive_controlflow', save_signal)
+    detector_class = SelectDetector.get_detector_instance(ConceptDriftDetector.HDDM_W.name,
+                                                          {'drift_confidence': drift_confidence})
+    parameters = IPDDParametersAdaptiveControlflow(logname=log_filename, approach=Approach.ADAPTIVE.name,
+                                                   perspective=AdaptivePerspective.CONTROL_FLOW.name,
+                                                   read_log_as=ReadLogAs.TRACE.name,
+                                                   win_size=30,
+                                                   metrics=[Metric.NODES.name, Metric.EDGES.name],
+                                                   adaptive_controlflow_approach=ControlflowAdaptiveApproach.TRACE.name,
+                                                   detector_class=detector_class,
+                                                   update_model=False)
+    detected_drifts, metrics = run_IPDD_script(parameters, [])
+    return loaded, detected_drifts, signals
+
+
+def test_cached_signal_replays_the_drifts_of_another_detector(monkeypatch, tmp_path):
+    log_filename = write_drift_log(os.path.join(str(tmp_path), 'drift_log.xes'))
+    cache_path = os.path.join(str(tmp_path), 'signals')
+    loaded, drifts, signals = run_without_model_update(monkeypatch, log_filename, cache_path, 0.001)
+    assert loaded == [False]
+    assert len(os.listdir(cache_path)) == 1
+    # same log and model with another detector configuration: the signal is read from the cache
+    cached_loaded, cached_drifts, cached_signals = run_without_model_update(monkeypatch, log_filename, cache_path,
+                                                                            0.05)
+    assert cached_loaded == [True]
+    # the same configuration without the cache
+    empty_cache_path = os.path.join(str(tmp_path), 'empty')
+    expected_loaded, expected_drifts, expected_signals = run_without_model_update(monkeypatch, log_filename,
+                                                                                  empty_cache_path, 0.05)
+    assert expected_loaded == [False]
+    assert len(expected_drifts) > 0
+    assert cached_drifts == expected_drifts
+    assert cached_signals == expected_signals
+    # the drifts depend on the detector, but the signal does not
+    assert cached_drifts != drifts
+    assert cached_signals == signals
@@ -0,0 +1,31 @@
+import os
+import time
+
+from components.compare_models.manage_similarity_metrics import merge_consecutive_drifts
+from components.dfg_definitions import Metric
+from components.ippd_fw import InteractiveProcessDriftDetectionFW, IPDDParametersFixed
+from components.parameters import Approach, ReadLogAs, WindowUnityFixed, FixedWindowType
+from test_speculative_discovery import write_drift_log
+
+
+def test_consecutive_windows_are_merged_at_the_highest_dissimilarity():
+    dissimilar_windows = {3: (0.1, 30), 4: (0.5, 40), 5: (0.3, 50), 9: (0.2, 90), 12: (0.4, 120), 13: (0.4, 130)}
+    # ties are reported at the first window
+    assert merge_consecutive_drifts(dissimilar_windows) == ([4, 9, 12], [40, 90, 120])
+    assert merge_consecutive_drifts({}) == ([], [])
+
+
+def test_sliding_windows_report_one_drift_for_each_change(tmp_path):
+    # the models alternate each 200 traces
+    log_filename = write_drift_log(os.path.join(str(tmp_path), 'drift_log.xes'))
+    parameters = IPDDParametersFixed(log_filename, Approach.FIXED.name, ReadLogAs.TRACE.name,
+                                     [Metric.NODES.value, Metric.EDGES.value], WindowUnityFixed.UNITY.name, 50,
+                                     window_type=FixedWindowType.SLIDING.name, stride=10)
+    framework = InteractiveProcessDriftDetectionFW(script=True)
+    framework.run_script(parameters)
+    while framework.get_status_running():
+        time.sleep(0.1)
+    windows, traces = framework.get_windows_with_drifts()
+    assert len(traces) == 4
+    for trace, real_drift in zip(traces, [200, 400, 600, 800]):
+        assert abs(trace - real_drift) <= 10
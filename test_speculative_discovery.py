@@ -0,0 +1,177 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pm4py
+
+from components.adaptive.detectors import SelectDetector, ConceptDriftDetector
+from components.apply_window import AnalyzeDrift
+from components.dfg_definitions import Metric
+from components.discovery.speculative_discovery import SpeculativeDiscovery, SpeculativeCandidate, \
+    discover_candidate_model
+from components.ippd_fw import IPDDParametersAdaptiveControlflow
+from components.monitoring.performance_metrics import performance_metrics
+from components.parameters import Approach, ReadLogAs, AdaptivePerspective, ControlflowAdaptiveApproach
+from ipdd_cli import run_IPDD_script
+
+
+# candidates discovered by threads calling discover(begin, end), for controlling when the discovery finishes
+class ThreadSpeculativeDiscovery(SpeculativeDiscovery):
+    def __init__(self, discover, max_abandoned=2, max_offset=0):
+        super().__init__([], max_abandoned=max_abandoned, max_offset=max_offset)
+        self.discover = discover
+
+    def submit(self, begin, end):
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(self.discover, begin, end)
+        executor.shutdown(wait=False)
+        return SpeculativeCandidate(begin, end, future)
+
+
+def test_discarded_running_discovery_does_not_block_the_next_one():
+    performance_metrics.reset()
+    release = threading.Event()
+    started = threading.Event()
+
+    def discover(begin, end):
+        if begin == 0:
+            started.set()
+            release.wait(10)
+        return begin, end
+
+    speculative_discovery = ThreadSpeculativeDiscovery(discover)
+    speculative_discovery.start(0, 10)
+    started.wait(10)
+    speculative_discovery.discard()
+    assert performance_metrics.counters['abandoned_speculative_discoveries'] == 1
+    # the discovery of the drift runs while the abandoned one is still running
+    candidate = speculative_discovery.take(20, 30)
+    assert candidate.future.result(timeout=10) == (20, 30)
+    release.set()
+    speculative_discovery.shutdown()
+
+
+def test_abandoned_discoveries_are_bounded():
+    performance_metrics.reset()
+    release = threading.Event()
+    speculative_discovery = ThreadSpeculativeDiscovery(lambda begin, end: release.wait(10), max_abandoned=1)
+    speculative_discovery.start(0, 10)
+    speculative_discovery.discard()
+    # no new candidate while the abandoned discovery is running
+    speculative_discovery.start(5, 15)
+    assert speculative_discovery.candidate is None
+    assert performance_metrics.counters['skipped_speculative_discoveries'] == 1
+    release.set()
+    speculative_discovery.abandoned[0].result(timeout=10)
+    speculative_discovery.start(5, 15)
+    assert speculative_discovery.candidate.begin == 5
+    speculative_discovery.shutdown()
+
+
+def test_candidates_far_from_the_drift_are_discarded():
+    performance_metrics.reset()
+    speculative_discovery = ThreadSpeculativeDiscovery(lambda begin, end: (begin, end), max_offset=5)
+    speculative_discovery.start(10, 20)
+    assert speculative_discovery.take(15, 25).begin == 10
+    assert performance_metrics.counters['adopted_speculative_discoveries'] == 1
+    # the candidate started 6 traces before the drift, the model is discovered using the traces since the drift
+    speculative_discovery.start(30, 40)
+    candidate = speculative_discovery.take(36, 46)
+    assert (candidate.begin, candidate.end) == (36, 46)
+    assert candidate.future.result(timeout=10) == (36, 46)
+    assert performance_metrics.counters['adopted_speculative_discoveries'] == 1
+    assert speculative_discovery.candidate is None
+    speculative_discovery.shutdown()
+
+
+# candidate discovered before the trace-by-trace approach checks it, reported as not ready during the first checks
+class LateCandidate(SpeculativeCandidate):
+    checks_before_ready = 0
+    late_checks = 0
+
+    def done(self):
+        if self.checks_before_ready > 0:
+            self.checks_before_ready -= 1
+            LateCandidate.late_checks += 1
+            return False
+        return True
+
+
+def run_with_candidates(monkeypatch, log_filename, window, checks_before_ready):
+    def submit(speculative_discovery, begin, end):
+        future = Future()
+        # result of the discovery pool: the model and the time spent, with the spans of the worker
+        future.set_result((discover_candidate_model(speculative_discovery.variants[begin:end],
+                                                    speculative_discovery.backend), []))
+        candidate = LateCandidate(begin, end, future)
+        candidate.checks_before_ready = checks_before_ready
+        return candidate
+
+    signals = {}
+    plot_signal = AnalyzeDrift.plot_signal_adaptive_controlflow
+
+    def save_signal(analyze_drift, values, metrics, drifts=None):
+        signals.update({m: list(values[m]) for m in metrics})
+        plot_signal(analyze_drift, values, metrics, drifts)
+
+    monkeypatch.setattr(SpeculativeDiscovery, 'submit', submit)
+    monkeypatch.setattr(AnalyzeDrift, 'plot_signal_adaptive_controlflow', save_signal)
+    detected_drifts = run_trace_by_trace(log_filename, window, True)
+    return detected_drifts, signals
+
+
+def run_trace_by_trace(log_filename, window, speculative_discovery):
+    detector_class = SelectDetector.get_detector_instance(ConceptDriftDetector.HDDM_W.name)
+    parameters = IPDDParametersAdaptiveControlflow(logname=log_filename, approach=Approach.ADAPTIVE.name,
+                                                   perspective=AdaptivePerspective.CONTROL_FLOW.name,
+                                                   read_log_as=ReadLogAs.TRACE.name,
+                                                   win_size=window,
+                                                   metrics=[Metric.NODES.name, Metric.EDGES.name],
+                                                   adaptive_controlflow_approach=ControlflowAdaptiveApproach.TRACE.name,
+                                                   detector_class=detector_class,
+                                                   speculative_discovery=speculative_discovery)
+    detected_drifts, metrics = run_IPDD_script(parameters, [])
+    return detected_drifts
+
+
+# log alternating the variants of two models each 200 traces
+def write_drift_log(filename, total_of_traces=1000, segment_size=200):
+    models = [[('a', 'b', 'c', 'd'), ('a', 'c', 'b', 'd')],
+              [('a', 'b', 'e', 'd'), ('a', 'e', 'b', 'c', 'd'), ('a', 'f', 'd')]]
+    rng = np.random.default_rng(42)
+    rows = []
+    for i in range(total_of_traces):
+        variants = models[(i // segment_size) % len(models)]
+        variant = variants[rng.integers(len(variants))]
+        for j, activity in enumerate(variant):
+            rows.append({'case:concept:name': f'case{i}', 'concept:name': activity,
+                         'time:timestamp': pd.Timestamp('2020-01-01') + pd.Timedelta(minutes=10 * i + j)})
+    pm4py.write_xes(pm4py.format_dataframe(pd.DataFrame(rows)), filename)
+    return filename
+
+
+def test_pending_traces_replay_same_drifts_when_the_model_is_late(monkeypatch, tmp_path):
+    log_filename = write_drift_log(os.path.join(str(tmp_path), 'drift_log.xes'))
+    ready_drifts, ready_signals = run_with_candidates(monkeypatch, log_filename, 30, 0)
+    LateCandidate.late_checks = 0
+    late_drifts, late_signals = run_with_candidates(monkeypatch, log_filename, 30, 15)
+    assert len(ready_drifts) > 1
+    # the traces were kept as pending while the model was not ready
+    assert LateCandidate.late_checks > 0
+    assert late_drifts == ready_drifts
+    # all the traces are evaluated with the same models
+    assert len(ready_signals) == 2
+    assert late_signals == ready_signals
+    assert all(len(signal) == 1000 for signal in ready_signals.values())
+
+
+def test_candidates_of_the_discovery_pool_detect_the_same_drifts(tmp_path):
+    log_filename = write_drift_log(os.path.join(str(tmp_path), 'drift_log.xes'))
+    drifts = run_trace_by_trace(log_filename, 30, False)
+    performance_metrics.reset()
+    speculative_drifts = run_trace_by_trace(log_filename, 30, True)
+    assert len(drifts) > 1
+    assert performance_metrics.counters['speculative_discoveries'] > 0
+    assert speculative_drifts == drifts
@@ -0,0 +1,29 @@
+import os
+
+from components.monitoring.tracer import tracer, run_traced
+from components.plot_render import PlotRenderService, PlotSpec
+
+
+def get_spans(name):
+    return [e for e in tracer.get_trace()['traceEvents'] if e['ph'] == 'X' and e['name'] == name]
+
+
+def test_worker_is_not_traced_when_the_tracer_is_disabled():
+    tracer.disable()
+    assert tracer.get_worker_trace() is None
+    assert run_traced(None, sum, [1, 2]) == (3, [])
+
+
+def test_plot_worker_spans_are_merged(tmp_path):
+    tracer.enable()
+    service = PlotRenderService(workers=1)
+    spec = PlotSpec(str(tmp_path / 'plot.png'), 'title', 'x', 'y', [('s', [0, 1, 2], [1, 2, 3])])
+    service.submit(spec)
+    assert service.wait() == []
+    service.shutdown()
+    spans = get_spans('render_plot')
+    tracer.disable()
+    assert len(spans) == 1
+    assert spans[0]['pid'] != os.getpid()
+    assert spans[0]['args']['filename'] == 'plot.png'
+    assert spans[0]['ts'] >= 0
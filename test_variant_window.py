@@ -0,0 +1,81 @@
+import random
+
+import pm4py
+from pm4py.objects.log.obj import EventLog, Trace, Event
+
+from components.discovery.variant_window import VariantWindow, get_variant, discover_process_tree_from_variants
+
+
+def random_variants(seed, total):
+    rng = random.Random(seed)
+    activities = 'abcdef'
+    return [tuple(rng.choice(activities) for _ in range(rng.randint(1, 6))) for _ in range(total)]
+
+
+def to_event_log(variants):
+    log = EventLog()
+    for variant in variants:
+        log.append(Trace([Event({'concept:name': a}) for a in variant]))
+    return log
+
+
+def assert_same_window(window, expected):
+    assert window.variants == expected.variants
+    assert window.get_dfg() == expected.get_dfg()
+    assert window.get_start_activities() == expected.get_start_activities()
+    assert window.get_end_activities() == expected.get_end_activities()
+    assert window.get_activities() == expected.get_activities()
+    assert window.get_fingerprint() == expected.get_fingerprint()
+
+
+def test_counts_match_pm4py_dfg():
+    variants = random_variants(1, 200)
+    window = VariantWindow(variants)
+    dfg, start_activities, end_activities = pm4py.discover_dfg(to_event_log(variants))
+    assert window.get_dfg() == dict(dfg)
+    assert window.get_start_activities() == dict(start_activities)
+    assert window.get_end_activities() == dict(end_activities)
+    assert len(window) == 200
+    assert get_variant(to_event_log(variants[:1])[0]) == variants[0]
+
+
+def test_sliding_add_remove_matches_new_window():
+    variants = random_variants(2, 300)
+    win_size = 40
+    relations = {}
+    window = VariantWindow(variants[:win_size], relations)
+    for i in range(len(variants) - win_size):
+        window.remove_trace(variants[i])
+        window.add_trace(variants[i + win_size])
+        if i % 20 == 0:
+            assert_same_window(window, VariantWindow(variants[i + 1:i + 1 + win_size]))
+    # the relations are calculated once for each variant
+    assert set(relations) == set(variants)
+
+
+def test_removed_keys_are_deleted():
+    window = VariantWindow([('a', 'b'), ('a', 'c')])
+    window.remove_trace(('a', 'c'))
+    assert window.get_dfg() == {('a', 'b'): 1}
+    assert window.get_end_activities() == {'b': 1}
+    assert window.get_activities() == {'a', 'b'}
+    window.remove_trace(('a', 'b'))
+    assert len(window) == 0
+    assert window.get_dfg() == {}
+
+
+def test_fingerprint_depends_only_on_the_multiset():
+    variants = random_variants(3, 50)
+    window = VariantWindow(variants)
+    assert window.get_fingerprint() == VariantWindow(reversed(variants)).get_fingerprint()
+    fingerprint = window.get_fingerprint()
+    window.add_trace(variants[0])
+    assert window.get_fingerprint() != fingerprint
+    window.remove_trace(variants[0])
+    assert window.get_fingerprint() == fingerprint
+
+
+def test_process_tree_matches_pm4py():
+    variants = random_variants(4, 100)
+    tree = discover_process_tree_from_variants(VariantWindow(variants))
+    assert str(tree) == str(pm4py.discover_process_tree_inductive(to_event_log(variants)))
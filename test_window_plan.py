@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from components.parameters import WindowUnityFixed
+from components.window_plan import get_tumbling_windows
+
+
+# windows defined by checking every trace, as the original loop of the fixed approach
+def reference_windows(values, is_checkpoint):
+    begins = [0]
+    for i in range(1, len(values)):
+        if is_checkpoint(values[begins[-1]], values[i]):
+            begins.append(i)
+    return list(zip(begins, begins[1:] + [len(values)]))
+
+
+def test_unity_windows():
+    assert get_tumbling_windows(10, WindowUnityFixed.UNITY.name, 3) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+    assert get_tumbling_windows(6, WindowUnityFixed.UNITY.name, 3) == [(0, 3), (3, 6)]
+    assert get_tumbling_windows(2, WindowUnityFixed.UNITY.name, 5) == [(0, 2)]
+    assert get_tumbling_windows(0, WindowUnityFixed.UNITY.name, 5) == []
+
+
+@pytest.mark.parametrize('sort', [True, False])
+@pytest.mark.parametrize('seed', range(5))
+def test_hour_windows_match_reference(seed, sort):
+    rng = np.random.default_rng(seed)
+    # seconds between traces, with some traces at the same time
+    timestamps = np.cumsum(rng.choice([0, 60, 1800, 3600, 7200, 36000], size=int(rng.integers(1, 500))))
+    if not sort:
+        rng.shuffle(timestamps)
+    timestamps = (1.6e9 + timestamps).tolist()
+    win_size = int(rng.integers(1, 12))
+    expected = reference_windows(timestamps, lambda begin, t: (t - begin) / 60 / 60 > win_size)
+    assert get_tumbling_windows(len(timestamps), WindowUnityFixed.HOUR.name, win_size,
+                                timestamps=timestamps) == expected
+
+
+@pytest.mark.parametrize('sort', [True, False])
+@pytest.mark.parametrize('seed', range(5))
+def test_day_windows_match_reference(seed, sort):
+    rng = np.random.default_rng(seed)
+    days = np.cumsum(rng.choice([0, 0, 1, 2, 5], size=int(rng.integers(1, 500))))
+    if not sort:
+        rng.shuffle(days)
+    days = (737000 + days).tolist()
+    win_size = int(rng.integers(1, 10))
+    expected = reference_windows(days, lambda begin, d: d - begin > win_size)
+    assert get_tumbling_windows(len(days), WindowUnityFixed.DAY.name, win_size, days=days) == expected
+
+
+def test_windows_cover_all_traces():
+    timestamps = [1.6e9 + 3600 * i for i in range(100)]
+    windows = get_tumbling_windows(100, WindowUnityFixed.HOUR.name, 5, timestamps=timestamps)
+    assert windows[0][0] == 0 and windows[-1][1] == 100
+    assert all(end == begin for (_, end), (begin, _) in zip(windows, windows[1:]))